@@ -7,6 +7,7 @@ const healthBtn = document.getElementById("healthBtn");
 const refreshBtn = document.getElementById("refreshBtn");
 const uploadBtn = document.getElementById("uploadBtn");
 const fileInput = document.getElementById("fileInput");
+const uploadProgress = document.getElementById("uploadProgress");
 const filesBody = document.getElementById("filesBody");
 const logBox = document.getElementById("logBox");
 
@@ -246,16 +247,46 @@ async function loadFiles() {
   }
 }
 
+// Uploads go through a chunked session so large photos / PDFs stay under the
+// proxy's body limit and a failed chunk can be resumed from what Drive kept.
 async function uploadFile() {
   const file = fileInput.files?.[0];
   if (!file) { log("No file selected"); return; }
-  const body = new FormData();
-  body.append("file", file, file.name);
+  uploadBtn.disabled = true;
+  uploadProgress.hidden = false;
+  uploadProgress.value = 0;
   try {
-    await apiFetch("/upload", { method: "POST", body });
-    log(`Uploaded: ${file.name}`);
+    let session = await apiJson("/upload/sessions", {
+      method: "POST",
+      body: { name: file.name, size: file.size, mime_type: file.type || "application/octet-stream" },
+    });
+    const path = `/upload/sessions/${encodeURIComponent(session.session_id)}`;
+    while (!session.done && session.received < file.size) {
+      const offset = session.received;
+      const chunk = file.slice(offset, offset + session.chunk_size);
+      try {
+        const res = await apiFetch(`${path}?offset=${offset}`, {
+          method: "PUT",
+          headers: { accept: "application/json", "content-type": "application/octet-stream" },
+          body: chunk,
+        });
+        session = await res.json();
+      } catch (err) {
+        log(`Chunk at ${formatBytes(offset)} failed, resuming: ${err.message}`);
+        session = await apiJson(path);
+        if (session.received === offset) throw err;
+      }
+      uploadProgress.value = file.size ? Math.round((session.received / file.size) * 100) : 100;
+    }
+    await apiJson(`${path}/finalize`, { method: "POST" });
+    log(`Uploaded: ${file.name} (${formatBytes(file.size)})`);
     await loadFiles();
-  } catch (err) { log(`Upload failed: ${err.message}`); }
+  } catch (err) {
+    log(`Upload failed: ${err.message}`);
+  } finally {
+    uploadBtn.disabled = false;
+    uploadProgress.hidden = true;
+  }
 }
 
 filesBody.addEventListener("click", async (e) => {
@@ -4,6 +4,23 @@ export const config = {
   },
 };
 
+const FORWARDED_REQUEST_HEADERS = [
+  "if-none-match",
+  "if-modified-since",
+  "range",
+  "if-range",
+];
+const PASSTHROUGH_RESPONSE_HEADERS = [
+  "content-type",
+  "content-disposition",
+  "etag",
+  "last-modified",
+  "cache-control",
+  "content-range",
+  "accept-ranges",
+  "retry-after",
+];
+
 function isAllowedBase(base) {
   try {
     const u = new URL(base);
@@ -64,6 +81,9 @@ export default async function handler(req, res) {
     if (req.headers["authorization"]) {
       headers["authorization"] = req.headers["authorization"];
     }
+    for (const name of FORWARDED_REQUEST_HEADERS) {
+      if (req.headers[name]) headers[name] = req.headers[name];
+    }
 
     const init = {
       method: req.method,
@@ -75,13 +95,18 @@ export default async function handler(req, res) {
     }
 
     const upstream = await fetch(target, init);
-    const buffer = Buffer.from(await upstream.arrayBuffer());
 
-    const contentType = upstream.headers.get("content-type");
-    const contentDisposition = upstream.headers.get("content-disposition");
-    if (contentType) res.setHeader("content-type", contentType);
-    if (contentDisposition) res.setHeader("content-disposition", contentDisposition);
+    for (const name of PASSTHROUGH_RESPONSE_HEADERS) {
+      const value = upstream.headers.get(name);
+      if (value) res.setHeader(name, value);
+    }
 
+    if (upstream.status === 304) {
+      res.status(304).end();
+      return;
+    }
+
+    const buffer = Buffer.from(await upstream.arrayBuffer());
     res.status(upstream.status).send(buffer);
   } catch (e) {
     res.status(502).send(`Proxy error: ${e.message}`);
@@ -0,0 +1 @@
+"""Offline Drive / GCS emulator and load benchmarks for main.py."""
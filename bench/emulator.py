@@ -0,0 +1,658 @@
+"""In-process fakes of the Google APIs main.py talks to.
+
+Covers the subset the app uses: Drive v3 files / changes (metadata, media
+with Range, multipart and resumable uploads), Cloud Storage JSON objects
+(list, get, download, multipart upload with ifGenerationMatch, delete) and
+the Google sign-in cert endpoint, with ID tokens signed by a local key.
+Every Drive and GCS call can be slowed down and failed at a configurable
+rate, so retries, fallbacks and the circuit breaker are exercised too.
+
+    emulator = Emulator(drive=Faults(latency_ms=40, error_rate=0.01))
+    emulator.install(main)
+"""
+import base64
+import hashlib
+import itertools
+import json
+import random
+import re
+import secrets
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from io import BytesIO
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import httplib2
+import requests
+import rsa
+from google.auth import crypt, jwt
+from google.auth.credentials import AnonymousCredentials
+from google.auth.transport.requests import AuthorizedSession
+from urllib3.response import HTTPResponse
+
+FOLDER_MIME = 'application/vnd.google-apps.folder'
+GCS_STORED_METADATA = ('cacheControl', 'contentEncoding', 'contentDisposition', 'metadata')
+DRIVE_UPLOAD_URL = 'https://www.googleapis.com/upload/drive/v3/files'
+REASONS = {200: 'OK', 204: 'No Content', 206: 'Partial Content', 308: 'Resume Incomplete',
+           400: 'Bad Request', 404: 'Not Found', 412: 'Precondition Failed',
+           416: 'Requested Range Not Satisfiable', 499: 'Client Closed Request', 503: 'Service Unavailable'}
+
+
+def _now_rfc3339():
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def _text(value):
+    return value.decode('latin-1') if isinstance(value, bytes) else str(value)
+
+
+def _json_reply(status, body, headers=None):
+    return status, {'Content-Type': 'application/json; charset=UTF-8', **(headers or {})}, \
+        json.dumps(body).encode('utf-8')
+
+
+def _error_reply(status, message, reason):
+    return _json_reply(status, {'error': {'code': status, 'message': message, 'errors': [
+        {'domain': 'global', 'reason': reason, 'message': message}]}})
+
+
+def _range_reply(content, range_header, headers):
+    """200 for the whole body, 206 / 416 for a single bytes= range."""
+    size = len(content)
+    match = re.match(r'bytes=(\d*)-(\d*)$', (range_header or '').strip())
+    if not match or not any(match.groups()):
+        return 200, headers, content
+    first, last = match.groups()
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    if start >= size or start > end:
+        return 416, {'Content-Range': f'bytes */{size}'}, b''
+    return 206, {**headers, 'Content-Range': f'bytes {start}-{end}/{size}'}, content[start:end + 1]
+
+
+def _split_multipart(content_type, body):
+    """Parts of a multipart/related body as (headers, payload) pairs, payload bytes untouched."""
+    match = re.search(r'boundary="?([^";]+)"?', content_type)
+    if not match:
+        return []
+    parts = []
+    for chunk in body.split(b'--' + match.group(1).encode('latin-1'))[1:]:
+        if chunk.startswith(b'--'):
+            break
+        chunk = chunk[2:] if chunk.startswith(b'\r\n') else chunk[1:] if chunk.startswith(b'\n') else chunk
+        separators = [i for i in (chunk.find(b'\r\n\r\n'), chunk.find(b'\n\n')) if i >= 0]
+        if not separators:
+            continue
+        head, payload = chunk[:min(separators)], chunk[min(separators):]
+        payload = payload[4:] if payload.startswith(b'\r\n\r\n') else payload[2:]
+        if payload.endswith(b'\r\n'):
+            payload = payload[:-2]
+        elif payload.endswith(b'\n'):
+            payload = payload[:-1]
+        headers = {}
+        for line in head.decode('latin-1').splitlines():
+            name, _, value = line.partition(':')
+            if value:
+                headers[name.strip().lower()] = value.strip()
+        parts.append((headers, payload))
+    return parts
+
+
+# --- Fault Injection ---
+class Faults:
+    """Latency and error injection for one backend.
+
+    Every call waits latency_ms plus an exponentially distributed extra with
+    mean jitter_ms, and request / response bodies take len / bandwidth
+    seconds (bandwidth in bytes per second, 0 = unlimited). A call fails
+    with HTTP 503 at error_rate. The draws come from a seeded RNG.
+    """
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, bandwidth=0, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.bandwidth = bandwidth
+        self.seed = seed
+        self.enabled = True
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def describe(self):
+        return {'latency_ms': self.latency_ms, 'jitter_ms': self.jitter_ms,
+                'error_rate': self.error_rate, 'bandwidth': self.bandwidth, 'seed': self.seed}
+
+    def before(self, nbytes):
+        """Wait out the call's latency and upload time; True when the call should fail."""
+        if not self.enabled:
+            return False
+        with self._lock:
+            delay = self.latency_ms
+            if self.jitter_ms > 0:
+                delay += self._rng.expovariate(1.0 / self.jitter_ms)
+            fail = self._rng.random() < self.error_rate
+        self._sleep(delay / 1000.0, nbytes)
+        return fail
+
+    def after(self, nbytes):
+        """Wait out the response's transfer time."""
+        if self.enabled:
+            self._sleep(0.0, nbytes)
+
+    def _sleep(self, seconds, nbytes):
+        if self.bandwidth > 0:
+            seconds += nbytes / self.bandwidth
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class _Backend:
+    """Shared dispatch: faults, per-operation call counts and the state lock."""
+
+    name = 'backend'
+
+    def __init__(self, faults=None):
+        self.faults = faults or Faults()
+        self.lock = threading.RLock()
+        self.calls = Counter()
+        self.injected_errors = Counter()
+
+    def route(self, method, path, query):
+        """Return (operation, handler) for a request, or None."""
+        raise NotImplementedError
+
+    def handle(self, method, url, headers, body):
+        parts = urlsplit(url)
+        query = {k: v[0] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+        matched = self.route(method, parts.path, query)
+        if matched is None:
+            return _error_reply(404, f'{method} {parts.path} is not emulated', 'notFound')
+        operation, handler = matched
+        with self.lock:
+            self.calls[operation] += 1
+        if self.faults.before(len(body)):
+            with self.lock:
+                self.injected_errors[operation] += 1
+            return _error_reply(503, 'Backend Error (injected)', 'backendError')
+        with self.lock:
+            reply = handler(query, headers, body)
+        self.faults.after(len(reply[2]))
+        return reply
+
+    def stats(self):
+        with self.lock:
+            return {'calls': dict(sorted(self.calls.items())),
+                    'injected_errors': dict(sorted(self.injected_errors.items()))}
+
+
+# --- Drive v3 ---
+class DriveEmulator(_Backend):
+    """Drive v3 files and changes, held in memory. Deletes are permanent."""
+
+    name = 'drive'
+
+    def __init__(self, faults=None):
+        super().__init__(faults)
+        self.files = {}
+        self._ids = itertools.count(1)
+        self._changes = []  # file ids; a page token is a 1-based position in this list
+        self._uploads = {}
+
+    def add(self, name, content=b'', mime_type='application/octet-stream', parents=(),
+            app_properties=None, file_id=None):
+        """Create a file directly, without latency or faults; returns its metadata."""
+        with self.lock:
+            return self._meta(self._create({'name': name, 'mimeType': mime_type, 'parents': list(parents),
+                                            'appProperties': app_properties or {}}, content, file_id))
+
+    def remove(self, file_id):
+        """Delete a file directly, without latency or faults."""
+        with self.lock:
+            self._delete(file_id)
+
+    def route(self, method, path, query):
+        match = re.match(r'^(/upload)?/drive/v3/files(?:/([^/]+))?$', path)
+        if match:
+            upload, file_id = match.groups()
+            if upload and 'upload_id' in query:
+                if method == 'DELETE':
+                    return 'uploads.cancel', self._cancel_upload
+                return 'uploads.chunk', self._upload_chunk
+            if upload:
+                operation = 'files.update' if file_id else 'files.create'
+                return operation, lambda q, h, b: self._upload(file_id, q, h, b)
+            if file_id is None:
+                return {'GET': ('files.list', self._list),
+                        'POST': ('files.create', lambda q, h, b: self._write(None, h, b))}.get(method)
+            if method == 'GET':
+                operation = 'files.get_media' if query.get('alt') == 'media' else 'files.get'
+                return operation, lambda q, h, b: self._get(file_id, q, h)
+            if method == 'PATCH':
+                return 'files.update', lambda q, h, b: self._write(file_id, h, b)
+            if method == 'DELETE':
+                return 'files.delete', lambda q, h, b: self._delete(file_id)
+            return None
+        if method == 'GET' and path == '/drive/v3/changes/startPageToken':
+            return 'changes.getStartPageToken', lambda q, h, b: _json_reply(
+                200, {'startPageToken': str(len(self._changes) + 1)})
+        if method == 'GET' and path == '/drive/v3/changes':
+            return 'changes.list', self._list_changes
+        return None
+
+    def _not_found(self, file_id):
+        return _error_reply(404, f'File not found: {file_id}.', 'notFound')
+
+    def _meta(self, f):
+        meta = {k: f[k] for k in ('id', 'name', 'mimeType', 'parents', 'modifiedTime', 'trashed')}
+        meta['webViewLink'] = f"https://drive.google.com/file/d/{f['id']}/view"
+        if f['appProperties']:
+            meta['appProperties'] = dict(f['appProperties'])
+        if f['mimeType'] != FOLDER_MIME:
+            meta['size'] = str(len(f['content']))
+            meta['md5Checksum'] = f['md5']
+        return meta
+
+    def _create(self, metadata, content, file_id=None):
+        file_id = file_id or f'emu{next(self._ids):06d}'
+        self.files[file_id] = {
+            'id': file_id, 'name': metadata.get('name') or 'Untitled',
+            'mimeType': metadata.get('mimeType') or 'application/octet-stream',
+            'parents': list(metadata.get('parents') or []), 'trashed': False,
+            'appProperties': dict(metadata.get('appProperties') or {}),
+        }
+        return self._store(self.files[file_id], content)
+
+    def _store(self, f, content):
+        if content is not None:
+            f['content'] = bytes(content)
+            f['md5'] = hashlib.md5(f['content']).hexdigest()
+        f.setdefault('content', b'')
+        f.setdefault('md5', hashlib.md5(b'').hexdigest())
+        f['modifiedTime'] = _now_rfc3339()
+        self._changes.append(f['id'])
+        return f
+
+    def _update(self, file_id, metadata, content):
+        f = self.files[file_id]
+        for key in ('name', 'mimeType'):
+            if metadata.get(key):
+                f[key] = metadata[key]
+        f['appProperties'].update(metadata.get('appProperties') or {})
+        return self._store(f, content)
+
+    def _write(self, file_id, headers, body):
+        """Metadata-only create or update."""
+        if file_id is not None and file_id not in self.files:
+            return self._not_found(file_id)
+        metadata = json.loads(body or b'{}')
+        f = self._update(file_id, metadata, None) if file_id else self._create(metadata, None)
+        return _json_reply(200, self._meta(f))
+
+    def _upload(self, file_id, query, headers, body):
+        if file_id is not None and file_id not in self.files:
+            return self._not_found(file_id)
+        upload_type = query.get('uploadType')
+        if upload_type == 'resumable':
+            upload_id = secrets.token_urlsafe(12)
+            total = headers.get('x-upload-content-length')
+            self._uploads[upload_id] = {
+                'file_id': file_id, 'metadata': json.loads(body or b'{}'), 'data': bytearray(),
+                'total': int(total) if total else None, 'mime_type': headers.get('x-upload-content-type')}
+            return 200, {'Location': f'{DRIVE_UPLOAD_URL}?uploadType=resumable&upload_id={upload_id}'}, b''
+        if upload_type == 'multipart':
+            parts = _split_multipart(headers.get('content-type', ''), body)
+            if len(parts) != 2:
+                return _error_reply(400, 'Expected metadata and media parts', 'badContent')
+            metadata = json.loads(parts[0][1] or b'{}')
+            metadata.setdefault('mimeType', parts[1][0].get('content-type'))
+            content = parts[1][1]
+        elif upload_type == 'media':
+            metadata, content = {'mimeType': headers.get('content-type')}, body
+        else:
+            return _error_reply(400, f'Unsupported uploadType {upload_type!r}', 'badRequest')
+        f = self._update(file_id, metadata, content) if file_id else self._create(metadata, content)
+        return _json_reply(200, self._meta(f))
+
+    def _upload_chunk(self, query, headers, body):
+        session = self._uploads.get(query['upload_id'])
+        if session is None:
+            return _error_reply(404, 'Upload session not found', 'notFound')
+        if 'completed' in session:
+            # Like Drive, a finished session answers with the file it created.
+            f = self.files.get(session['completed'])
+            return _json_reply(200, self._meta(f)) if f else self._not_found(session['completed'])
+        match = re.match(r'bytes (?:(\d+)-(\d+)|\*)/(\d+|\*)$', headers.get('content-range', '').strip())
+        if not match:
+            return _error_reply(400, 'Invalid Content-Range', 'badContent')
+        first, _, total = match.groups()
+        if total != '*':
+            session['total'] = int(total)
+        if first is not None:
+            start = int(first)
+            if start > len(session['data']):
+                return _error_reply(400, 'Chunk does not continue the upload', 'badContent')
+            del session['data'][start:]
+            session['data'] += body
+        received = len(session['data'])
+        if session['total'] is not None and received >= session['total']:
+            metadata = dict(session['metadata'])
+            if session['mime_type']:
+                metadata.setdefault('mimeType', session['mime_type'])
+            content = bytes(session['data'])
+            if session['file_id']:
+                f = self._update(session['file_id'], metadata, content)
+            else:
+                f = self._create(metadata, content)
+            self._uploads[query['upload_id']] = {'completed': f['id']}
+            return _json_reply(200, self._meta(f))
+        return 308, ({'Range': f'bytes=0-{received - 1}'} if received else {}), b''
+
+    def _cancel_upload(self, query, headers, body):
+        self._uploads.pop(query['upload_id'], None)
+        return 499, {}, b''
+
+    def _get(self, file_id, query, headers):
+        f = self.files.get(file_id)
+        if f is None:
+            return self._not_found(file_id)
+        if query.get('alt') != 'media':
+            return _json_reply(200, self._meta(f))
+        return _range_reply(f['content'], headers.get('range'), {
+            'Content-Type': f['mimeType'], 'Accept-Ranges': 'bytes', 'ETag': f'"{f["md5"]}"'})
+
+    def _delete(self, file_id):
+        if self.files.pop(file_id, None) is None:
+            return self._not_found(file_id)
+        self._changes.append(file_id)
+        return 204, {}, b''
+
+    def _matches(self, f, q):
+        for parent in re.findall(r"'([^']*)' in parents", q):
+            if parent not in f['parents']:
+                return False
+        name = re.search(r"name = '([^']*)'", q)
+        if name and f['name'] != name.group(1):
+            return False
+        mime = re.search(r"mimeType (!?=) '([^']*)'", q)
+        if mime and (f['mimeType'] == mime.group(2)) != (mime.group(1) == '='):
+            return False
+        trashed = re.search(r'trashed = (true|false)', q)
+        if trashed and f['trashed'] != (trashed.group(1) == 'true'):
+            return False
+        for key, value in re.findall(r"appProperties has \{ key='([^']*)' and value='([^']*)' \}", q):
+            if f['appProperties'].get(key) != value:
+                return False
+        return True
+
+    def _list(self, query, headers, body):
+        q = query.get('q', '')
+        files = [self._meta(f) for f in self.files.values() if self._matches(f, q)]
+        page_size = min(int(query.get('pageSize') or 100), 1000)
+        offset = int(query.get('pageToken') or 0)
+        reply = {'kind': 'drive#fileList', 'files': files[offset:offset + page_size]}
+        if offset + page_size < len(files):
+            reply['nextPageToken'] = str(offset + page_size)
+        return _json_reply(200, reply)
+
+    def _list_changes(self, query, headers, body):
+        start = int(query.get('pageToken') or 1)
+        page_size = min(int(query.get('pageSize') or 100), 1000)
+        changes = []
+        for file_id in self._changes[start - 1:start - 1 + page_size]:
+            f = self.files.get(file_id)
+            change = {'kind': 'drive#change', 'fileId': file_id, 'removed': f is None}
+            if f is not None:
+                change['file'] = self._meta(f)
+            changes.append(change)
+        reply = {'kind': 'drive#changeList', 'changes': changes}
+        if start - 1 + page_size < len(self._changes):
+            reply['nextPageToken'] = str(start + page_size)
+        else:
+            reply['newStartPageToken'] = str(len(self._changes) + 1)
+        return _json_reply(200, reply)
+
+
+# --- Cloud Storage JSON API ---
+class GCSEmulator(_Backend):
+    """Cloud Storage objects, held in memory. Every bucket name exists."""
+
+    name = 'gcs'
+
+    def __init__(self, faults=None):
+        super().__init__(faults)
+        self.buckets = {}
+        self._generations = itertools.count(int(time.time() * 1000000))
+
+    def put(self, bucket, name, content, content_type='application/octet-stream'):
+        """Store an object directly, without latency or faults; returns its resource."""
+        with self.lock:
+            return self._resource(self._store(bucket, name, content, content_type))
+
+    def route(self, method, path, query):
+        match = re.match(r'^(/upload|/download)?/storage/v1/b/([^/]+)/o(?:/(.+))?$', path)
+        if not match:
+            return None
+        prefix, bucket, name = match.groups()
+        name = unquote(name) if name else None
+        if prefix == '/upload' and method == 'POST' and name is None:
+            return 'objects.insert', lambda q, h, b: self._insert(bucket, q, h, b)
+        if name is None:
+            return ('objects.list', lambda q, h, b: self._list(bucket, q)) if method == 'GET' else None
+        if method == 'GET' and (prefix == '/download' or query.get('alt') == 'media'):
+            return 'objects.download', lambda q, h, b: self._download(bucket, name, q, h)
+        if method == 'GET':
+            return 'objects.get', lambda q, h, b: self._get(bucket, name)
+        if method == 'DELETE':
+            return 'objects.delete', lambda q, h, b: self._delete(bucket, name, q)
+        return None
+
+    def _not_found(self, bucket, name):
+        return _error_reply(404, f'No such object: {bucket}/{name}', 'notFound')
+
+    def _store(self, bucket, name, content, content_type, metadata=None):
+        md5 = base64.b64encode(hashlib.md5(content).digest()).decode('ascii')
+        obj = {'bucket': bucket, 'name': name, 'content': bytes(content), 'md5Hash': md5,
+               'contentType': content_type or 'application/octet-stream',
+               'generation': next(self._generations), 'updated': _now_rfc3339()}
+        obj.update({k: v for k, v in (metadata or {}).items() if k in GCS_STORED_METADATA and v})
+        self.buckets.setdefault(bucket, {})[name] = obj
+        return obj
+
+    def _resource(self, obj):
+        return {'kind': 'storage#object', 'id': f"{obj['bucket']}/{obj['name']}/{obj['generation']}",
+                'bucket': obj['bucket'], 'name': obj['name'], 'generation': str(obj['generation']),
+                'metageneration': '1', 'contentType': obj['contentType'], 'size': str(len(obj['content'])),
+                'md5Hash': obj['md5Hash'], 'updated': obj['updated'], 'timeCreated': obj['updated'],
+                **{k: obj[k] for k in GCS_STORED_METADATA if k in obj}}
+
+    def _precondition_failed(self, obj, query):
+        expected = query.get('ifGenerationMatch')
+        if expected is None:
+            return False
+        return (obj['generation'] if obj else 0) != int(expected)
+
+    def _insert(self, bucket, query, headers, body):
+        if query.get('uploadType') == 'multipart':
+            parts = _split_multipart(headers.get('content-type', ''), body)
+            if len(parts) != 2:
+                return _error_reply(400, 'Expected metadata and media parts', 'invalid')
+            metadata, content = json.loads(parts[0][1] or b'{}'), parts[1][1]
+            metadata.setdefault('contentType', parts[1][0].get('content-type'))
+        else:
+            metadata, content = {'name': query.get('name'), 'contentType': headers.get('content-type')}, body
+        name = metadata.get('name') or query.get('name')
+        if not name:
+            return _error_reply(400, 'Object name is required', 'required')
+        if self._precondition_failed(self.buckets.get(bucket, {}).get(name), query):
+            return _error_reply(412, 'At least one of the pre-conditions you specified did not hold.',
+                                'conditionNotMet')
+        obj = self._store(bucket, name, content, metadata.get('contentType'), metadata)
+        return _json_reply(200, self._resource(obj))
+
+    def _list(self, bucket, query):
+        prefix = query.get('prefix', '')
+        names = sorted(n for n in self.buckets.get(bucket, {}) if n.startswith(prefix))
+        page_size = int(query.get('maxResults') or 1000)
+        offset = int(query.get('pageToken') or 0)
+        reply = {'kind': 'storage#objects',
+                 'items': [self._resource(self.buckets[bucket][n]) for n in names[offset:offset + page_size]]}
+        if offset + page_size < len(names):
+            reply['nextPageToken'] = str(offset + page_size)
+        return _json_reply(200, reply)
+
+    def _get(self, bucket, name):
+        obj = self.buckets.get(bucket, {}).get(name)
+        return _json_reply(200, self._resource(obj)) if obj else self._not_found(bucket, name)
+
+    def _download(self, bucket, name, query, headers):
+        obj = self.buckets.get(bucket, {}).get(name)
+        if obj is None:
+            return self._not_found(bucket, name)
+        return _range_reply(obj['content'], headers.get('range'), {
+            'Content-Type': obj['contentType'], 'X-Goog-Generation': str(obj['generation']),
+            'X-Goog-Metageneration': '1', 'X-Goog-Hash': f"md5={obj['md5Hash']}",
+            'ETag': f'"{obj["md5Hash"]}"'})
+
+    def _delete(self, bucket, name, query):
+        obj = self.buckets.get(bucket, {}).get(name)
+        if obj is None:
+            return self._not_found(bucket, name)
+        if self._precondition_failed(obj, query):
+            return _error_reply(412, 'At least one of the pre-conditions you specified did not hold.',
+                                'conditionNotMet')
+        del self.buckets[bucket][name]
+        return 204, {}, b''
+
+
+# --- Google Sign-In ---
+class _AuthResponse:
+    """google.auth.transport.Response for the cert endpoint."""
+
+    def __init__(self, status, headers, data):
+        self.status = status
+        self.headers = headers
+        self.data = data
+
+
+class IdentityEmulator:
+    """Issues Google-style ID tokens and serves the certs that verify them."""
+
+    def __init__(self, client_id, key_bits=1024):
+        public_key, private_key = rsa.newkeys(key_bits)
+        self.client_id = client_id
+        self.key_id = secrets.token_hex(8)
+        self._signer = crypt.RSASigner.from_string(private_key.save_pkcs1(), key_id=self.key_id)
+        self._certs = json.dumps({self.key_id: public_key.save_pkcs1().decode('ascii')}).encode('utf-8')
+        self.cert_fetches = 0
+
+    def token(self, email, lifetime=3600):
+        now = int(time.time())
+        payload = {'iss': 'https://accounts.google.com', 'aud': self.client_id, 'sub': email,
+                   'email': email, 'email_verified': True, 'iat': now, 'exp': now + lifetime}
+        return jwt.encode(self._signer, payload).decode('ascii')
+
+    def __call__(self, url, method='GET', body=None, headers=None, timeout=None, **kwargs):
+        self.cert_fetches += 1
+        return _AuthResponse(200, {'cache-control': 'public, max-age=3600', 'content-type': 'application/json'},
+                             self._certs)
+
+
+# --- Transports ---
+class _Http:
+    """httplib2.Http stand-in for the Drive discovery client; safe to share across threads."""
+
+    timeout = None
+
+    def __init__(self, emulator):
+        self._emulator = emulator
+
+    def request(self, uri, method='GET', body=None, headers=None, redirections=5, connection_type=None):
+        status, reply_headers, content = self._emulator.dispatch(method, uri, headers, body)
+        info = {k.lower(): v for k, v in reply_headers.items()}
+        info.update({'status': str(status), 'content-length': str(len(content))})
+        return httplib2.Response(info), content
+
+    def close(self):
+        pass
+
+
+class _Adapter(requests.adapters.HTTPAdapter):
+    """requests transport adapter answering from the emulator instead of the network."""
+
+    def __init__(self, emulator):
+        super().__init__()
+        self._emulator = emulator
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        status, headers, content = self._emulator.dispatch(request.method, request.url,
+                                                           request.headers, request.body)
+        raw = HTTPResponse(body=BytesIO(content), headers={**headers, 'Content-Length': str(len(content))},
+                           status=status, reason=REASONS.get(status, ''), preload_content=False,
+                           decode_content=False, request_method=request.method, request_url=request.url)
+        return self.build_response(request, raw)
+
+
+class Emulator:
+    """Drive, GCS and sign-in fakes behind one dispatcher.
+
+    Requests are routed by path (/drive/v3, /upload/drive/v3 -> Drive;
+    /storage/v1, /upload/storage/v1, /download/storage/v1 -> GCS), whatever
+    the host, so STORAGE_EMULATOR_HOST style endpoints work too.
+    """
+
+    def __init__(self, drive=None, gcs=None, client_id='emulator-client-id'):
+        self.drive = DriveEmulator(drive)
+        self.gcs = GCSEmulator(gcs)
+        self.identity = IdentityEmulator(client_id)
+        self.http = _Http(self)
+
+    def dispatch(self, method, url, headers=None, body=None):
+        if hasattr(body, 'read'):
+            body = body.read()
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        headers = {_text(k).lower(): _text(v) for k, v in (headers or {}).items()}
+        path = urlsplit(url).path
+        backend = self.gcs if re.match(r'^(/upload|/download)?/storage/v1/', path) else self.drive
+        return backend.handle(method.upper(), url, headers, body or b'')
+
+    def session(self):
+        session = AuthorizedSession(AnonymousCredentials())
+        adapter = _Adapter(self)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def set_faults_enabled(self, enabled):
+        self.drive.faults.enabled = enabled
+        self.gcs.faults.enabled = enabled
+
+    def stats(self):
+        return {'drive': self.drive.stats(), 'gcs': self.gcs.stats()}
+
+    def install(self, app_module, patch=setattr):
+        """Point app_module's Google clients at the emulator.
+
+        Call after importing main and before the first request; it replaces
+        the lazily built clients, so no credentials are needed. Every module
+        attribute is set through patch(obj, name, value); tests pass
+        monkeypatch.setattr so the real clients come back afterwards.
+        """
+        from google.cloud import storage as gcs_storage
+        if app_module.GOOGLE_DRIVE_FOLDER_ID not in self.drive.files:
+            self.drive.add('root', mime_type=FOLDER_MIME, file_id=app_module.GOOGLE_DRIVE_FOLDER_ID)
+        patch(app_module, '_thread_drive_http', lambda: self.http)
+        patch(app_module, '_drive_service', None)
+        drive_session = self.session()
+        drive_session.hooks['response'].append(app_module._metrics_response_hook('drive'))
+        patch(app_module, '_drive_session', drive_session)
+        gcs_session = self.session()
+        gcs_session.hooks['response'].append(app_module._metrics_response_hook('gcs'))
+        patch(app_module, '_gcs_client', gcs_storage.Client(project='emulator', credentials=AnonymousCredentials(),
+                                                            _http=gcs_session))
+        patch(app_module, '_auth_request', self.identity)
+        self.identity.client_id = app_module.GOOGLE_OAUTH_CLIENT_ID or self.identity.client_id
@@ -0,0 +1,502 @@
+"""Load benchmark for main:app, run offline against the emulator.
+
+    python -m bench.loadtest                              # all scenarios, 8 threads
+    python -m bench.loadtest --scenarios public,download --duration 20
+    python -m bench.loadtest --env CONTENT_WRITE_BEHIND_MS=200 --baseline bench-results/before.json
+
+The app is imported in-process with its Google clients pointed at
+bench.emulator, seeded with a deterministic dataset, and driven by --threads
+worker threads (8, like the gunicorn --threads of the Dockerfile), each
+issuing requests back to back through its own WSGI test client. Each
+scenario runs on its own for --duration seconds after --warmup seconds
+that are not recorded:
+
+    public    /public/<type> (plain, filtered, revalidated), bundle, search, changes
+    admin     create / update / delete / batch and the admin list, with a signed ID token
+    upload    POST /upload and a chunked /upload/sessions upload
+    download  /drive/file/<id> (whole, ?v=, Range, If-None-Match) and /drive/files
+
+Results (throughput, p50 / p95 / p99 per scenario and per operation, plus
+the emulator's call counts) are written as JSON to --output. With
+--baseline, ratios against an earlier result file are added as well.
+HTTP parsing and the network are not part of the measurement.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from io import BytesIO
+
+from bench.emulator import Emulator, Faults
+
+ADMIN_EMAIL = 'bench@example.com'
+SCENARIOS = ('public', 'admin', 'upload', 'download')
+WORDS = ('quantum', 'photonic', 'lattice', 'spin', 'catalyst', 'membrane', 'neural', 'graphene',
+         'thermal', 'protein', 'sensor', 'plasma', '量子', '光学', '触媒', '材料', '計測', '生体')
+ROLES = ('professor', 'associate_professor', 'doctor', 'master', 'bachelor')
+DATASET_SIZES = {'news': 120, 'events': 80, 'members': 40, 'publications': 300, 'research': 12}
+PUBLIC_HEADERS = {'Accept-Encoding': 'gzip, br'}
+DOWNLOAD_SIZES = {'16KiB': 16 * 1024, '512KiB': 512 * 1024, '4MiB': 4 * 1024 * 1024}
+
+
+# --- Dataset ---
+def _words(rng, count):
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+
+def _dataset(rng):
+    """Deterministic items for every collection, roughly one in ten hidden."""
+    def item(i, **fields):
+        stamp = f'2024-01-01T00:00:{i % 60:02d}+00:00'
+        return {'id': i, 'visible': rng.random() > 0.1, 'created_at': stamp, 'updated_at': stamp, **fields}
+
+    def date(i):
+        return f'{2015 + i % 10}-{1 + i % 12:02d}-{1 + i % 28:02d}'
+
+    return {
+        'news': [item(i, title=_words(rng, 4), body=_words(rng, 60), date=date(i), link='')
+                 for i in range(1, DATASET_SIZES['news'] + 1)],
+        'events': [item(i, title=_words(rng, 4), date=date(i), time_start='10:00', time_end='12:00',
+                        location=_words(rng, 2), description=_words(rng, 30), link='')
+                   for i in range(1, DATASET_SIZES['events'] + 1)],
+        'members': [item(i, name=f'Member {i}', name_en=f'Member {i}', role=rng.choice(ROLES),
+                         title='', research_interest=_words(rng, 8), photo_url='', email='',
+                         year_joined=str(2010 + i % 15), order=i)
+                    for i in range(1, DATASET_SIZES['members'] + 1)],
+        'publications': [item(i, title=_words(rng, 8), authors=_words(rng, 5), journal=_words(rng, 2),
+                              year=str(2000 + i % 25), volume=str(i), pages=f'{i}-{i + 9}', doi='',
+                              category=rng.choice(('paper', 'conference', 'book')), order=i)
+                         for i in range(1, DATASET_SIZES['publications'] + 1)],
+        'research': [item(i, title=_words(rng, 3), title_en=_words(rng, 3), description=_words(rng, 80),
+                          image_url='', order=i)
+                     for i in range(1, DATASET_SIZES['research'] + 1)],
+    }
+
+
+# --- Workload ---
+class Operation:
+    """One kind of request: a weighted callable returning the final test-client response."""
+
+    def __init__(self, name, weight, run, accept=(200, 201, 204, 206, 304)):
+        self.name = name
+        self.weight = weight
+        self.run = run
+        self.accept = accept
+
+
+def _read(resp):
+    """Consume and close a response so streamed bodies and their cleanup are timed."""
+    resp.get_data()
+    resp.close()
+    return resp
+
+
+class Workload:
+    """Seeds the app through its own endpoints and builds each scenario's operations."""
+
+    def __init__(self, main, emulator, seed, upload_size, session_size):
+        self.main = main
+        self.emulator = emulator
+        self.rng = random.Random(seed)
+        self.auth = {'Authorization': f'Bearer {emulator.identity.token(ADMIN_EMAIL, lifetime=86400)}'}
+        self.upload_body = self.rng.randbytes(upload_size)
+        self.session_body = self.rng.randbytes(session_size)
+        self.etags = {}
+        self.revisions = {}
+        self.files = {}
+        self.created = {'news': [], 'events': []}
+        self.created_lock = threading.Lock()
+
+    def setup(self):
+        client = self.main.app.test_client()
+        for name, items in _dataset(self.rng).items():
+            resp = client.post(f'/seed/{name}', json={'items': items}, headers=self.auth)
+            if resp.status_code != 200:
+                raise RuntimeError(f'Seeding {name} failed: {resp.status_code} {resp.get_data(as_text=True)}')
+            resp = _read(client.get(f'/public/{name}', headers=PUBLIC_HEADERS))
+            self.etags[name] = resp.headers.get('ETag')
+            plain = _read(client.get(f'/public/{name}'))
+            self.revisions[name] = json.loads(plain.get_data()).get('revision', 0)
+        for label, size in DOWNLOAD_SIZES.items():
+            meta = self.emulator.drive.add(f'bench-{label}.bin', self.rng.randbytes(size),
+                                           parents=[self.main.GOOGLE_DRIVE_FOLDER_ID])
+            self.files[label] = meta
+        for name in self.created:
+            items = json.loads(_read(client.get(f'/content/{name}')).get_data())['items']
+            self.created[name] = [item['id'] for item in items]
+
+    def dataset_summary(self):
+        return {'items': dict(DATASET_SIZES), 'download_sizes': dict(DOWNLOAD_SIZES),
+                'upload_size': len(self.upload_body), 'session_size': len(self.session_body)}
+
+    def operations(self, scenario):
+        return getattr(self, f'_{scenario}_operations')()
+
+    # Public reads
+    def _public_operations(self):
+        types = tuple(DATASET_SIZES)
+
+        def listing(client, rng):
+            return _read(client.get(f'/public/{rng.choice(types)}', headers=PUBLIC_HEADERS))
+
+        def filtered(client, rng):
+            path = rng.choice((
+                f'/public/news?year={2015 + rng.randrange(10)}&limit=10',
+                f'/public/publications?category=paper&limit=20&cursor={rng.randrange(0, 100, 20)}',
+                f'/public/members?role={rng.choice(ROLES)}&fields=id,name,role',
+            ))
+            return _read(client.get(path, headers=PUBLIC_HEADERS))
+
+        def revalidate(client, rng):
+            name = rng.choice(types)
+            headers = {**PUBLIC_HEADERS, 'If-None-Match': self.etags[name]}
+            return _read(client.get(f'/public/{name}', headers=headers))
+
+        def bundle(client, rng):
+            return _read(client.get('/public/bundle?types=news,events,members', headers=PUBLIC_HEADERS))
+
+        def search(client, rng):
+            return _read(client.get(f'/public/search?q={rng.choice(WORDS)}&limit=20'))
+
+        def changes(client, rng):
+            name = rng.choice(types)
+            return _read(client.get(f'/public/{name}/changes?since={self.revisions[name]}'))
+
+        return [
+            Operation('GET /public/<type>', 4, listing),
+            Operation('GET /public/<type>?filter', 2, filtered),
+            Operation('GET /public/<type> If-None-Match', 2, revalidate),
+            Operation('GET /public/bundle', 1, bundle),
+            Operation('GET /public/search', 1, search),
+            Operation('GET /public/<type>/changes', 1, changes, accept=(200, 304, 410)),
+        ]
+
+    # Admin mutations
+    def _pick_created(self, rng, name, remove=False):
+        with self.created_lock:
+            ids = self.created[name]
+            if not ids:
+                return None
+            index = rng.randrange(len(ids))
+            return ids.pop(index) if remove else ids[index]
+
+    def _remember_created(self, name, *item_ids):
+        with self.created_lock:
+            self.created[name].extend(item_ids)
+
+    def _admin_operations(self):
+        names = tuple(self.created)
+
+        def payload(rng, name):
+            if name == 'news':
+                return {'title': _words(rng, 4), 'body': _words(rng, 40), 'date': '2025-04-01'}
+            return {'title': _words(rng, 4), 'date': '2025-04-01', 'location': _words(rng, 2)}
+
+        def create(client, rng):
+            name = rng.choice(names)
+            resp = _read(client.post(f'/content/{name}', json=payload(rng, name), headers=self.auth))
+            if resp.status_code == 201:
+                self._remember_created(name, resp.get_json()['id'])
+            return resp
+
+        def update(client, rng):
+            name = rng.choice(names)
+            item_id = self._pick_created(rng, name) or 1
+            return _read(client.put(f'/content/{name}/{item_id}', json={'title': _words(rng, 4)},
+                                    headers=self.auth))
+
+        def delete(client, rng):
+            name = rng.choice(names)
+            item_id = self._pick_created(rng, name, remove=True) or 1
+            return _read(client.delete(f'/content/{name}/{item_id}', headers=self.auth))
+
+        def batch(client, rng):
+            name = rng.choice(names)
+            operations = [{'op': 'create', 'data': payload(rng, name)} for _ in range(5)]
+            resp = _read(client.post(f'/content/{name}/batch', json={'operations': operations},
+                                     headers=self.auth))
+            if resp.status_code == 200:
+                self._remember_created(name, *(r['id'] for r in resp.get_json()['results']))
+            return resp
+
+        def admin_list(client, rng):
+            return _read(client.get(f'/content/{rng.choice(names)}', headers=self.auth))
+
+        return [
+            Operation('POST /content/<type>', 3, create),
+            Operation('PUT /content/<type>/<id>', 3, update, accept=(200, 404, 409)),
+            Operation('DELETE /content/<type>/<id>', 1, delete, accept=(200, 404, 409)),
+            Operation('POST /content/<type>/batch', 1, batch),
+            Operation('GET /content/<type>', 2, admin_list),
+        ]
+
+    # Uploads
+    def _discard_upload(self, resp):
+        """Drop the uploaded file from the emulator so long runs keep a flat memory profile."""
+        if resp.status_code == 200:
+            self.emulator.drive.remove(resp.get_json()['id'])
+        return resp
+
+    def _upload_operations(self):
+        chunk_size = self.main.UPLOAD_CHUNK_ALIGNMENT
+
+        def simple(client, rng):
+            data = {'file': (BytesIO(self.upload_body), f'bench-{rng.randrange(10 ** 6)}.bin')}
+            return self._discard_upload(_read(client.post('/upload', data=data,
+                                                          content_type='multipart/form-data')))
+
+        def session(client, rng):
+            size = len(self.session_body)
+            resp = _read(client.post('/upload/sessions', json={'name': f'bench-{rng.randrange(10 ** 6)}.bin',
+                                                               'size': size}))
+            if resp.status_code != 201:
+                return resp
+            session_id = resp.get_json()['session_id']
+            for offset in range(0, size, chunk_size):
+                resp = _read(client.put(f'/upload/sessions/{session_id}?offset={offset}',
+                                        data=self.session_body[offset:offset + chunk_size]))
+                if resp.status_code != 200:
+                    return resp
+            return self._discard_upload(_read(client.post(f'/upload/sessions/{session_id}/finalize')))
+
+        return [
+            Operation('POST /upload', 3, simple),
+            Operation('POST /upload/sessions (create, chunks, finalize)', 1, session),
+        ]
+
+    # Downloads
+    def _download_operations(self):
+        def whole(meta):
+            return lambda client, rng: _read(client.get(f"/drive/file/{meta['id']}"))
+
+        def versioned(client, rng):
+            meta = self.files[rng.choice(tuple(self.files))]
+            return _read(client.get(f"/drive/file/{meta['id']}?v={meta['md5Checksum']}"))
+
+        def ranged(client, rng):
+            meta = self.files['4MiB']
+            start = rng.randrange(0, int(meta['size']) - 65536)
+            return _read(client.get(f"/drive/file/{meta['id']}",
+                                    headers={'Range': f'bytes={start}-{start + 65535}'}))
+
+        def revalidate(client, rng):
+            meta = self.files[rng.choice(tuple(self.files))]
+            return _read(client.get(f"/drive/file/{meta['id']}",
+                                    headers={'If-None-Match': f'"{meta["md5Checksum"]}"'}))
+
+        def listing(client, rng):
+            return _read(client.get('/drive/files'))
+
+        operations = [Operation(f'GET /drive/file/<id> {label}', 2, whole(meta))
+                      for label, meta in self.files.items()]
+        return operations + [
+            Operation('GET /drive/file/<id>?v=', 1, versioned),
+            Operation('GET /drive/file/<id> Range 64KiB', 1, ranged),
+            Operation('GET /drive/file/<id> If-None-Match', 1, revalidate),
+            Operation('GET /drive/files', 1, listing),
+        ]
+
+
+# --- Runner ---
+def _drive(app, operations, threads, seconds, seed):
+    """Run operations from `threads` closed-loop workers; returns (samples, elapsed seconds)."""
+    weights = [op.weight for op in operations]
+    deadline = time.perf_counter() + seconds
+
+    def worker(index):
+        client = app.test_client()
+        rng = random.Random(seed * 1000 + index)
+        samples = []
+        while time.perf_counter() < deadline:
+            op = rng.choices(operations, weights)[0]
+            started = time.perf_counter()
+            try:
+                status = op.run(client, rng).status_code
+            except Exception as e:
+                status = type(e).__name__
+            samples.append((op.name, time.perf_counter() - started, status, status in op.accept))
+        return samples
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(worker, range(threads)))
+    return [s for samples in results for s in samples], time.perf_counter() - started
+
+
+def _percentile(ordered, q):
+    """Nearest-rank percentile of an ascending list."""
+    return ordered[min(len(ordered) - 1, max(0, int(-(-q * len(ordered) // 100)) - 1))]
+
+
+def _summarize(samples, elapsed):
+    latencies = sorted(s[1] * 1000 for s in samples)
+    statuses = {}
+    for s in samples:
+        statuses[str(s[2])] = statuses.get(str(s[2]), 0) + 1
+    errors = sum(1 for s in samples if not s[3])
+    summary = {'requests': len(samples), 'errors': errors,
+               'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+               'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+               'statuses': dict(sorted(statuses.items()))}
+    if latencies:
+        summary['latency_ms'] = {
+            'mean': round(sum(latencies) / len(latencies), 3),
+            'p50': round(_percentile(latencies, 50), 3),
+            'p95': round(_percentile(latencies, 95), 3),
+            'p99': round(_percentile(latencies, 99), 3),
+            'max': round(latencies[-1], 3),
+        }
+    return summary
+
+
+def run_scenario(main, workload, scenario, args):
+    operations = workload.operations(scenario)
+    if args.warmup > 0:
+        _drive(main.app, operations, args.threads, args.warmup, args.seed + 1)
+    samples, elapsed = _drive(main.app, operations, args.threads, args.duration, args.seed)
+    result = _summarize(samples, elapsed)
+    result['elapsed_s'] = round(elapsed, 3)
+    result['operations'] = {op.name: _summarize([s for s in samples if s[0] == op.name], elapsed)
+                            for op in operations}
+    return result
+
+
+def _compare(results, baseline_path):
+    """Ratios of this run to a baseline result file (>1 = higher than the baseline)."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    comparison = {}
+    for name, result in results.items():
+        before = baseline.get('scenarios', {}).get(name)
+        if not before or not before.get('throughput_rps') or 'latency_ms' not in result:
+            continue
+        ratios = {'throughput': round(result['throughput_rps'] / before['throughput_rps'], 3)}
+        for key in ('p50', 'p95', 'p99'):
+            if before.get('latency_ms', {}).get(key):
+                ratios[key] = round(result['latency_ms'][key] / before['latency_ms'][key], 3)
+        comparison[name] = ratios
+    return {'path': baseline_path, 'git_revision': baseline.get('git_revision'), 'ratios': comparison}
+
+
+def _git_revision():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _print_table(results, comparison):
+    print(f"{'scenario':<10} {'req':>7} {'err':>5} {'rps':>9} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  vs baseline")
+    for name, r in results.items():
+        lat = r.get('latency_ms', {})
+        ratios = (comparison or {}).get('ratios', {}).get(name)
+        delta = ', '.join(f'{k} x{v}' for k, v in ratios.items()) if ratios else ''
+        print(f"{name:<10} {r['requests']:>7} {r['errors']:>5} {r['throughput_rps']:>9.1f} "
+              f"{lat.get('p50', 0):>9.2f} {lat.get('p95', 0):>9.2f} {lat.get('p99', 0):>9.2f}  {delta}")
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f"comma separated subset of {', '.join(SCENARIOS)}")
+    parser.add_argument('--threads', type=int, default=8, help='concurrent request threads (default: 8)')
+    parser.add_argument('--duration', type=float, default=10, help='seconds recorded per scenario (default: 10)')
+    parser.add_argument('--warmup', type=float, default=2, help='unrecorded seconds per scenario (default: 2)')
+    parser.add_argument('--seed', type=int, default=1, help='seed for the dataset, request mix and faults')
+    parser.add_argument('--upload-size', type=int, default=256 * 1024, help='bytes per POST /upload')
+    parser.add_argument('--session-size', type=int, default=1024 * 1024, help='bytes per chunked upload')
+    for backend, latency, jitter in (('drive', 40, 20), ('gcs', 20, 10)):
+        parser.add_argument(f'--{backend}-latency-ms', type=float, default=latency,
+                            help=f'fixed latency per {backend} call (default: {latency})')
+        parser.add_argument(f'--{backend}-jitter-ms', type=float, default=jitter,
+                            help=f'mean of the exponential extra latency (default: {jitter})')
+        parser.add_argument(f'--{backend}-error-rate', type=float, default=0.0,
+                            help=f'fraction of {backend} calls answered with 503 (default: 0)')
+        parser.add_argument(f'--{backend}-bandwidth', type=int, default=0,
+                            help='bytes per second for bodies, 0 = unlimited (default: 0)')
+    parser.add_argument('--env', action='append', default=[], metavar='NAME=VALUE',
+                        help='set an environment variable before main is imported (repeatable)')
+    parser.add_argument('--output', help='result file (default: bench-results/<UTC time>.json)')
+    parser.add_argument('--baseline', help='earlier result file to compare against')
+    parser.add_argument('--verbose', action='store_true', help="keep the app's warning logs")
+    args = parser.parse_args(argv)
+    args.scenarios = [s for s in args.scenarios.split(',') if s]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix='bench-')
+    overrides = dict(item.split('=', 1) for item in args.env)
+    os.environ.update({
+        'GOOGLE_OAUTH_CLIENT_ID': 'bench-client-id',
+        'ADMIN_ALLOW_EMAILS': ADMIN_EMAIL,
+        'CONTENT_LOCAL_DIR': os.path.join(workdir, 'content'),
+        'CONTENT_JOURNAL_DIR': os.path.join(workdir, 'content-journal'),
+        **overrides,
+    })
+    import main as app_module
+
+    faults = {backend: Faults(latency_ms=getattr(args, f'{backend}_latency_ms'),
+                              jitter_ms=getattr(args, f'{backend}_jitter_ms'),
+                              error_rate=getattr(args, f'{backend}_error_rate'),
+                              bandwidth=getattr(args, f'{backend}_bandwidth'), seed=args.seed + offset)
+              for offset, backend in enumerate(('drive', 'gcs'))}
+    emulator = Emulator(drive=faults['drive'], gcs=faults['gcs'])
+    emulator.install(app_module)
+    if not args.verbose:
+        app_module.app.logger.setLevel('ERROR')
+
+    workload = Workload(app_module, emulator, args.seed, args.upload_size, args.session_size)
+    emulator.set_faults_enabled(False)
+    workload.setup()
+    emulator.set_faults_enabled(True)
+
+    started_at = datetime.now(timezone.utc)
+    results = {}
+    for scenario in args.scenarios:
+        print(f'running {scenario} ...', file=sys.stderr)
+        results[scenario] = run_scenario(app_module, workload, scenario, args)
+
+    report = {
+        'benchmark': 'main:app',
+        'started_at': started_at.isoformat(),
+        'git_revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {'threads': args.threads, 'duration_s': args.duration, 'warmup_s': args.warmup,
+                   'seed': args.seed, 'scenarios': args.scenarios, 'env': overrides,
+                   'faults': {name: f.describe() for name, f in faults.items()},
+                   'dataset': workload.dataset_summary()},
+        'scenarios': results,
+        'backend_calls': emulator.stats(),
+    }
+    comparison = _compare(results, args.baseline) if args.baseline else None
+    if comparison:
+        report['baseline'] = comparison
+
+    output = args.output or os.path.join('bench-results', started_at.strftime('%Y%m%dT%H%M%SZ') + '.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    _print_table(results, comparison)
+    print(f'results written to {output}', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,56 @@
 import os
+import re
 import json
+import atexit
+import base64
+import copy
+import gzip
+import hashlib
+import hmac
+import html
+import importlib.util
+import math
+import mimetypes
+import multiprocessing
+import random
+import secrets
+import tempfile
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
 from io import BytesIO
+from urllib.parse import quote
 
-from flask import Flask, request, jsonify, send_file
+import google_auth_httplib2
+import httplib2
+import requests
+from flask import Flask, Response, g, request, jsonify, send_file
 from flask_cors import CORS
-from google.oauth2 import id_token, service_account
+from werkzeug.http import is_resource_modified
+from google.auth import jwt
+from google.oauth2 import service_account
+from google.auth.credentials import with_scopes_if_required
 from google.auth.transport import requests as google_requests
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload, MediaIoBaseDownload
-from google.cloud import storage as gcs_storage
+from google.auth.transport.requests import AuthorizedSession
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest, MediaIoBaseUpload, MediaIoBaseDownload
+from google.api_core import exceptions as gcs_exceptions
+# googleapiclient.discovery and google.cloud.storage are imported on first use
+# (_get_drive_service / _get_gcs_client), and Pillow only inside the image
+# variant worker (_render_image_variants), to keep cold starts short.
+
+try:
+    import brotli
+except ImportError:  # optional: br encoding is skipped without it
+    brotli = None
+
+# optional: uploads get no image variants without Pillow
+HAS_PIL = importlib.util.find_spec('PIL') is not None
 
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": os.environ.get("ALLOWED_ORIGINS", "*").split(",")}})
@@ -22,24 +63,338 @@ ADMIN_ALLOW_EMAILS = os.environ.get('ADMIN_ALLOW_EMAILS', '')
 SERVICE_ACCOUNT_FILE = os.environ.get('SERVICE_ACCOUNT_FILE', 'ihomework1-b1a2db2949de.json')
 GCS_BUCKET_NAME = os.environ.get('GCS_BUCKET_NAME', 'ihomework1_cloudbuild')
 GCS_CMS_PREFIX = os.environ.get('GCS_CMS_PREFIX', 'cms/')
-
-# --- Google Drive Helpers ---
+CONTENT_CACHE_TTL = float(os.environ.get('CONTENT_CACHE_TTL', '60'))
+CONTENT_CACHE_MAX_ENTRIES = int(os.environ.get('CONTENT_CACHE_MAX_ENTRIES', '32'))
+CACHE_CONTROL_PUBLIC = os.environ.get('CACHE_CONTROL_PUBLIC', 'public, max-age=60')
+CACHE_CONTROL_CONTENT = os.environ.get('CACHE_CONTROL_CONTENT', 'no-cache')
+# JSON object mapping a request path to its Cache-Control value,
+# e.g. {"/public/members": "public, max-age=600"}
+CACHE_CONTROL_OVERRIDES = json.loads(os.environ.get('CACHE_CONTROL_OVERRIDES', '') or '{}')
+CHANGE_LOG_MAX_ENTRIES = int(os.environ.get('CHANGE_LOG_MAX_ENTRIES', '500'))
+BATCH_MAX_OPERATIONS = int(os.environ.get('BATCH_MAX_OPERATIONS', '500'))
+PUBLIC_PAGE_MAX_LIMIT = int(os.environ.get('PUBLIC_PAGE_MAX_LIMIT', '1000'))
+SEARCH_SNIPPET_CONTEXT = 30
+SEARCH_SNIPPET_LENGTH = 120
+SNAPSHOT_MIN_COMPRESS_SIZE = int(os.environ.get('SNAPSHOT_MIN_COMPRESS_SIZE', '512'))
+# Where resolved Drive IDs are persisted: a local path or gs://bucket/object.
+DRIVE_ID_REGISTRY_PATH = os.environ.get('DRIVE_ID_REGISTRY_PATH', '')
+CONTENT_BACKEND = os.environ.get('CONTENT_BACKEND', 'drive')
+CONTENT_LOCAL_DIR = os.environ.get('CONTENT_LOCAL_DIR', 'content')
+HTTP_POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', '16'))
+CONTENT_WRITE_RETRIES = int(os.environ.get('CONTENT_WRITE_RETRIES', '5'))
+# Write-behind: > 0 buffers content writes in memory and a local journal and
+# uploads them at most every CONTENT_WRITE_BEHIND_MS milliseconds.
+CONTENT_WRITE_BEHIND_MS = int(os.environ.get('CONTENT_WRITE_BEHIND_MS', '0'))
+CONTENT_JOURNAL_DIR = os.environ.get('CONTENT_JOURNAL_DIR', 'content-journal')
+CONTENT_JSON_COMPACT = os.environ.get('CONTENT_JSON_COMPACT', '1' if CONTENT_WRITE_BEHIND_MS > 0 else '0') == '1'
+# Warm clients, the CMS folder and every collection in the background at start;
+# /readyz answers 503 until that is done.
+PREWARM_ON_START = os.environ.get('PREWARM_ON_START', '0') == '1'
+DRIVE_HTTP_TIMEOUT = float(os.environ.get('DRIVE_HTTP_TIMEOUT', '10'))
+DRIVE_BREAKER_FAILURE_THRESHOLD = int(os.environ.get('DRIVE_BREAKER_FAILURE_THRESHOLD', '5'))
+DRIVE_BREAKER_RESET_TIMEOUT = float(os.environ.get('DRIVE_BREAKER_RESET_TIMEOUT', '30'))
+DRIVE_API_BASE = 'https://www.googleapis.com/drive/v3'
+DRIVE_STREAM_CHUNK_SIZE = int(os.environ.get('DRIVE_STREAM_CHUNK_SIZE', str(256 * 1024)))
+DRIVE_DOWNLOAD_MAX_CONCURRENCY = int(os.environ.get('DRIVE_DOWNLOAD_MAX_CONCURRENCY', '4'))
+DRIVE_DOWNLOAD_QUEUE_TIMEOUT = float(os.environ.get('DRIVE_DOWNLOAD_QUEUE_TIMEOUT', '5'))
+# Disk cache for /drive/file downloads; empty disables it. On Cloud Run the
+# local disk is memory-backed, so keep DRIVE_FILE_CACHE_MAX_BYTES modest.
+DRIVE_FILE_CACHE_DIR = os.environ.get('DRIVE_FILE_CACHE_DIR', '')
+DRIVE_FILE_CACHE_MAX_BYTES = int(os.environ.get('DRIVE_FILE_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+CACHE_CONTROL_DRIVE_FILE = os.environ.get('CACHE_CONTROL_DRIVE_FILE', 'no-cache')
+CACHE_CONTROL_IMMUTABLE = 'public, max-age=31536000, immutable'
+DRIVE_CHANGES_POLL_INTERVAL = float(os.environ.get('DRIVE_CHANGES_POLL_INTERVAL', '2'))
+DRIVE_LIST_MAX_PAGE_SIZE = 1000
+DRIVE_UPLOAD_BASE = 'https://www.googleapis.com/upload/drive/v3'
+# Drive requires every chunk but the last to be a multiple of 256 KiB.
+UPLOAD_CHUNK_ALIGNMENT = 256 * 1024
+UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', str(4 * 1024 * 1024)))
+UPLOAD_RETRIES = int(os.environ.get('UPLOAD_RETRIES', '5'))
+UPLOAD_SESSION_TTL = int(os.environ.get('UPLOAD_SESSION_TTL', '86400'))
+# Signs upload session ids; set the same value on every instance.
+UPLOAD_SESSION_SECRET = os.environ.get('UPLOAD_SESSION_SECRET', '')
+IMAGE_VARIANT_WIDTHS = [int(w) for w in os.environ.get('IMAGE_VARIANT_WIDTHS', '320,640,1280').split(',') if w]
+IMAGE_VARIANT_FORMATS = [f for f in os.environ.get('IMAGE_VARIANT_FORMATS', 'avif,webp').split(',') if f]
+IMAGE_VARIANT_FOLDER = os.environ.get('IMAGE_VARIANT_FOLDER', '_variants')
+IMAGE_PROCESS_WORKERS = int(os.environ.get('IMAGE_PROCESS_WORKERS', '2'))
+CACHE_CONTROL_IMAGE = os.environ.get('CACHE_CONTROL_IMAGE', 'public, max-age=86400')
+STATIC_EXPORT_TARGET = os.environ.get('STATIC_EXPORT_TARGET', '')
+STATIC_EXPORT_DELAY_MS = int(os.environ.get('STATIC_EXPORT_DELAY_MS', '2000'))
+STATIC_TEMPLATE_DIR = os.environ.get('STATIC_TEMPLATE_DIR',
+                                     os.path.join(os.path.dirname(os.path.abspath(__file__)), 'public'))
+CACHE_CONTROL_STATIC = os.environ.get('CACHE_CONTROL_STATIC', 'public, max-age=300')
+TOKEN_CACHE_MAX_ENTRIES = int(os.environ.get('TOKEN_CACHE_MAX_ENTRIES', '256'))
+GOOGLE_CERTS_URL = 'https://www.googleapis.com/oauth2/v1/certs'
+GOOGLE_CERTS_DEFAULT_MAX_AGE = 300
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+
+# --- Metrics ---
+# A small in-process registry rendered in the Prometheus text format on
+# /metrics. Values are per worker process (the service runs one).
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+class Metric:
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        self._values = {}
+        _metrics.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(n, '')) for n in self.labelnames)
+
+    def _labels(self, key, extra=()):
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ''
+        escaped = (v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+        return '{' + ','.join(f'{n}="{v}"' for (n, _), v in zip(pairs, escaped)) + '}'
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        with self._lock:
+            return [f'{self.name}{self._labels(k)} {v}' for k, v in sorted(self._values.items())]
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = buckets
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * len(self.buckets) + [0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-2] += 1
+            counts[-1] += value
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for key, counts in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, counts):
+                    lines.append(f"{self.name}_bucket{self._labels(key, [('le', str(bound))])} {count}")
+                lines.append(f"{self.name}_bucket{self._labels(key, [('le', '+Inf')])} {counts[-2]}")
+                lines.append(f'{self.name}_count{self._labels(key)} {counts[-2]}')
+                lines.append(f'{self.name}_sum{self._labels(key)} {counts[-1]}')
+        return lines
+
+
+_metrics = []
+HTTP_REQUEST_SECONDS = Histogram('http_request_duration_seconds', 'Time to produce a response, per route.',
+                                 ('method', 'route', 'status'))
+HTTP_RESPONSE_BYTES = Histogram('http_response_size_bytes', 'Response body size, per route.',
+                                ('route',), SIZE_BUCKETS)
+BACKEND_SECONDS = Histogram('backend_request_duration_seconds', 'Latency of Drive / GCS API calls.',
+                            ('backend', 'operation'))
+BACKEND_ERRORS = Counter('backend_errors_total', 'Failed Drive / GCS API calls.', ('backend', 'operation'))
+CACHE_REQUESTS = Counter('cache_requests_total', 'Cache lookups by result (hit / miss).', ('cache', 'result'))
+CONTENT_FALLBACKS = Counter('content_fallback_total', 'Content operations served by the fallback store.',
+                            ('operation',))
+TOKEN_VERIFY_SECONDS = Histogram('token_verify_duration_seconds', 'Admin ID token verification time.',
+                                 ('result',))
+CONTENT_WRITE_BYTES = Histogram('content_write_size_bytes', 'Serialized size of content files being stored.',
+                                buckets=SIZE_BUCKETS)
+
+
+def _render_metrics():
+    lines = []
+    for metric in _metrics:
+        lines.append(f'# HELP {metric.name} {metric.help}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+@contextmanager
+def _timed_backend_call(backend, operation):
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        BACKEND_ERRORS.inc(backend=backend, operation=operation)
+        raise
+    finally:
+        BACKEND_SECONDS.observe(time.perf_counter() - started, backend=backend, operation=operation)
+
+
+def _backend_operation(method, url):
+    """Name a raw Drive / GCS HTTP call after the API operation it performs."""
+    path, _, query = url.partition('?')
+    if '/upload/' in path:
+        return 'upload'
+    if 'alt=media' in query or '/download/' in path:
+        return 'get_media'
+    if path.rstrip('/').endswith(('/o', '/files')):
+        return 'list' if method == 'GET' else 'create'
+    return {'GET': 'get', 'DELETE': 'delete'}.get(method, 'update')
+
+
+def _metrics_response_hook(backend):
+    """requests response hook recording latency (to headers) and HTTP errors."""
+    def hook(resp, *args, **kwargs):
+        operation = _backend_operation(resp.request.method, resp.request.url)
+        BACKEND_SECONDS.observe(resp.elapsed.total_seconds(), backend=backend, operation=operation)
+        if resp.status_code >= 400 and resp.status_code != 404:
+            BACKEND_ERRORS.inc(backend=backend, operation=operation)
+    return hook
+
+
+# --- Client Manager ---
+# Credentials and API clients are created lazily, once per process, and shared
+# across gunicorn threads. httplib2 is not thread-safe, so every thread gets its
+# own authorized Http for the Drive discovery client; requests-based clients
+# (GCS, Google cert endpoint) share pooled keep-alive sessions.
+DRIVE_SCOPES = ['https://www.googleapis.com/auth/drive']
+
+_clients_lock = threading.RLock()
+_credentials = {}
 _drive_service = None
+_gcs_client = None
+_drive_session = None
+_auth_request = None
+_thread_local = threading.local()
+
+
+def _get_credentials(scopes=None):
+    """Load service account (or default) credentials once per scope set."""
+    key = tuple(scopes or ())
+    creds = _credentials.get(key)
+    if creds is not None:
+        return creds
+    with _clients_lock:
+        if key in _credentials:
+            return _credentials[key]
+        if os.path.exists(SERVICE_ACCOUNT_FILE):
+            creds = service_account.Credentials.from_service_account_file(
+                SERVICE_ACCOUNT_FILE, scopes=scopes)
+        else:
+            from google.auth import default
+            creds, _ = default(scopes=scopes)
+        _credentials[key] = creds
+        return creds
+
+
+def _pooled_session(session=None):
+    """Mount a keep-alive connection pool sized for the worker's threads."""
+    session = session or requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_MAXSIZE)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def _thread_drive_http():
+    """Per-thread authorized httplib2 client; keeps its connection alive."""
+    http = getattr(_thread_local, 'drive_http', None)
+    if http is None:
+        http = google_auth_httplib2.AuthorizedHttp(_get_credentials(DRIVE_SCOPES),
+                                                   http=httplib2.Http(timeout=DRIVE_HTTP_TIMEOUT))
+        _thread_local.drive_http = http
+    return http
+
+
+class _TimedHttpRequest(HttpRequest):
+    """Drive API request that records its latency under its method id (files.get, ...)."""
+
+    def _operation(self):
+        return (self.methodId or 'unknown').split('.', 1)[-1]
+
+    def execute(self, *args, **kwargs):
+        with _timed_backend_call('drive', self._operation()):
+            return super().execute(*args, **kwargs)
+
+    def next_chunk(self, *args, **kwargs):
+        with _timed_backend_call('drive', self._operation() + '.chunk'):
+            return super().next_chunk(*args, **kwargs)
+
+
+def _build_drive_request(http, *args, **kwargs):
+    return _TimedHttpRequest(_thread_drive_http(), *args, **kwargs)
+
 
 def _get_drive_service():
     global _drive_service
     if _drive_service is not None:
         return _drive_service
-    scopes = ['https://www.googleapis.com/auth/drive']
-    creds = None
-    if os.path.exists(SERVICE_ACCOUNT_FILE):
-        creds = service_account.Credentials.from_service_account_file(
-            SERVICE_ACCOUNT_FILE, scopes=scopes)
-    else:
-        from google.auth import default
-        creds, _ = default(scopes=scopes)
-    _drive_service = build('drive', 'v3', credentials=creds)
-    return _drive_service
+    with _clients_lock:
+        if _drive_service is None:
+            from googleapiclient.discovery import build
+            # The discovery document bundled with googleapiclient; no fetch at startup.
+            _drive_service = build('drive', 'v3', http=_thread_drive_http(),
+                                   requestBuilder=_build_drive_request, static_discovery=True)
+        return _drive_service
+
+
+def _get_gcs_client():
+    """Get the shared GCS client using service account or default credentials."""
+    global _gcs_client
+    if _gcs_client is not None:
+        return _gcs_client
+    with _clients_lock:
+        if _gcs_client is None:
+            from google.cloud import storage as gcs_storage
+            creds = _get_credentials()
+            session = _pooled_session(AuthorizedSession(
+                with_scopes_if_required(creds, gcs_storage.Client.SCOPE)))
+            session.hooks['response'].append(_metrics_response_hook('gcs'))
+            project = getattr(creds, 'project_id', None)
+            _gcs_client = gcs_storage.Client(credentials=creds, project=project, _http=session)
+        return _gcs_client
+
+
+def _get_drive_session():
+    """Shared authorized requests session for streaming Drive media."""
+    global _drive_session
+    if _drive_session is None:
+        with _clients_lock:
+            if _drive_session is None:
+                _drive_session = _pooled_session(AuthorizedSession(_get_credentials(DRIVE_SCOPES)))
+                _drive_session.hooks['response'].append(_metrics_response_hook('drive'))
+    return _drive_session
+
+
+def _get_auth_request():
+    """Transport for fetching Google's token signing certs over a pooled session."""
+    global _auth_request
+    if _auth_request is None:
+        with _clients_lock:
+            if _auth_request is None:
+                _auth_request = google_requests.Request(session=_pooled_session())
+    return _auth_request
+
+
+# --- Google Drive Helpers ---
+_DRIVE_ID_RE = re.compile(r'[A-Za-z0-9_-]{1,128}')
+
+
+def _is_drive_id(value):
+    """True if value looks like a Drive file id (letters, digits, '-' and '_')."""
+    return bool(_DRIVE_ID_RE.fullmatch(value or ''))
+
+
+def _drive_query_literal(value):
+    """Quote value as a string literal for a Drive files.list q expression."""
+    return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
 
 
 def _find_file(name, folder_id=None):
@@ -69,101 +424,876 @@ def _find_or_create_folder(name, parent_id=None):
     return folder['id']
 
 
+# --- Drive ID Registry ---
+# Resolved Drive IDs keyed by "<parent id>/<name>", so the CMS folder and the
+# content files are looked up once instead of on every read and write.
+_drive_ids = {}
+_drive_ids_lock = threading.Lock()
+_drive_ids_loaded = False
+
+
+def _load_drive_ids():
+    """Fill the registry from DRIVE_ID_REGISTRY_PATH once per process."""
+    global _drive_ids_loaded
+    with _drive_ids_lock:
+        if _drive_ids_loaded:
+            return
+        _drive_ids_loaded = True
+        if not DRIVE_ID_REGISTRY_PATH:
+            return
+        try:
+            if DRIVE_ID_REGISTRY_PATH.startswith('gs://'):
+                bucket_name, _, blob_name = DRIVE_ID_REGISTRY_PATH[5:].partition('/')
+                blob = _get_gcs_client().bucket(bucket_name).blob(blob_name)
+                if not blob.exists():
+                    return
+                data = json.loads(blob.download_as_text(encoding='utf-8'))
+            else:
+                if not os.path.exists(DRIVE_ID_REGISTRY_PATH):
+                    return
+                with open(DRIVE_ID_REGISTRY_PATH, encoding='utf-8') as f:
+                    data = json.load(f)
+        except Exception as e:
+            app.logger.warning(f'Could not load Drive ID registry: {e}')
+            return
+        if isinstance(data, dict):
+            _drive_ids.update({k: v for k, v in data.items() if isinstance(v, str)})
+
+
+def _save_drive_ids():
+    """Persist the registry so that cold starts can skip the lookups."""
+    if not DRIVE_ID_REGISTRY_PATH:
+        return
+    with _drive_ids_lock:
+        body = json.dumps(_drive_ids, sort_keys=True)
+    try:
+        if DRIVE_ID_REGISTRY_PATH.startswith('gs://'):
+            bucket_name, _, blob_name = DRIVE_ID_REGISTRY_PATH[5:].partition('/')
+            blob = _get_gcs_client().bucket(bucket_name).blob(blob_name)
+            blob.upload_from_string(body, content_type='application/json')
+        else:
+            tmp_path = f'{DRIVE_ID_REGISTRY_PATH}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(body)
+            os.replace(tmp_path, DRIVE_ID_REGISTRY_PATH)
+    except Exception as e:
+        app.logger.warning(f'Could not save Drive ID registry: {e}')
+
+
+def _lookup_drive_id(name, parent_id):
+    _load_drive_ids()
+    with _drive_ids_lock:
+        return _drive_ids.get(f'{parent_id}/{name}')
+
+
+def _remember_drive_id(name, parent_id, file_id):
+    key = f'{parent_id}/{name}'
+    with _drive_ids_lock:
+        if _drive_ids.get(key) == file_id:
+            return
+        _drive_ids[key] = file_id
+    _save_drive_ids()
+
+
+def _forget_drive_ids(*file_ids):
+    """Drop every registry entry that points at one of file_ids."""
+    with _drive_ids_lock:
+        stale = [k for k, v in _drive_ids.items() if v in file_ids]
+        for key in stale:
+            del _drive_ids[key]
+    if stale:
+        _save_drive_ids()
+
+
+def _is_stale_id_error(error):
+    return isinstance(error, HttpError) and error.resp.status in (404, 410)
+
+
 def _get_cms_folder_id():
     """Get or create the CMS subfolder inside the Drive folder."""
-    return _find_or_create_folder(CMS_PREFIX)
+    folder_id = _lookup_drive_id(CMS_PREFIX, GOOGLE_DRIVE_FOLDER_ID)
+    if folder_id:
+        return folder_id
+    folder_id = _find_or_create_folder(CMS_PREFIX)
+    _remember_drive_id(CMS_PREFIX, GOOGLE_DRIVE_FOLDER_ID, folder_id)
+    return folder_id
+
+
+def _resolve_cms_file_id(filename):
+    """Return the Drive ID of a content file, or None if it does not exist yet."""
+    cms_folder = _get_cms_folder_id()
+    file_id = _lookup_drive_id(filename, cms_folder)
+    if file_id:
+        return file_id
+    file_meta = _find_file(filename, cms_folder)
+    if not file_meta:
+        return None
+    _remember_drive_id(filename, cms_folder, file_meta['id'])
+    return file_meta['id']
 
 
-def _get_gcs_client():
-    """Get GCS client using service account or default credentials."""
-    if os.path.exists(SERVICE_ACCOUNT_FILE):
-        creds = service_account.Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE)
-        return gcs_storage.Client(credentials=creds, project=creds.project_id)
-    return gcs_storage.Client()
-
-def _read_gcs_json(filename):
-    """Read a JSON file from GCS."""
-    try:
-        client = _get_gcs_client()
-        bucket = client.bucket(GCS_BUCKET_NAME)
-        blob = bucket.blob(GCS_CMS_PREFIX + filename)
-        if not blob.exists():
-            return None
-        data = blob.download_as_text(encoding='utf-8')
-        return json.loads(data)
-    except Exception:
+def _with_fresh_ids_on_stale(filename, func):
+    """Run func, re-resolving the registry IDs once if Drive reports them gone."""
+    try:
+        return func()
+    except HttpError as e:
+        if not _is_stale_id_error(e):
+            raise
+        cms_folder = _lookup_drive_id(CMS_PREFIX, GOOGLE_DRIVE_FOLDER_ID)
+        stale_ids = [cms_folder]
+        if cms_folder:
+            stale_ids.append(_lookup_drive_id(filename, cms_folder))
+        _forget_drive_ids(*[i for i in stale_ids if i])
+        return func()
+
+
+def _download_drive_bytes(filename):
+    file_id = _resolve_cms_file_id(filename)
+    if not file_id:
         return None
+    service = _get_drive_service()
+    req = service.files().get_media(fileId=file_id)
+    buf = BytesIO()
+    downloader = MediaIoBaseDownload(buf, req)
+    done = False
+    with _timed_backend_call('drive', 'files.get_media'):
+        while not done:
+            _, done = downloader.next_chunk()
+    return buf.getvalue()
 
-def _write_gcs_json(filename, data):
-    """Write a JSON file to GCS."""
-    client = _get_gcs_client()
-    bucket = client.bucket(GCS_BUCKET_NAME)
-    blob = bucket.blob(GCS_CMS_PREFIX + filename)
-    body = json.dumps(data, ensure_ascii=False, indent=2)
-    blob.upload_from_string(body, content_type='application/json')
 
-def _read_drive_json(filename):
-    """Read a JSON file from the CMS folder on Drive, with GCS fallback."""
-    # Try Drive first
-    try:
+def _upload_drive_bytes(filename, body):
+    media = MediaIoBaseUpload(BytesIO(body), mimetype='application/json', resumable=False)
+    service = _get_drive_service()
+    file_id = _resolve_cms_file_id(filename)
+    if file_id:
+        service.files().update(fileId=file_id, media_body=media).execute()
+    else:
         cms_folder = _get_cms_folder_id()
-        file_meta = _find_file(filename, cms_folder)
-        if file_meta:
-            service = _get_drive_service()
-            req = service.files().get_media(fileId=file_meta['id'])
-            buf = BytesIO()
-            downloader = MediaIoBaseDownload(buf, req)
-            done = False
-            while not done:
-                _, done = downloader.next_chunk()
-            buf.seek(0)
-            return json.loads(buf.read().decode('utf-8'))
-    except Exception:
-        pass
-    # Fallback to GCS
-    return _read_gcs_json(filename)
+        metadata = {'name': filename, 'parents': [cms_folder]}
+        created = service.files().create(body=metadata, media_body=media, fields='id').execute()
+        _remember_drive_id(filename, cms_folder, created['id'])
+    _mark_drive_listings_stale()
 
 
-def _write_drive_json(filename, data):
-    """Write/update a JSON file in the CMS folder on Drive, with GCS fallback."""
-    # Try Drive first
-    try:
-        cms_folder = _get_cms_folder_id()
+# --- Content Stores ---
+# CMS JSON files live behind a ContentStore chosen by CONTENT_BACKEND:
+#   drive - Drive CMS folder, falling back to GCS when Drive fails (default)
+#   gcs   - GCS_BUCKET_NAME/GCS_CMS_PREFIX only
+#   local - a directory on local disk (CONTENT_LOCAL_DIR), for offline runs
+# Versions are opaque strings that change whenever the stored bytes change;
+# NO_VERSION stands for a file that does not exist yet. Passing if_version to
+# write() makes it conditional: ContentConflict is raised if the stored
+# version moved on since it was read.
+NO_VERSION = '0'
+
+
+class ContentConflict(Exception):
+    """The stored content changed between read and conditional write."""
+
+
+def _dump_content(data):
+    if CONTENT_JSON_COMPACT:
+        body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    else:
         body = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
-        media = MediaIoBaseUpload(BytesIO(body), mimetype='application/json', resumable=False)
-        service = _get_drive_service()
-        existing = _find_file(filename, cms_folder)
-        if existing:
-            service.files().update(fileId=existing['id'], media_body=media).execute()
-            return
-        else:
-            metadata = {'name': filename, 'parents': [cms_folder]}
-            service.files().create(body=metadata, media_body=media, fields='id').execute()
-            return
-    except Exception as e:
-        app.logger.warning(f'Drive write failed for {filename}, falling back to GCS: {e}')
-    # Fallback to GCS
-    _write_gcs_json(filename, data)
+    CONTENT_WRITE_BYTES.observe(len(body))
+    return body
 
 
-def _list_drive_files(folder_id=None):
-    """List files in a Drive folder."""
+def _content_md5(body):
+    return hashlib.md5(body).hexdigest()
+
+
+class ContentStore(ABC):
+    """Storage backend for the CMS JSON files (news.json, members.json, ...)."""
+
+    name = 'base'
+
+    @abstractmethod
+    def read(self, filename):
+        """Return (data, version), or (None, NO_VERSION) if the file does not exist."""
+
+    @abstractmethod
+    def write(self, filename, data, if_version=None):
+        """Store data and return its new version.
+
+        When if_version is given the write only happens if the stored version
+        still equals it; otherwise ContentConflict is raised.
+        """
+
+    @abstractmethod
+    def list(self):
+        """Return the names of the stored files."""
+
+    @abstractmethod
+    def delete(self, filename):
+        """Remove the file; a missing file is not an error."""
+
+    @abstractmethod
+    def version(self, filename):
+        """Return the current version without downloading, or None if missing."""
+
+
+class DriveContentStore(ContentStore):
+    """Files in the CMS folder on Drive; versions are content MD5s (md5Checksum)."""
+
+    name = 'drive'
+
+    def read(self, filename):
+        body = _with_fresh_ids_on_stale(filename, lambda: _download_drive_bytes(filename))
+        if body is None:
+            return None, NO_VERSION
+        return json.loads(body.decode('utf-8')), _content_md5(body)
+
+    def write(self, filename, data, if_version=None):
+        # Drive v3 has no conditional update, so the version is compared just
+        # before uploading; _mutate_content's per-file lock covers this process.
+        if if_version is not None and (self.version(filename) or NO_VERSION) != if_version:
+            raise ContentConflict(f'{filename} changed on Drive')
+        body = _dump_content(data)
+        _with_fresh_ids_on_stale(filename, lambda: _upload_drive_bytes(filename, body))
+        return _content_md5(body)
+
+    def list(self):
+        cms_folder = _get_cms_folder_id()
+        return sorted(f['name'] for f in _list_drive_files(cms_folder)
+                      if f.get('mimeType') != 'application/vnd.google-apps.folder')
+
+    def delete(self, filename):
+        file_id = _resolve_cms_file_id(filename)
+        if file_id:
+            _get_drive_service().files().delete(fileId=file_id).execute()
+            _forget_drive_ids(file_id)
+
+    def version(self, filename):
+        def fetch():
+            file_id = _resolve_cms_file_id(filename)
+            if not file_id:
+                return None
+            meta = _get_drive_service().files().get(fileId=file_id, fields='md5Checksum').execute()
+            return meta.get('md5Checksum')
+        return _with_fresh_ids_on_stale(filename, fetch)
+
+
+class GCSContentStore(ContentStore):
+    """Objects under GCS_BUCKET_NAME/GCS_CMS_PREFIX; versions are generations."""
+
+    name = 'gcs'
+
+    def _blob(self, filename):
+        return _get_gcs_client().bucket(GCS_BUCKET_NAME).blob(GCS_CMS_PREFIX + filename)
+
+    def read(self, filename):
+        blob = self._blob(filename)
+        try:
+            body = blob.download_as_bytes()
+        except gcs_exceptions.NotFound:
+            return None, NO_VERSION
+        return json.loads(body.decode('utf-8')), str(blob.generation)
+
+    def write(self, filename, data, if_version=None):
+        blob = self._blob(filename)
+        # Generation 0 makes GCS require that the object does not exist yet.
+        generation = int(if_version) if if_version is not None else None
+        try:
+            blob.upload_from_string(_dump_content(data), content_type='application/json',
+                                    if_generation_match=generation)
+        except gcs_exceptions.PreconditionFailed:
+            raise ContentConflict(f'{filename} changed in GCS')
+        return str(blob.generation)
+
+    def list(self):
+        blobs = _get_gcs_client().list_blobs(GCS_BUCKET_NAME, prefix=GCS_CMS_PREFIX)
+        return sorted(b.name[len(GCS_CMS_PREFIX):] for b in blobs if b.name != GCS_CMS_PREFIX)
+
+    def delete(self, filename):
+        try:
+            self._blob(filename).delete()
+        except gcs_exceptions.NotFound:
+            pass
+
+    def version(self, filename):
+        blob = _get_gcs_client().bucket(GCS_BUCKET_NAME).get_blob(GCS_CMS_PREFIX + filename)
+        return str(blob.generation) if blob else None
+
+
+class LocalContentStore(ContentStore):
+    """JSON files in a local directory; versions are content MD5s."""
+
+    name = 'local'
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _path(self, filename):
+        if os.path.basename(filename) != filename:
+            raise ValueError(f'Invalid content filename: {filename}')
+        return os.path.join(self.root, filename)
+
+    def read(self, filename):
+        try:
+            with open(self._path(filename), 'rb') as f:
+                body = f.read()
+        except FileNotFoundError:
+            return None, NO_VERSION
+        return json.loads(body.decode('utf-8')), _content_md5(body)
+
+    def write(self, filename, data, if_version=None):
+        body = _dump_content(data)
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(filename)
+        with self._lock:
+            if if_version is not None and (self.version(filename) or NO_VERSION) != if_version:
+                raise ContentConflict(f'{filename} changed on disk')
+            tmp_path = f'{path}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        return _content_md5(body)
+
+    def list(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(n for n in os.listdir(self.root) if n.endswith('.json'))
+
+    def delete(self, filename):
+        try:
+            os.remove(self._path(filename))
+        except FileNotFoundError:
+            pass
+
+    def version(self, filename):
+        try:
+            with open(self._path(filename), 'rb') as f:
+                return _content_md5(f.read())
+        except FileNotFoundError:
+            return None
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    closed: calls go through. After failure_threshold consecutive failures the
+    breaker opens and calls are refused for reset_timeout seconds; then one
+    half-open probe is let through, whose outcome closes or reopens it.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold, reset_timeout):
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+        self._counts = {'successes': 0, 'failures': 0, 'rejected': 0, 'opened': 0}
+
+    def allow(self):
+        """Return True if a call may go to the protected backend now."""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._counts['rejected'] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._counts['successes'] += 1
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+            self._state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self._counts['failures'] += 1
+            self._consecutive_failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._counts['opened'] += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def snapshot(self):
+        with self._lock:
+            retry_in = None
+            if self._state == self.OPEN:
+                retry_in = max(self.reset_timeout - (time.monotonic() - self._opened_at), 0.0)
+            return {
+                'state': self._state,
+                'consecutive_failures': self._consecutive_failures,
+                'failure_threshold': self.failure_threshold,
+                'reset_timeout': self.reset_timeout,
+                'retry_in': retry_in,
+                **self._counts,
+            }
+
+
+_drive_breaker = CircuitBreaker('drive', DRIVE_BREAKER_FAILURE_THRESHOLD, DRIVE_BREAKER_RESET_TIMEOUT)
+
+
+class FallbackContentStore(ContentStore):
+    """Try the primary store first and fall back to the secondary when it fails.
+
+    While the breaker is open the primary is skipped entirely, so a failing
+    backend does not add its timeout to every request. Versions are tagged
+    with the store a conditional write has to be checked against: the
+    primary's whenever it answered (a file it does not have is
+    '<primary>:0', even if the data came from the secondary), the
+    secondary's only when the primary failed. read() and version() tag the
+    same way, so a later version() check compares like with like.
+
+    A conditional write never turns into an unconditional one: a primary
+    version whose store is now unreachable, or a secondary version while
+    the primary is reachable again, raises ContentConflict so the caller
+    re-reads.
+    """
+
+    def __init__(self, primary, fallback, breaker=None):
+        self.primary = primary
+        self.fallback = fallback
+        self.breaker = breaker
+        self.name = f'{primary.name}+{fallback.name}'
+
+    def _call_primary(self, method, *args):
+        """Return (True, result) from the primary, or (False, error) if it was skipped or failed."""
+        if self.breaker and not self.breaker.allow():
+            return False, None
+        try:
+            result = getattr(self.primary, method)(*args)
+        except ContentConflict as e:
+            if self.breaker:
+                self.breaker.record_success()
+            return False, e
+        except Exception as e:
+            if self.breaker:
+                self.breaker.record_failure()
+            return False, e
+        if self.breaker:
+            self.breaker.record_success()
+        return True, result
+
+    @staticmethod
+    def _tag(store, version):
+        return f'{store.name}:{version}' if version is not None else None
+
+    @staticmethod
+    def _untag(store, version):
+        prefix = f'{store.name}:'
+        if version is not None and version.startswith(prefix):
+            return version[len(prefix):]
+        return None
+
+    def read(self, filename):
+        ok, result = self._call_primary('read', filename)
+        if ok and result[0] is not None:
+            return result[0], self._tag(self.primary, result[1])
+        CONTENT_FALLBACKS.inc(operation='read')
+        try:
+            data, version = self.fallback.read(filename)
+        except Exception as e:
+            app.logger.warning(f'{self.fallback.name} read failed for {filename}: {e}')
+            if ok:
+                return None, self._tag(self.primary, NO_VERSION)
+            # Neither store could be read; an empty payload here would be
+            # written back over the real one.
+            raise
+        if ok:
+            return data, self._tag(self.primary, NO_VERSION)
+        return data, self._tag(self.fallback, version)
+
+    def write(self, filename, data, if_version=None):
+        if if_version is None:
+            return self._write_unconditional(filename, data)
+        primary_version = self._untag(self.primary, if_version)
+        fallback_version = self._untag(self.fallback, if_version)
+        if primary_version is not None:
+            ok, result = self._call_primary('write', filename, data, primary_version)
+            if ok:
+                return self._tag(self.primary, result)
+            if isinstance(result, ContentConflict):
+                raise result
+            raise ContentConflict(f'{self.primary.name} is unavailable; {filename} has to be re-read '
+                                  f'before writing to {self.fallback.name}')
+        if fallback_version is None:
+            raise ContentConflict(f'{filename}: version {if_version!r} is not from {self.name}')
+        # Read while the primary was failing: only write if it still is.
+        ok, _ = self._call_primary('version', filename)
+        if ok:
+            raise ContentConflict(f'{self.primary.name} is back; {filename} has to be re-read')
+        CONTENT_FALLBACKS.inc(operation='write')
+        version = self.fallback.write(filename, data, fallback_version)
+        return self._tag(self.fallback, version)
+
+    def _write_unconditional(self, filename, data):
+        ok, result = self._call_primary('write', filename, data, None)
+        if ok:
+            return self._tag(self.primary, result)
+        if result is not None:
+            app.logger.warning(f'{self.primary.name} write failed for {filename}, '
+                               f'falling back to {self.fallback.name}: {result}')
+        CONTENT_FALLBACKS.inc(operation='write')
+        return self._tag(self.fallback, self.fallback.write(filename, data))
+
+    def list(self):
+        ok, result = self._call_primary('list')
+        return result if ok else self.fallback.list()
+
+    def delete(self, filename):
+        self.primary.delete(filename)
+        self.fallback.delete(filename)
+
+    def version(self, filename):
+        ok, result = self._call_primary('version', filename)
+        if ok:
+            return self._tag(self.primary, result or NO_VERSION)
+        return self._tag(self.fallback, self.fallback.version(filename) or NO_VERSION)
+
+
+class WriteBehindContentStore(ContentStore):
+    """Buffers writes in front of another store and uploads them in the background.
+
+    A write updates the in-memory state and a per-file journal on local disk
+    (fsynced, replaced atomically) and returns at once; reads see it
+    immediately. A flusher thread uploads the latest state of each dirty file
+    once per interval, so a burst of edits costs one upload per file, and
+    whatever is still dirty is flushed at shutdown. Journals left by a crash
+    are replayed on start. Versions are this process's own, which assumes it
+    is the only writer (the default single gunicorn worker).
+    """
+
+    def __init__(self, inner, journal_dir, interval):
+        self.inner = inner
+        self.name = f'{inner.name}+write-behind'
+        self.journal_dir = journal_dir
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._state = {}  # filename -> (data, version)
+        self._dirty = {}  # filename -> write sequence number
+        self._seq = 0
+        self._stop = threading.Event()
+        os.makedirs(journal_dir, exist_ok=True)
+        for name in os.listdir(journal_dir):
+            if name.endswith('.json'):
+                with open(os.path.join(journal_dir, name), 'rb') as f:
+                    body = f.read()
+                self._state[name] = (json.loads(body.decode('utf-8')), _content_md5(body))
+                self._seq += 1
+                self._dirty[name] = self._seq
+        self._thread = threading.Thread(target=self._run, name='content-flusher', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _journal_path(self, filename):
+        if os.path.basename(filename) != filename:
+            raise ValueError(f'Invalid content filename: {filename}')
+        return os.path.join(self.journal_dir, filename)
+
+    def read(self, filename):
+        with self._lock:
+            if filename in self._state:
+                return self._state[filename]
+        return self.inner.read(filename)
+
+    def write(self, filename, data, if_version=None):
+        body = _dump_content(data)
+        version = _content_md5(body)
+        path = self._journal_path(filename)
+        with self._lock:
+            if if_version is not None and (self._version_locked(filename) or NO_VERSION) != if_version:
+                raise ContentConflict(f'{filename} changed since it was read')
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            self._seq += 1
+            self._state[filename] = (data, version)
+            self._dirty[filename] = self._seq
+        return version
+
+    def _version_locked(self, filename):
+        if filename in self._state:
+            return self._state[filename][1]
+        return self.inner.version(filename)
+
+    def version(self, filename):
+        with self._lock:
+            return self._version_locked(filename)
+
+    def list(self):
+        with self._lock:
+            pending = set(self._state)
+        return sorted(pending | set(self.inner.list()))
+
+    def delete(self, filename):
+        with self._lock:
+            self._state.pop(filename, None)
+            self._dirty.pop(filename, None)
+            try:
+                os.remove(self._journal_path(filename))
+            except FileNotFoundError:
+                pass
+        self.inner.delete(filename)
+
+    def pending(self):
+        with self._lock:
+            return sorted(self._dirty)
+
+    def flush(self):
+        """Upload the latest state of every dirty file; failures stay dirty for the next round."""
+        with self._lock:
+            batch = [(name, seq, self._state[name][0]) for name, seq in self._dirty.items()]
+        for filename, seq, data in batch:
+            try:
+                self.inner.write(filename, data)
+            except Exception as e:
+                app.logger.warning(f'Write-behind flush of {filename} failed: {e}')
+                continue
+            with self._lock:
+                if self._dirty.get(filename) == seq:
+                    del self._dirty[filename]
+                    try:
+                        os.remove(self._journal_path(filename))
+                    except FileNotFoundError:
+                        pass
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def close(self):
+        self._stop.set()
+        self.flush()
+
+
+_content_store = None
+
+
+def _get_content_store():
+    global _content_store
+    if _content_store is not None:
+        return _content_store
+    with _clients_lock:
+        if _content_store is None:
+            if CONTENT_BACKEND == 'drive':
+                _content_store = FallbackContentStore(DriveContentStore(), GCSContentStore(),
+                                                      breaker=_drive_breaker)
+            elif CONTENT_BACKEND == 'gcs':
+                _content_store = GCSContentStore()
+            elif CONTENT_BACKEND == 'local':
+                _content_store = LocalContentStore(CONTENT_LOCAL_DIR)
+            else:
+                raise ValueError(f'Unknown CONTENT_BACKEND: {CONTENT_BACKEND}')
+            if CONTENT_WRITE_BEHIND_MS > 0:
+                _content_store = WriteBehindContentStore(_content_store, CONTENT_JOURNAL_DIR,
+                                                         CONTENT_WRITE_BEHIND_MS / 1000)
+        return _content_store
+
+
+# --- Drive Folder Listings ---
+# Folder listings are cached per folder and kept current through the Drive
+# Changes API: the first listing of a folder pages through it once (1000 per
+# page); afterwards each read replays changes.list from the stored page token,
+# at most every DRIVE_CHANGES_POLL_INTERVAL seconds. Local mutations call
+# _mark_drive_listings_stale() so the next read polls immediately.
+DRIVE_LIST_FIELDS = ('id', 'name', 'mimeType', 'size', 'md5Checksum', 'modifiedTime', 'webViewLink')
+_drive_listings = {}  # folder id -> {file id: file metadata}
+_drive_listings_lock = threading.RLock()
+_drive_changes = {'token': None, 'polled': 0.0}
+
+
+def _mark_drive_listings_stale():
+    _drive_changes['polled'] = 0.0
+
+
+def _sync_drive_changes():
+    """Apply pending Drive changes to the cached folder listings."""
+    if time.time() - _drive_changes['polled'] < DRIVE_CHANGES_POLL_INTERVAL:
+        return
     service = _get_drive_service()
-    fid = folder_id or GOOGLE_DRIVE_FOLDER_ID
-    results = []
-    page_token = None
-    while True:
-        resp = service.files().list(
-            q=f"'{fid}' in parents and trashed = false",
-            fields='nextPageToken, files(id, name, mimeType, size, modifiedTime, webViewLink)',
-            pageSize=100,
-            pageToken=page_token
+    fields = ', '.join(DRIVE_LIST_FIELDS + ('parents', 'trashed'))
+    page_token = _drive_changes['token']
+    while page_token:
+        resp = service.changes().list(
+            pageToken=page_token, pageSize=DRIVE_LIST_MAX_PAGE_SIZE, includeRemoved=True,
+            fields=f'nextPageToken, newStartPageToken, changes(fileId, removed, file({fields}))',
         ).execute()
-        results.extend(resp.get('files', []))
+        for change in resp.get('changes', []):
+            for listing in _drive_listings.values():
+                listing.pop(change['fileId'], None)
+            f = change.get('file') or {}
+            if change.get('removed') or f.get('trashed'):
+                continue
+            for parent in f.get('parents', []):
+                if parent in _drive_listings:
+                    _drive_listings[parent][f['id']] = {k: f[k] for k in DRIVE_LIST_FIELDS if k in f}
         page_token = resp.get('nextPageToken')
-        if not page_token:
-            break
-    return results
+        if resp.get('newStartPageToken'):
+            _drive_changes['token'] = resp['newStartPageToken']
+    _drive_changes['polled'] = time.time()
+
+
+def _list_drive_files(folder_id=None):
+    """List files in a Drive folder, newest first, from the cached listing."""
+    fid = folder_id or GOOGLE_DRIVE_FOLDER_ID
+    with _drive_listings_lock:
+        if fid in _drive_listings:
+            try:
+                _sync_drive_changes()
+            except HttpError as e:
+                # Typically an expired page token: drop every listing and relist.
+                app.logger.warning(f'Drive changes sync failed, relisting: {e}')
+                _drive_listings.clear()
+                _drive_changes['token'] = None
+        if fid not in _drive_listings:
+            service = _get_drive_service()
+            if _drive_changes['token'] is None:
+                # Taken before listing so no change made meanwhile is missed.
+                _drive_changes['token'] = service.changes().getStartPageToken().execute()['startPageToken']
+                _drive_changes['polled'] = time.time()
+            listing = {}
+            page_token = None
+            while True:
+                resp = service.files().list(
+                    q=f"'{fid}' in parents and trashed = false",
+                    fields=f"nextPageToken, files({', '.join(DRIVE_LIST_FIELDS)})",
+                    pageSize=DRIVE_LIST_MAX_PAGE_SIZE,
+                    pageToken=page_token
+                ).execute()
+                listing.update((f['id'], f) for f in resp.get('files', []))
+                page_token = resp.get('nextPageToken')
+                if not page_token:
+                    break
+            _drive_listings[fid] = listing
+        files = [dict(f) for f in _drive_listings[fid].values()]
+    files.sort(key=lambda f: (f.get('modifiedTime') or '', f['id']), reverse=True)
+    return files
+
+
+def _paginate_listing(files, args):
+    """Slice a listing by ?pageSize= / ?pageToken=; None when no paging was asked for."""
+    if not args.get('pageSize') and not args.get('pageToken'):
+        return None
+    try:
+        page_size = min(int(args.get('pageSize') or 100), DRIVE_LIST_MAX_PAGE_SIZE)
+        offset = int(args.get('pageToken') or 0)
+    except ValueError:
+        raise ValueError('pageSize and pageToken must be integers')
+    if page_size < 1 or offset < 0:
+        raise ValueError('pageSize and pageToken must be positive')
+    page = {'files': files[offset:offset + page_size]}
+    if offset + page_size < len(files):
+        page['nextPageToken'] = str(offset + page_size)
+    return page
+
+
+# --- Drive File Cache ---
+class DriveFileCache:
+    """Size-bounded LRU of downloaded Drive files on local disk.
+
+    Entries are keyed by "<file id>:<md5 or modifiedTime>", so a changed file
+    is simply a new key and stale copies age out. Each body has a .meta
+    sidecar (name, mime type) so hits need no Drive call and the index can be
+    rebuilt after a restart.
+    """
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (path, size, meta)
+        self._total = 0
+        os.makedirs(root, exist_ok=True)
+        self._load()
+
+    def _path(self, key):
+        return os.path.join(self.root, hashlib.sha256(key.encode('utf-8')).hexdigest())
+
+    def _load(self):
+        found = []
+        for name in os.listdir(self.root):
+            if not name.endswith('.meta'):
+                continue
+            path = os.path.join(self.root, name[:-len('.meta')])
+            try:
+                with open(path + '.meta', encoding='utf-8') as f:
+                    meta = json.load(f)
+                stat = os.stat(path)
+            except (OSError, ValueError):
+                continue
+            found.append((stat.st_atime, meta['key'], path, stat.st_size, meta))
+        for _, key, path, size, meta in sorted(found):
+            self._entries[key] = (path, size, meta)
+            self._total += size
+        with self._lock:
+            self._evict()
+
+    def get(self, key):
+        """Return (path, meta) for a cached file, marking it recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            CACHE_REQUESTS.inc(cache='drive_file', result='miss' if entry is None else 'hit')
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0], entry[2]
+
+    def reserve(self):
+        """Temporary file in the cache directory to download into."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.part')
+        return os.fdopen(fd, 'wb'), tmp_path
+
+    def commit(self, key, tmp_path, meta):
+        path = self._path(key)
+        meta = dict(meta, key=key)
+        with open(path + '.meta', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total -= old[1]
+            self._entries[key] = (path, size, meta)
+            self._total += size
+            self._evict()
+
+    def _evict(self):
+        while self._total > self.max_bytes and self._entries:
+            _, (path, size, _) = self._entries.popitem(last=False)
+            self._total -= size
+            for victim in (path, path + '.meta'):
+                try:
+                    os.remove(victim)
+                except OSError:
+                    pass
+
+
+_drive_file_cache = None
+
+
+def _get_drive_file_cache():
+    global _drive_file_cache
+    if _drive_file_cache is None and DRIVE_FILE_CACHE_DIR:
+        with _clients_lock:
+            if _drive_file_cache is None:
+                _drive_file_cache = DriveFileCache(DRIVE_FILE_CACHE_DIR, DRIVE_FILE_CACHE_MAX_BYTES)
+    return _drive_file_cache
 
 
 # --- Auth Helpers ---
@@ -175,6 +1305,67 @@ def _get_allow_email_set():
     return {e.strip().lower() for e in ADMIN_ALLOW_EMAILS.split(',') if e.strip()}
 
 
+# Verified ID tokens keyed by SHA-256 of the raw token, kept until the token's
+# exp so that consecutive admin saves skip the signature check.
+_verified_tokens = OrderedDict()
+_verified_tokens_lock = threading.Lock()
+_google_certs = {'certs': None, 'expires_at': 0.0}
+_google_certs_lock = threading.Lock()
+
+
+def _get_google_certs(force_refresh=False):
+    """Google's ID token signing certs, refetched when their max-age lapses."""
+    with _google_certs_lock:
+        if not force_refresh and _google_certs['certs'] and time.time() < _google_certs['expires_at']:
+            return _google_certs['certs']
+        response = _get_auth_request()(GOOGLE_CERTS_URL, method='GET')
+        if response.status != 200:
+            raise ValueError(f'Could not fetch certificates at {GOOGLE_CERTS_URL}')
+        certs = json.loads(response.data.decode('utf-8'))
+        match = re.search(r'max-age=(\d+)', response.headers.get('cache-control', ''))
+        max_age = int(match.group(1)) if match else GOOGLE_CERTS_DEFAULT_MAX_AGE
+        _google_certs['certs'] = certs
+        _google_certs['expires_at'] = time.time() + max_age
+        return certs
+
+
+def _token_key_id(token):
+    header = token.split('.', 1)[0]
+    try:
+        return json.loads(base64.urlsafe_b64decode(header + '=' * (-len(header) % 4))).get('kid')
+    except Exception:
+        return None
+
+
+def _verify_id_token(token):
+    """Verify a Google ID token like id_token.verify_oauth2_token, with caching."""
+    key = hashlib.sha256(token.encode('utf-8')).hexdigest()
+    now = time.time()
+    with _verified_tokens_lock:
+        entry = _verified_tokens.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                _verified_tokens.move_to_end(key)
+                CACHE_REQUESTS.inc(cache='token', result='hit')
+                return entry[1]
+            del _verified_tokens[key]
+    CACHE_REQUESTS.inc(cache='token', result='miss')
+
+    certs = _get_google_certs()
+    if _token_key_id(token) not in certs:
+        # Signing keys rotate; refetch once before rejecting an unknown key id.
+        certs = _get_google_certs(force_refresh=True)
+    idinfo = jwt.decode(token, certs=certs, audience=GOOGLE_OAUTH_CLIENT_ID)
+    if idinfo.get('iss') not in GOOGLE_ISSUERS:
+        raise ValueError(f"Wrong issuer. 'iss' should be one of {GOOGLE_ISSUERS} but got {idinfo.get('iss')!r}")
+
+    with _verified_tokens_lock:
+        _verified_tokens[key] = (float(idinfo.get('exp', now)), idinfo)
+        while len(_verified_tokens) > max(TOKEN_CACHE_MAX_ENTRIES, 1):
+            _verified_tokens.popitem(last=False)
+    return idinfo
+
+
 def _require_admin():
     auth_header = request.headers.get('Authorization', '')
     if not auth_header.startswith('Bearer '):
@@ -187,10 +1378,13 @@ def _require_admin():
     allowed = _get_allow_email_set()
     if not allowed:
         return False, 'Admin allow list not configured'
+    started = time.perf_counter()
     try:
-        idinfo = id_token.verify_oauth2_token(token, google_requests.Request(), audience=GOOGLE_OAUTH_CLIENT_ID)
+        idinfo = _verify_id_token(token)
     except Exception as e:
+        TOKEN_VERIFY_SECONDS.observe(time.perf_counter() - started, result='invalid')
         return False, f'Invalid token: {e}'
+    TOKEN_VERIFY_SECONDS.observe(time.perf_counter() - started, result='ok')
     email = (idinfo.get('email') or '').lower()
     if not email:
         return False, 'Email missing in token'
@@ -209,78 +1403,795 @@ def _next_id(items):
     return max_id + 1
 
 
+# --- Content Cache ---
+# Per-worker LRU cache of content payloads keyed by filename (news.json, ...).
+# Entries expire after CONTENT_CACHE_TTL seconds; a TTL of 0 disables caching.
+_content_cache = OrderedDict()
+_content_cache_lock = threading.Lock()
+
+
+def _payload_etag(payload):
+    """Strong ETag for a stored payload: a hash of its canonical JSON form."""
+    body = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+def _cache_get(filename):
+    """Return the cached (payload, etag, version), or None on miss/expiry.
+
+    The payload is shared with the cache and must not be mutated.
+    """
+    if CONTENT_CACHE_TTL <= 0:
+        return None
+    with _content_cache_lock:
+        entry = _content_cache.get(filename)
+        if entry is not None and entry[0] <= time.monotonic():
+            del _content_cache[filename]
+            entry = None
+        if entry is None:
+            CACHE_REQUESTS.inc(cache='content', result='miss')
+            return None
+        _, payload, etag, version = entry
+        _content_cache.move_to_end(filename)
+    CACHE_REQUESTS.inc(cache='content', result='hit')
+    return payload, etag, version
+
+
+def _cache_put(filename, payload, etag, version):
+    """Store a copy of payload, evicting the least recently used entries."""
+    if CONTENT_CACHE_TTL <= 0:
+        return
+    entry = (time.monotonic() + CONTENT_CACHE_TTL, copy.deepcopy(payload), etag, version)
+    with _content_cache_lock:
+        _content_cache[filename] = entry
+        _content_cache.move_to_end(filename)
+        while len(_content_cache) > max(CONTENT_CACHE_MAX_ENTRIES, 1):
+            _content_cache.popitem(last=False)
+
+
+def _cache_invalidate(filename=None):
+    """Drop one cached payload, or all of them when filename is None."""
+    with _content_cache_lock:
+        if filename is None:
+            _content_cache.clear()
+        else:
+            _content_cache.pop(filename, None)
+
+
 # --- Content CRUD Generic ---
+class ContentItemNotFound(LookupError):
+    """Raised by a mutation when the item it targets does not exist."""
+
+
+_content_locks = {}
+_content_locks_lock = threading.Lock()
+
+
+def _content_lock(filename):
+    """Per-file lock serializing read-modify-write cycles within this process."""
+    with _content_locks_lock:
+        lock = _content_locks.get(filename)
+        if lock is None:
+            lock = _content_locks[filename] = threading.Lock()
+        return lock
+
+
 def _init_payload():
     return {'updated_at': _utc_now_iso(), 'items': []}
 
 
-def _read_content(filename):
-    data = _read_drive_json(filename)
+def _load_content(filename, fresh=False):
+    """Return (payload, etag, version); the payload may be shared with the cache."""
+    cached = None if fresh else _cache_get(filename)
+    if cached is not None:
+        return cached
+    data, version = _get_content_store().read(filename)
     if data and isinstance(data, dict):
-        return data
-    return _init_payload()
-
-
-def _write_content(filename, payload):
-    _write_drive_json(filename, payload)
-
-
-# --- Validation ---
-def _validate_news_input(payload, for_update=False):
-    errors = []
-    if not for_update or 'title' in payload:
-        title = payload.get('title')
-        if not isinstance(title, str) or not title.strip():
-            errors.append('title is required')
-    if not for_update or 'body' in payload:
-        body = payload.get('body')
-        if not isinstance(body, str) or not body.strip():
-            errors.append('body is required')
-    if not for_update or 'date' in payload:
-        date = payload.get('date')
-        if not isinstance(date, str) or not date.strip():
-            errors.append('date is required')
-    return errors
-
-
-def _validate_event_input(payload, for_update=False):
-    errors = []
-    if not for_update or 'title' in payload:
-        title = payload.get('title')
-        if not isinstance(title, str) or not title.strip():
-            errors.append('title is required')
-    if not for_update or 'date' in payload:
-        date = payload.get('date')
-        if not isinstance(date, str) or not date.strip():
-            errors.append('date is required')
-    return errors
-
-
-def _validate_member_input(payload, for_update=False):
-    errors = []
-    if not for_update or 'name' in payload:
-        name = payload.get('name')
-        if not isinstance(name, str) or not name.strip():
-            errors.append('name is required')
-    return errors
-
-
-def _validate_publication_input(payload, for_update=False):
-    errors = []
-    if not for_update or 'title' in payload:
-        title = payload.get('title')
-        if not isinstance(title, str) or not title.strip():
-            errors.append('title is required')
-    return errors
-
-
-def _validate_research_input(payload, for_update=False):
-    errors = []
-    if not for_update or 'title' in payload:
-        title = payload.get('title')
-        if not isinstance(title, str) or not title.strip():
-            errors.append('title is required')
-    return errors
+        if 'items' in data:
+            # Payloads written before the change log moved to its own file.
+            data.pop('changes', None)
+            data.pop('changes_since', None)
+        etag = _payload_etag(data)
+        _cache_put(filename, data, etag, version)
+        return data, etag, version
+    data = _init_payload()
+    return data, _payload_etag(data), version
+
+
+def _read_content_entry(filename):
+    """Return (payload, etag) for read-only use; the payload may be shared."""
+    payload, etag, _ = _load_content(filename)
+    return payload, etag
+
+
+def _write_content(filename, payload, if_version=None):
+    try:
+        version = _get_content_store().write(filename, payload, if_version)
+    except Exception:
+        _cache_invalidate(filename)
+        raise
+    etag = _payload_etag(payload)
+    _cache_put(filename, payload, etag, version)
+    _refresh_public_snapshot(filename, payload, etag)
+    _schedule_static_export(filename)
+    return version
+
+
+# --- Change Log ---
+# Every content write that changes items bumps payload['revision'] and appends
+# one record per created/updated/deleted item (with a snapshot of the item) to
+# a separate <type>.changes.json, so the items payload does not carry the log
+# into every read, upload and ETag. The log is written right after the items
+# under the same per-file lock; it keeps the newest CHANGE_LOG_MAX_ENTRIES
+# records, trimmed at revision boundaries, and log['since'] is the oldest
+# revision a client can still sync from. A log that missed a revision (its
+# write failed) restarts at the previous one, so clients reload instead of
+# silently skipping changes.
+def _change_log_filename(filename):
+    return f"{filename[:-len('.json')]}.changes.json"
+
+
+def _read_change_log(filename, payload):
+    """Return (log, etag) for a content file; a missing log starts at the payload's revision."""
+    log, etag, _ = _load_content(_change_log_filename(filename))
+    if 'revision' not in log:
+        revision = payload.get('revision', 0)
+        log = {'updated_at': payload.get('updated_at'), 'revision': revision, 'since': revision, 'changes': []}
+    return log, etag
+
+
+def _change_records(before, after):
+    """Diff two payloads into change records and set after['revision']; returns the records."""
+    old = {item.get('id'): item for item in before.get('items', [])}
+    new = {item.get('id'): item for item in after.get('items', [])}
+    records = []
+    for item_id, item in new.items():
+        if item_id not in old:
+            records.append({'op': 'created', 'id': item_id, 'item': copy.deepcopy(item)})
+        elif old[item_id] != item:
+            records.append({'op': 'updated', 'id': item_id, 'item': copy.deepcopy(item)})
+    records.extend({'op': 'deleted', 'id': item_id} for item_id in old if item_id not in new)
+    revision = int(before.get('revision') or 0)
+    if records:
+        revision += 1
+        for record in records:
+            record['rev'] = revision
+    after['revision'] = revision
+    return records
+
+
+def _append_change_log(filename, payload, records):
+    """Append records (already stored with payload) to the file's change log.
+
+    Called with the content lock held. A failure is logged, not raised: the
+    items are stored, and the next append notices the gap.
+    """
+    if not records:
+        return
+    revision = payload['revision']
+    try:
+        current, _ = _read_change_log(filename, {})
+        if current.get('revision') == revision - 1:
+            log = current['changes'] + records
+            floor = current.get('since', 0)
+        else:
+            log, floor = records, revision - 1
+        if len(log) > CHANGE_LOG_MAX_ENTRIES:
+            cut = len(log) - CHANGE_LOG_MAX_ENTRIES
+            floor = log[cut - 1]['rev']
+            log = [record for record in log[cut:] if record['rev'] > floor]
+        _write_content(_change_log_filename(filename), {
+            'updated_at': payload.get('updated_at'), 'revision': revision, 'since': floor, 'changes': log})
+    except Exception as e:
+        app.logger.warning(f'Change log write failed for {filename}: {e}')
+
+
+def _mutate_content(filename, mutate):
+    """Apply mutate(payload) and store the result without losing concurrent updates.
+
+    mutate changes the payload in place and returns the value to hand back;
+    raising from it aborts without writing. The write is conditional on the
+    version that was read, and on a conflict the whole cycle is retried
+    against fresh content up to CONTENT_WRITE_RETRIES times.
+    """
+    with _content_lock(filename):
+        for attempt in range(max(CONTENT_WRITE_RETRIES, 1)):
+            before, _, version = _load_content(filename, fresh=attempt > 0)
+            payload = copy.deepcopy(before)
+            result = mutate(payload)
+            records = _change_records(before, payload)
+            try:
+                _write_content(filename, payload, if_version=version)
+            except ContentConflict:
+                time.sleep(random.uniform(0, 0.05 * (2 ** attempt)))
+                continue
+            _append_change_log(filename, payload, records)
+            return result
+    raise ContentConflict(f'{filename} kept changing; gave up after {CONTENT_WRITE_RETRIES} attempts')
+
+
+# --- Conditional GET ---
+def _parse_iso(value):
+    """Parse an ISO-8601 timestamp into an aware datetime, or None."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _cache_control_for(path):
+    if path in CACHE_CONTROL_OVERRIDES:
+        return CACHE_CONTROL_OVERRIDES[path]
+    if path.startswith('/public/'):
+        return CACHE_CONTROL_PUBLIC
+    return CACHE_CONTROL_CONTENT
+
+
+def _conditional_json(filename, build=None):
+    """Serve a content file as JSON, answering 304 when the client copy is current.
+
+    build(payload) turns the stored payload into the response body; the whole
+    payload is sent when it is omitted.
+    """
+    payload, etag = _read_content_entry(filename)
+    last_modified = _parse_iso(payload.get('updated_at'))
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        resp = jsonify(build(payload) if build else payload)
+    else:
+        resp = app.response_class(status=304)
+    return _with_validators(resp, etag, last_modified)
+
+
+def _with_validators(resp, etag, last_modified):
+    resp.set_etag(etag)
+    if last_modified:
+        resp.last_modified = last_modified
+    resp.headers['Cache-Control'] = _cache_control_for(request.path)
+    return resp
+
+
+# --- Content Collections ---
+# Each content type (news, events, ...) is declared once as a Collection; its
+# admin CRUD routes and public read route are generated from the declaration.
+class Field:
+    """One item field and how request input is coerced into it.
+
+    kind is 'text' (stripped string), 'bool' or 'raw' (stored as sent).
+    On create an empty text value takes the default; required text fields
+    must be non-empty strings.
+    """
+
+    __slots__ = ('name', 'kind', 'default', 'required')
+
+    def __init__(self, name, kind='text', default='', required=False):
+        self.name = name
+        self.kind = kind
+        self.default = default
+        self.required = required
+
+
+def _coerce_text(value):
+    value = value or ''
+    return value.strip() if isinstance(value, str) else str(value)
+
+
+def _item_year(field):
+    """Index key: the leading four characters of a date/year field."""
+    return lambda item: str(item.get(field) or '')[:4]
+
+
+class Collection:
+    """Declarative content type: schema, public visibility, sort order and ID policy.
+
+    indexes maps a public filter name (e.g. 'category', 'year') to the
+    function that extracts an item's key for it; search_fields maps the
+    fields covered by /public/search to their ranking weight.
+    """
+
+    def __init__(self, name, fields, sort_key, sort_reverse=False,
+                 visible=lambda item: item.get('visible', True), next_id=None, indexes=None,
+                 search_fields=None):
+        self.name = name
+        self.filename = f'{name}.json'
+        self.fields = fields
+        self.sort_key = sort_key
+        self.sort_reverse = sort_reverse
+        self.visible = visible
+        self.next_id = next_id or _next_id
+        self.indexes = indexes or {}
+        self.search_fields = search_fields or {}
+        # Precompiled (name, default) lists so that validation and
+        # normalization are flat loops over the fields of one kind.
+        self._required = [f.name for f in fields if f.required]
+        self._text = [(f.name, f.default) for f in fields if f.kind == 'text']
+        self._bool = [(f.name, f.default) for f in fields if f.kind == 'bool']
+        self._raw = [(f.name, f.default) for f in fields if f.kind == 'raw']
+        self._order = [f.name for f in fields]
+
+    def validate(self, data, for_update=False):
+        errors = []
+        for name in self._required:
+            if not for_update or name in data:
+                value = data.get(name)
+                if not isinstance(value, str) or not value.strip():
+                    errors.append(f'{name} is required')
+        return errors
+
+    def new_item(self, data, items, now):
+        values = {}
+        for name, default in self._text:
+            values[name] = _coerce_text(data.get(name) or default)
+        for name, default in self._bool:
+            values[name] = bool(data.get(name, default))
+        for name, default in self._raw:
+            values[name] = data.get(name, default)
+        item = {'id': self.next_id(items)}
+        for name in self._order:
+            item[name] = values[name]
+        item['created_at'] = now
+        item['updated_at'] = now
+        return item
+
+    def apply_update(self, item, data, now):
+        for name, _ in self._text:
+            if name in data:
+                item[name] = _coerce_text(data.get(name))
+        for name, _ in self._bool:
+            if name in data:
+                item[name] = bool(data.get(name))
+        for name, default in self._raw:
+            if name in data:
+                item[name] = data.get(name, default)
+        item['updated_at'] = now
+
+    def public_items(self, payload):
+        items = [i for i in payload.get('items', []) if self.visible(i)]
+        items.sort(key=self.sort_key, reverse=self.sort_reverse)
+        return items
+
+    def public_view(self, payload):
+        return {'items': self.public_items(payload), 'revision': payload.get('revision', 0)}
+
+    def public_changes(self, log, since):
+        """Latest change per item after revision `since`, as the public sees it.
+
+        Created/updated records carry the whole item; an item that is no
+        longer visible is reported as deleted.
+        """
+        latest = {}
+        for record in log.get('changes', []):
+            if record['rev'] > since:
+                latest.pop(record['id'], None)
+                latest[record['id']] = record
+        changes = []
+        for record in latest.values():
+            if record['op'] != 'deleted' and self.visible(record['item']):
+                changes.append(record)
+            else:
+                changes.append({'op': 'deleted', 'id': record['id'], 'rev': record['rev']})
+        return changes
+
+
+COLLECTIONS = {c.name: c for c in (
+    Collection('news', [
+        Field('title', required=True),
+        Field('body', required=True),
+        Field('date', required=True),
+        Field('link'),
+        Field('visible', 'bool', True),
+    ], sort_key=lambda x: x.get('date', ''), sort_reverse=True,
+       indexes={'year': _item_year('date')},
+       search_fields={'title': 2.0, 'body': 1.0}),
+    Collection('events', [
+        Field('title', required=True),
+        Field('date', required=True),
+        Field('time_start'),
+        Field('time_end'),
+        Field('location'),
+        Field('description'),
+        Field('link'),
+        Field('visible', 'bool', True),
+    ], sort_key=lambda x: x.get('date', ''), sort_reverse=True,
+       indexes={'year': _item_year('date')},
+       search_fields={'title': 2.0, 'description': 1.0, 'location': 1.0}),
+    Collection('members', [
+        Field('name', required=True),
+        Field('name_en'),
+        Field('role', default='bachelor'),
+        Field('title'),
+        Field('research_interest'),
+        Field('photo_url'),
+        Field('email'),
+        Field('year_joined', 'raw', ''),
+        Field('order', 'raw', 99),
+        Field('visible', 'bool', True),
+    ], sort_key=lambda x: x.get('order', 99),
+       indexes={'role': lambda x: x.get('role') or 'bachelor'},
+       search_fields={'name': 2.0, 'name_en': 2.0, 'research_interest': 1.0}),
+    Collection('publications', [
+        Field('title', required=True),
+        Field('authors'),
+        Field('journal'),
+        Field('year'),
+        Field('volume'),
+        Field('pages'),
+        Field('doi'),
+        Field('category', default='paper'),
+        Field('visible', 'bool', True),
+        Field('order', 'raw', 99),
+    ], sort_key=lambda x: x.get('year', ''), sort_reverse=True,
+       indexes={'category': lambda x: x.get('category') or 'paper', 'year': _item_year('year')},
+       search_fields={'title': 2.0, 'authors': 1.5, 'journal': 1.0}),
+    Collection('research', [
+        Field('title', required=True),
+        Field('title_en'),
+        Field('description'),
+        Field('image_url'),
+        Field('order', 'raw', 99),
+        Field('visible', 'bool', True),
+    ], sort_key=lambda x: x.get('order', 99),
+       search_fields={'title': 2.0, 'title_en': 2.0, 'description': 1.0}),
+)}
+
+
+# --- Public Snapshots ---
+# The public view of each collection (visible items, sorted) is rendered to
+# JSON bytes once per stored payload, at write time or on the first public
+# read after a cache fill, together with gzip and (if the brotli package is
+# installed) br encodings. /public/<type> then only picks an encoding.
+_public_snapshots = {}
+
+
+def _dump_public_json(view):
+    return (json.dumps(view, ensure_ascii=False, sort_keys=True, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def _encode_public_body(body):
+    """identity, and for bodies worth it gzip / br, of a rendered public view."""
+    encodings = {'identity': body}
+    if len(body) >= SNAPSHOT_MIN_COMPRESS_SIZE:
+        encodings['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+        if brotli is not None:
+            encodings['br'] = brotli.compress(body, quality=11)
+    return encodings
+
+
+def _build_public_snapshot(collection, payload, etag):
+    items = collection.public_items(payload)
+    body = _dump_public_json({'items': items, 'revision': payload.get('revision', 0)})
+    encodings = _encode_public_body(body)
+    # Positions (in public order) of the items under each index key.
+    indexes = {}
+    for index_name, key_of in collection.indexes.items():
+        postings = indexes[index_name] = {}
+        for position, item in enumerate(items):
+            postings.setdefault(key_of(item), []).append(position)
+    snapshot = {
+        'source_etag': etag,
+        'last_modified': _parse_iso(payload.get('updated_at')),
+        'encodings': encodings,
+        'items': items,
+        'indexes': indexes,
+        'revision': payload.get('revision', 0),
+    }
+    _public_snapshots[collection.name] = snapshot
+    _search_indexes[collection.name].update(items)
+    return snapshot
+
+
+def _refresh_public_snapshot(filename, payload, etag):
+    collection = COLLECTIONS.get(filename[:-len('.json')]) if filename.endswith('.json') else None
+    if collection is not None:
+        _build_public_snapshot(collection, payload, etag)
+
+
+def _public_snapshot(collection):
+    payload, etag = _read_content_entry(collection.filename)
+    snapshot = _public_snapshots.get(collection.name)
+    if snapshot is None or snapshot['source_etag'] != etag:
+        snapshot = _build_public_snapshot(collection, payload, etag)
+    return snapshot
+
+
+class PublicQueryError(ValueError):
+    """Invalid filter, paging or projection parameter on a public endpoint."""
+
+
+def _parse_public_query(collection, args):
+    """Extract filters, paging and projection from the query string.
+
+    Returns None when the request asks for the plain, complete public view.
+    """
+    filters = {name: set(args.get(name).split(','))
+               for name in collection.indexes if args.get(name)}
+    year_from, year_to = args.get('year_from'), args.get('year_to')
+    if (year_from or year_to) and 'year' not in collection.indexes:
+        raise PublicQueryError(f'{collection.name} cannot be filtered by year')
+    try:
+        limit = int(args['limit']) if args.get('limit') else None
+        offset = int(args.get('cursor') or 0)
+    except ValueError:
+        raise PublicQueryError('limit and cursor must be integers')
+    if limit is not None and not 1 <= limit <= PUBLIC_PAGE_MAX_LIMIT:
+        raise PublicQueryError(f'limit must be between 1 and {PUBLIC_PAGE_MAX_LIMIT}')
+    if offset < 0:
+        raise PublicQueryError('cursor must not be negative')
+    fields = [f for f in (args.get('fields') or '').split(',') if f]
+    if not (filters or year_from or year_to or limit or offset or fields):
+        return None
+    return {'filters': filters, 'year_from': year_from, 'year_to': year_to,
+            'limit': limit, 'offset': offset, 'fields': fields}
+
+
+def _query_public_snapshot(snapshot, query):
+    """Answer a filtered/paged/projected query from the snapshot's indexes."""
+    items = snapshot['items']
+    indexes = snapshot['indexes']
+    selected = None
+    for name, values in query['filters'].items():
+        positions = set()
+        for value in values:
+            positions.update(indexes[name].get(value, ()))
+        selected = positions if selected is None else selected & positions
+    if query['year_from'] or query['year_to']:
+        low, high = query['year_from'] or '', query['year_to'] or '9999'
+        positions = set()
+        for year, year_positions in indexes['year'].items():
+            if year and low <= year <= high:
+                positions.update(year_positions)
+        selected = positions if selected is None else selected & positions
+    positions = sorted(selected) if selected is not None else range(len(items))
+    total = len(positions)
+    offset, limit = query['offset'], query['limit']
+    page = positions[offset:offset + limit] if limit else positions[offset:]
+    fields = query['fields']
+    if fields:
+        page_items = [{f: items[p][f] for f in fields if f in items[p]} for p in page]
+    else:
+        page_items = [items[p] for p in page]
+    view = {'items': page_items, 'total': total, 'revision': snapshot['revision']}
+    if limit and offset + limit < total:
+        view['next_cursor'] = str(offset + limit)
+    return view
+
+
+def _serve_public_snapshot(collection):
+    """Send the pre-rendered public view in the best encoding the client accepts.
+
+    Filter, paging and projection parameters are answered from the
+    snapshot's indexes instead, with an ETag derived from the query.
+    """
+    snapshot = _public_snapshot(collection)
+    try:
+        query = _parse_public_query(collection, request.args)
+    except PublicQueryError as e:
+        return jsonify({'error': str(e)}), 400
+    if query is not None:
+        canonical = json.dumps(query, sort_keys=True, default=sorted)
+        etag = hashlib.sha256(f"{snapshot['source_etag']}:{canonical}".encode('utf-8')).hexdigest()
+        last_modified = snapshot['last_modified']
+        if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+            resp = app.response_class(_dump_public_json(_query_public_snapshot(snapshot, query)),
+                                      mimetype='application/json')
+        else:
+            resp = app.response_class(status=304)
+        return _with_validators(resp, etag, last_modified)
+    return _send_public_encoded(snapshot['encodings'], snapshot['source_etag'], snapshot['last_modified'])
+
+
+def _send_public_encoded(encodings, base_etag, last_modified):
+    """Pick the best encoding the client accepts and answer conditionally."""
+    encoding = 'identity'
+    for candidate in ('br', 'gzip'):
+        if candidate in encodings and request.accept_encodings[candidate]:
+            encoding = candidate
+            break
+    # Each encoding is a different representation and needs its own strong ETag.
+    etag = base_etag if encoding == 'identity' else f'{base_etag}-{encoding}'
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        resp = app.response_class(encodings[encoding], mimetype='application/json')
+        if encoding != 'identity':
+            resp.headers['Content-Encoding'] = encoding
+    else:
+        resp = app.response_class(status=304)
+    resp.vary.add('Accept-Encoding')
+    return _with_validators(resp, etag, last_modified)
+
+
+# --- Public Bundle ---
+# Several public views in one response: the snapshots are loaded in parallel,
+# so a cold bundle costs the slowest content read rather than the sum. The
+# ETag combines the source ETags; encoded bodies of recent bundles are kept.
+BUNDLE_CACHE_MAX_ENTRIES = 16
+_bundle_pool = ThreadPoolExecutor(max_workers=len(COLLECTIONS), thread_name_prefix='bundle')
+_bundle_cache = OrderedDict()  # combined etag -> encodings
+_bundle_cache_lock = threading.Lock()
+
+
+def _serve_public_bundle(types):
+    snapshots = dict(zip(types, _bundle_pool.map(lambda t: _public_snapshot(COLLECTIONS[t]), types)))
+    etag = hashlib.sha256('|'.join(f"{t}:{snapshots[t]['source_etag']}" for t in types)
+                          .encode('utf-8')).hexdigest()
+    modified = [s['last_modified'] for s in snapshots.values() if s['last_modified']]
+    last_modified = max(modified) if modified else None
+    with _bundle_cache_lock:
+        encodings = _bundle_cache.get(etag)
+        CACHE_REQUESTS.inc(cache='bundle', result='miss' if encodings is None else 'hit')
+        if encodings is not None:
+            _bundle_cache.move_to_end(etag)
+    if encodings is None:
+        # Splice the pre-rendered views instead of re-serializing the items.
+        parts = [json.dumps(t) + ':' + snapshots[t]['encodings']['identity'].decode('utf-8').rstrip('\n')
+                 for t in types]
+        encodings = _encode_public_body(('{' + ','.join(parts) + '}\n').encode('utf-8'))
+        with _bundle_cache_lock:
+            _bundle_cache[etag] = encodings
+            while len(_bundle_cache) > BUNDLE_CACHE_MAX_ENTRIES:
+                _bundle_cache.popitem(last=False)
+    return _send_public_encoded(encodings, etag, last_modified)
+
+
+@app.route('/public/bundle', methods=['GET'])
+def public_bundle():
+    types = [t for t in (request.args.get('types') or '').split(',') if t]
+    if not types:
+        return jsonify({'error': 'types is required'}), 400
+    unknown = [t for t in types if t not in COLLECTIONS]
+    if unknown:
+        return jsonify({'error': f'Unknown types: {unknown}'}), 400
+    try:
+        return _serve_public_bundle(sorted(set(types)))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# --- Search Index ---
+# In-memory inverted index over the public items of every collection. Text is
+# NFKC-normalized and lowercased; runs of Latin letters/digits become word
+# tokens and everything else (kana, kanji, ...) becomes character bigrams, so
+# Japanese matches without a morphological analyzer. Those characters are also
+# indexed as unigrams so a one-character query (a single kanji such as 菌)
+# still matches; longer queries use only bigrams. The index is updated
+# incrementally from each new public snapshot: only items whose searchable
+# fields changed are re-tokenized.
+_WORD_RE = re.compile(r'[0-9a-z]+|[^\W0-9a-z_]+')
+
+
+def _search_terms(text):
+    """Split normalized text into runs: Latin words and non-Latin letter runs."""
+    return _WORD_RE.findall(unicodedata.normalize('NFKC', text).lower())
+
+
+def _tokenize(text, for_index=False):
+    """Query tokens for text; for_index adds the unigrams of non-Latin runs."""
+    tokens = []
+    for run in _search_terms(text):
+        if run.isascii() or len(run) == 1:
+            tokens.append(run)
+            continue
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        if for_index:
+            tokens.extend(run)
+    return tokens
+
+
+class SearchIndex:
+    """Token -> {item id: weighted term frequency} postings for one collection."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self._lock = threading.Lock()
+        self._postings = {}
+        self._docs = {}  # item id -> (fingerprint, item, {token: weighted tf})
+
+    def _fingerprint(self, item):
+        return tuple(str(item.get(f) or '') for f in self.collection.search_fields)
+
+    def update(self, items):
+        """Bring the index in line with the current public items."""
+        current = {item.get('id'): item for item in items}
+        with self._lock:
+            for item_id in [i for i in self._docs if i not in current]:
+                self._remove(item_id)
+            for item_id, item in current.items():
+                doc = self._docs.get(item_id)
+                fingerprint = self._fingerprint(item)
+                if doc is not None and doc[0] == fingerprint:
+                    self._docs[item_id] = (fingerprint, item, doc[2])
+                    continue
+                if doc is not None:
+                    self._remove(item_id)
+                self._add(item_id, fingerprint, item)
+
+    def _add(self, item_id, fingerprint, item):
+        weights = {}
+        for field, weight in self.collection.search_fields.items():
+            for token in _tokenize(str(item.get(field) or ''), for_index=True):
+                weights[token] = weights.get(token, 0.0) + weight
+        for token, weight in weights.items():
+            self._postings.setdefault(token, {})[item_id] = weight
+        self._docs[item_id] = (fingerprint, item, weights)
+
+    def _remove(self, item_id):
+        _, _, weights = self._docs.pop(item_id)
+        for token in weights:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(item_id, None)
+                if not postings:
+                    del self._postings[token]
+
+    def search(self, tokens):
+        """Return [(score, item)] for items containing every query token (tf-idf)."""
+        with self._lock:
+            doc_count = len(self._docs)
+            scores = None
+            for token in set(tokens):
+                postings = self._postings.get(token)
+                if not postings:
+                    return []
+                idf = math.log(1 + doc_count / len(postings))
+                if scores is None:
+                    scores = {i: w * idf for i, w in postings.items()}
+                else:
+                    scores = {i: score + postings[i] * idf for i, score in scores.items() if i in postings}
+                if not scores:
+                    return []
+            return [(score, self._docs[i][1]) for i, score in (scores or {}).items()]
+
+
+_search_indexes = {name: SearchIndex(c) for name, c in COLLECTIONS.items()}
+
+
+def _token_spans(text, tokens):
+    """[start, end) spans where tokens occur in normalized text, overlaps merged.
+
+    Latin word tokens only match whole words, as in the index; bigrams and
+    unigrams match anywhere.
+    """
+    found = []
+    for token in set(tokens):
+        if token.isascii():
+            pattern = re.compile(rf'(?<![0-9a-z]){re.escape(token)}(?![0-9a-z])')
+            found.extend(m.span() for m in pattern.finditer(text))
+            continue
+        start = text.find(token)
+        while start != -1:
+            found.append((start, start + len(token)))
+            start = text.find(token, start + 1)
+    spans = []
+    for start, end in sorted(found):
+        if spans and start <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], end))
+        else:
+            spans.append((start, end))
+    return spans
+
+
+def _highlights(collection, item, tokens):
+    """Snippets of the searchable fields with the [start, end) offsets of each matched token."""
+    highlights = []
+    for field in collection.search_fields:
+        text = str(item.get(field) or '')
+        lowered = unicodedata.normalize('NFKC', text).lower()
+        if len(lowered) != len(text):
+            lowered = text.lower()
+        spans = _token_spans(lowered, tokens)
+        if not spans:
+            continue
+        begin = max(spans[0][0] - SEARCH_SNIPPET_CONTEXT, 0)
+        end = min(begin + SEARCH_SNIPPET_LENGTH, len(text))
+        highlights.append({
+            'field': field,
+            'snippet': text[begin:end],
+            'matches': [[s - begin, e - begin] for s, e in spans if s >= begin and e <= end],
+        })
+    return highlights
 
 
 # ============================================================
@@ -292,38 +2203,186 @@ def hello():
     return 'Hirota Lab CMS API is running!'
 
 
+@app.route('/status', methods=['GET'])
+def status():
+    store = _content_store
+    return jsonify({
+        'content_backend': CONTENT_BACKEND,
+        'breakers': {_drive_breaker.name: _drive_breaker.snapshot()},
+        'pending_writes': store.pending() if isinstance(store, WriteBehindContentStore) else [],
+        'prewarm': _prewarm_report,
+        'static_export': _static_export_report,
+    })
+
+
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def _record_request_metrics(response):
+    started = getattr(g, 'request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, method=request.method,
+                                     route=route, status=response.status_code)
+        if not response.is_streamed:
+            HTTP_RESPONSE_BYTES.observe(response.calculate_content_length() or 0, route=route)
+    return response
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(_render_metrics(), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: 503 until the startup prewarm (if enabled) has finished."""
+    if not _ready.is_set():
+        return jsonify({'ready': False, 'prewarm': _prewarm_report}), 503
+    return jsonify({'ready': True, 'prewarm': _prewarm_report}), 200
+
+
 # --- Drive File Browser ---
 @app.route('/drive/files', methods=['GET'])
 def drive_list_files():
     try:
         folder_id = request.args.get('folder_id', GOOGLE_DRIVE_FOLDER_ID)
         files = _list_drive_files(folder_id)
-        return jsonify(files)
+        try:
+            page = _paginate_listing(files, request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(files if page is None else page)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+# Streamed straight from Drive in DRIVE_STREAM_CHUNK_SIZE pieces, so memory per
+# download is constant. Range / If-Range are forwarded and Drive's 206 / 416 is
+# passed through; the number of open downloads is capped per worker.
+_download_slots = threading.BoundedSemaphore(DRIVE_DOWNLOAD_MAX_CONCURRENCY)
+STREAM_REQUEST_HEADERS = ('Range', 'If-Range')
+STREAM_RESPONSE_HEADERS = ('Content-Length', 'Content-Range', 'Accept-Ranges', 'ETag', 'Last-Modified')
+
+
+def _attachment_names(name):
+    """Content-Disposition filename parameters, with an RFC 5987 form for non-ASCII names."""
+    try:
+        name.encode('ascii')
+        return {'filename': name}
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+        return {'filename': simple or 'file', 'filename*': "UTF-8''" + quote(name, safe="!#$&+-.^_`|~")}
+
+
 @app.route('/drive/file/<file_id>', methods=['GET'])
 def drive_get_file(file_id):
+    if not _is_drive_id(file_id):
+        return jsonify({'error': 'Invalid file id'}), 400
+    return _stream_drive_file(file_id)
+
+
+# The file's md5 (or modifiedTime) is its ETag. A URL carrying it as ?v= is
+# content-addressed and answered with immutable caching; with the disk cache
+# enabled such a request is served without any Drive call at all.
+def _stream_drive_file(file_id, disposition='attachment'):
+    cache = _get_drive_file_cache()
+    requested_version = request.args.get('v')
     try:
+        if cache is not None and requested_version:
+            hit = cache.get(f'{file_id}:{requested_version}')
+            if hit is not None:
+                return _send_cached_drive_file(hit, requested_version, disposition)
         service = _get_drive_service()
-        meta = service.files().get(fileId=file_id, fields='id,name,mimeType,size').execute()
-        req = service.files().get_media(fileId=file_id)
-        buf = BytesIO()
-        downloader = MediaIoBaseDownload(buf, req)
-        done = False
-        while not done:
-            _, done = downloader.next_chunk()
-        buf.seek(0)
-        return send_file(
-            buf,
-            mimetype=meta.get('mimeType', 'application/octet-stream'),
-            as_attachment=True,
-            download_name=meta.get('name', 'file')
-        )
+        meta = service.files().get(fileId=file_id,
+                                   fields='id,name,mimeType,size,md5Checksum,modifiedTime').execute()
+        version = meta.get('md5Checksum') or hashlib.sha256(
+            (meta.get('modifiedTime') or '').encode('utf-8')).hexdigest()[:32]
+        if cache is not None:
+            hit = cache.get(f'{file_id}:{version}')
+            if hit is not None:
+                return _send_cached_drive_file(hit, version, disposition)
+        if request.if_none_match.contains(version):
+            return _drive_file_cache_headers(Response(status=304), version)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    if not _download_slots.acquire(timeout=DRIVE_DOWNLOAD_QUEUE_TIMEOUT):
+        resp = jsonify({'error': 'Too many concurrent downloads'})
+        resp.headers['Retry-After'] = str(max(int(DRIVE_DOWNLOAD_QUEUE_TIMEOUT), 1))
+        return resp, 503
+    upstream = None
+    try:
+        # identity keeps Content-Length / Content-Range in raw file bytes.
+        headers = {h: request.headers[h] for h in STREAM_REQUEST_HEADERS if h in request.headers}
+        headers['Accept-Encoding'] = 'identity'
+        upstream = _get_drive_session().get(f"{DRIVE_API_BASE}/files/{quote(file_id, safe='')}",
+                                            params={'alt': 'media'}, headers=headers,
+                                            stream=True, timeout=DRIVE_HTTP_TIMEOUT)
+        if upstream.status_code not in (200, 206, 416):
+            upstream.raise_for_status()
+        body = upstream.iter_content(DRIVE_STREAM_CHUNK_SIZE)
+        # Only complete downloads of files well under the cache size are kept.
+        if (cache is not None and upstream.status_code == 200
+                and int(meta.get('size') or 0) <= cache.max_bytes // 4):
+            body = _fill_drive_file_cache(cache, f'{file_id}:{version}', body,
+                                          {'name': meta.get('name'), 'mimeType': meta.get('mimeType')})
+        resp = Response(body, status=upstream.status_code,
+                        mimetype=meta.get('mimeType', 'application/octet-stream'))
+        for name in STREAM_RESPONSE_HEADERS:
+            if name in upstream.headers:
+                resp.headers[name] = upstream.headers[name]
+        resp.headers.setdefault('Accept-Ranges', 'bytes')
+        resp.headers.set('Content-Disposition', disposition, **_attachment_names(meta.get('name', 'file')))
+        _drive_file_cache_headers(resp, version)
     except Exception as e:
+        if upstream is not None:
+            upstream.close()
+        _download_slots.release()
         return jsonify({'error': str(e)}), 500
 
+    def finish():
+        upstream.close()
+        _download_slots.release()
+    resp.call_on_close(finish)
+    return resp
+
+
+def _drive_file_cache_headers(resp, version):
+    resp.set_etag(version)
+    immutable = request.args.get('v') == version
+    resp.headers['Cache-Control'] = CACHE_CONTROL_IMMUTABLE if immutable else CACHE_CONTROL_DRIVE_FILE
+    return resp
+
+
+def _send_cached_drive_file(hit, version, disposition):
+    """Serve a cache hit via send_file: sendfile, Range and If-None-Match for free."""
+    path, meta = hit
+    resp = send_file(path, mimetype=meta.get('mimeType') or 'application/octet-stream',
+                     as_attachment=disposition == 'attachment', download_name=meta.get('name') or 'file',
+                     etag=version, conditional=True)
+    return _drive_file_cache_headers(resp, version)
+
+
+def _fill_drive_file_cache(cache, key, chunks, meta):
+    """Pass chunks through while writing them to the cache; commit only if all arrived."""
+    out, tmp_path = cache.reserve()
+    complete = False
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+            yield chunk
+        complete = True
+    finally:
+        out.close()
+        if complete:
+            cache.commit(key, tmp_path, meta)
+        else:
+            os.remove(tmp_path)
+
 
 # --- Upload File to Drive ---
 @app.route('/upload', methods=['POST'])
@@ -336,609 +2395,1061 @@ def upload_file():
     try:
         service = _get_drive_service()
         metadata = {'name': file.filename, 'parents': [GOOGLE_DRIVE_FOLDER_ID]}
-        media = MediaIoBaseUpload(file.stream, mimetype=file.content_type or 'application/octet-stream')
-        created = service.files().create(body=metadata, media_body=media, fields='id,name').execute()
+        # Resumable: sent UPLOAD_CHUNK_SIZE at a time, each chunk retried with
+        # exponential backoff instead of restarting the whole transfer.
+        media = MediaIoBaseUpload(file.stream, mimetype=file.content_type or 'application/octet-stream',
+                                  chunksize=UPLOAD_CHUNK_SIZE, resumable=True)
+        req = service.files().create(body=metadata, media_body=media, fields='id,name')
+        created = None
+        while created is None:
+            _, created = req.next_chunk(num_retries=UPLOAD_RETRIES)
+        _mark_drive_listings_stale()
+        _schedule_image_variants(created['id'], file.filename, file.content_type)
         return jsonify({'message': f'File {file.filename} uploaded', 'id': created['id']}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-# --- Delete File from Drive ---
-@app.route('/delete/<file_id>', methods=['DELETE'])
-def delete_file(file_id):
-    try:
-        service = _get_drive_service()
-        service.files().delete(fileId=file_id).execute()
-        return jsonify({'message': 'File deleted'}), 200
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+# --- Chunked Upload Sessions ---
+# Client-driven resumable uploads: POST /upload/sessions opens a Drive resumable
+# session, each PUT forwards one chunk (at most UPLOAD_CHUNK_SIZE bytes, so
+# server memory stays constant) and reports how many bytes Drive has. When the
+# size was not given up front, the client marks its last chunk with ?final=1
+# (which may be empty); finalize only confirms with Drive that the file was
+# committed and never truncates an upload.
+#
+# Sessions are stateless so any instance can serve any request: session_id is
+# the Drive resumable URI, name, size, MIME type and creation time, signed
+# with UPLOAD_SESSION_SECRET (which must be the same on every instance), and
+# progress is always what Drive reports.
+_upload_session_key = (UPLOAD_SESSION_SECRET or secrets.token_hex(32)).encode('utf-8')
 
 
-# --- List files (legacy compat) ---
-@app.route('/files', methods=['GET'])
-def list_files():
-    try:
-        files = _list_drive_files()
-        file_list = []
-        for f in files:
-            file_list.append({
-                'name': f.get('name', ''),
-                'id': f.get('id', ''),
-                'size': f.get('size'),
-                'updated': f.get('modifiedTime'),
-                'content_type': f.get('mimeType', ''),
-                'webViewLink': f.get('webViewLink', '')
-            })
-        return jsonify(file_list)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
 
 
-# ============================================================
-# NEWS CRUD
-# ============================================================
-@app.route('/content/news', methods=['GET'])
-def get_news():
-    try:
-        payload = _read_content('news.json')
-        return jsonify(payload)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
 
 
-@app.route('/content/news', methods=['POST'])
-def create_news():
-    ok, reason = _require_admin()
-    if not ok:
-        return jsonify({'error': reason}), 401
-    data = request.get_json(silent=True) or {}
-    errors = _validate_news_input(data)
-    if errors:
-        return jsonify({'error': 'Validation failed', 'details': errors}), 400
-    try:
-        payload = _read_content('news.json')
-        items = payload.get('items', [])
-        now = _utc_now_iso()
-        item = {
-            'id': _next_id(items),
-            'title': data.get('title', '').strip(),
-            'body': data.get('body', '').strip(),
-            'date': data.get('date', '').strip(),
-            'link': (data.get('link') or '').strip(),
-            'visible': bool(data.get('visible', True)),
-            'created_at': now,
-            'updated_at': now
-        }
-        items.append(item)
-        payload['items'] = items
-        payload['updated_at'] = now
-        _write_content('news.json', payload)
-        return jsonify(item), 201
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+def _sign_upload_session(session):
+    body = _b64encode(json.dumps(session, separators=(',', ':')).encode('utf-8'))
+    mac = hmac.new(_upload_session_key, body.encode('ascii'), hashlib.sha256).digest()
+    return f'{body}.{_b64encode(mac)}'
 
 
-@app.route('/content/news/<int:item_id>', methods=['PUT'])
-def update_news(item_id):
-    ok, reason = _require_admin()
-    if not ok:
-        return jsonify({'error': reason}), 401
-    data = request.get_json(silent=True) or {}
-    errors = _validate_news_input(data, for_update=True)
-    if errors:
-        return jsonify({'error': 'Validation failed', 'details': errors}), 400
+def _upload_session(session_id):
+    """Return the session a signed session_id describes, or None if invalid or expired."""
+    body, _, mac = session_id.partition('.')
     try:
-        payload = _read_content('news.json')
-        items = payload.get('items', [])
-        now = _utc_now_iso()
-        for item in items:
-            if item.get('id') == item_id:
-                for key in ('title', 'body', 'date', 'link'):
-                    if key in data:
-                        item[key] = (data.get(key) or '').strip()
-                if 'visible' in data:
-                    item['visible'] = bool(data.get('visible'))
-                item['updated_at'] = now
-                payload['updated_at'] = now
-                _write_content('news.json', payload)
-                return jsonify(item)
-        return jsonify({'error': 'Item not found'}), 404
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        expected = hmac.new(_upload_session_key, body.encode('ascii'), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _b64decode(mac)):
+            return None
+        session = json.loads(_b64decode(body))
+    except (ValueError, UnicodeError):
+        return None
+    if time.time() - session.get('created', 0) > UPLOAD_SESSION_TTL:
+        return None
+    return dict(session, received=0, file=None)
 
 
-@app.route('/content/news/<int:item_id>', methods=['DELETE'])
-def delete_news(item_id):
-    ok, reason = _require_admin()
-    if not ok:
-        return jsonify({'error': reason}), 401
-    try:
-        payload = _read_content('news.json')
-        items = payload.get('items', [])
-        remaining = [i for i in items if i.get('id') != item_id]
-        if len(remaining) == len(items):
-            return jsonify({'error': 'Item not found'}), 404
-        payload['items'] = remaining
-        payload['updated_at'] = _utc_now_iso()
-        _write_content('news.json', payload)
-        return jsonify({'message': 'Deleted'}), 200
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+def _drive_upload_request(method, url, **kwargs):
+    """Call the Drive upload endpoint, retrying 429/5xx and network errors with backoff."""
+    for attempt in range(UPLOAD_RETRIES + 1):
+        try:
+            resp = _get_drive_session().request(method, url, timeout=DRIVE_HTTP_TIMEOUT, **kwargs)
+            if (resp.status_code != 429 and resp.status_code < 500) or attempt == UPLOAD_RETRIES:
+                return resp
+        except requests.RequestException:
+            if attempt == UPLOAD_RETRIES:
+                raise
+        time.sleep(random.uniform(0, min(2 ** attempt, 32)))
+
+
+def _upload_session_view(session_id, session):
+    view = {'session_id': session_id, 'name': session['name'], 'size': session['size'],
+            'received': session['received'], 'chunk_size': UPLOAD_CHUNK_SIZE,
+            'done': session['file'] is not None}
+    if session['file'] is not None:
+        view['id'] = session['file']['id']
+    return view
+
+
+def _apply_upload_response(session, resp):
+    """Record Drive's reply to a chunk: 308 carries the persisted range, 200/201 the file."""
+    if resp.status_code == 308:
+        committed = resp.headers.get('Range')
+        session['received'] = int(committed.rsplit('-', 1)[1]) + 1 if committed else 0
+    elif resp.status_code in (200, 201):
+        session['file'] = resp.json()
+        session['received'] = int(session['file'].get('size') or session['received'])
+    else:
+        resp.raise_for_status()
+        raise RuntimeError(f'Unexpected upload status {resp.status_code}')
 
 
-# ============================================================
-# EVENTS CRUD
-# ============================================================
-@app.route('/content/events', methods=['GET'])
-def get_events():
-    try:
-        payload = _read_content('events.json')
-        return jsonify(payload)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+def _query_upload_status(session):
+    """Ask Drive how much it has persisted; a completed upload answers with the file."""
+    total = '*' if session['size'] is None else session['size']
+    resp = _drive_upload_request('PUT', session['uri'], headers={'Content-Range': f'bytes */{total}'})
+    _apply_upload_response(session, resp)
 
 
-@app.route('/content/events', methods=['POST'])
-def create_event():
-    ok, reason = _require_admin()
-    if not ok:
-        return jsonify({'error': reason}), 401
+@app.route('/upload/sessions', methods=['POST'])
+def create_upload_session():
     data = request.get_json(silent=True) or {}
-    errors = _validate_event_input(data)
-    if errors:
-        return jsonify({'error': 'Validation failed', 'details': errors}), 400
+    name = (data.get('name') or '').strip()
+    if not name:
+        return jsonify({'error': 'name is required'}), 400
+    size = data.get('size')
+    if size is not None and (not isinstance(size, int) or size < 0):
+        return jsonify({'error': 'size must be a non-negative integer'}), 400
+    mime_type = data.get('mime_type') or 'application/octet-stream'
     try:
-        payload = _read_content('events.json')
-        items = payload.get('items', [])
-        now = _utc_now_iso()
-        item = {
-            'id': _next_id(items),
-            'title': data.get('title', '').strip(),
-            'date': data.get('date', '').strip(),
-            'time_start': (data.get('time_start') or '').strip(),
-            'time_end': (data.get('time_end') or '').strip(),
-            'location': (data.get('location') or '').strip(),
-            'description': (data.get('description') or '').strip(),
-            'link': (data.get('link') or '').strip(),
-            'visible': bool(data.get('visible', True)),
-            'created_at': now,
-            'updated_at': now
-        }
-        items.append(item)
-        payload['items'] = items
-        payload['updated_at'] = now
-        _write_content('events.json', payload)
-        return jsonify(item), 201
+        headers = {'X-Upload-Content-Type': mime_type}
+        if size is not None:
+            headers['X-Upload-Content-Length'] = str(size)
+        resp = _drive_upload_request(
+            'POST', f'{DRIVE_UPLOAD_BASE}/files',
+            params={'uploadType': 'resumable', 'fields': 'id,name,mimeType,size'}, headers=headers,
+            json={'name': name, 'mimeType': mime_type, 'parents': [GOOGLE_DRIVE_FOLDER_ID]})
+        resp.raise_for_status()
+        signed = {'uri': resp.headers['Location'], 'name': name, 'size': size, 'mime_type': mime_type,
+                  'created': int(time.time())}
+        session_id = _sign_upload_session(signed)
+        return jsonify(_upload_session_view(session_id, dict(signed, received=0, file=None))), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/content/events/<int:item_id>', methods=['PUT'])
-def update_event(item_id):
-    ok, reason = _require_admin()
-    if not ok:
-        return jsonify({'error': reason}), 401
-    data = request.get_json(silent=True) or {}
-    errors = _validate_event_input(data, for_update=True)
-    if errors:
-        return jsonify({'error': 'Validation failed', 'details': errors}), 400
+@app.route('/upload/sessions/<session_id>', methods=['GET'])
+def get_upload_session(session_id):
+    """Ask Drive how much it has persisted, e.g. after an interrupted chunk."""
+    session = _upload_session(session_id)
+    if session is None:
+        return jsonify({'error': 'Upload session not found'}), 404
     try:
-        payload = _read_content('events.json')
-        items = payload.get('items', [])
-        now = _utc_now_iso()
-        for item in items:
-            if item.get('id') == item_id:
-                for key in ('title', 'date', 'time_start', 'time_end', 'location', 'description', 'link'):
-                    if key in data:
-                        item[key] = (data.get(key) or '').strip()
-                if 'visible' in data:
-                    item['visible'] = bool(data.get('visible'))
-                item['updated_at'] = now
-                payload['updated_at'] = now
-                _write_content('events.json', payload)
-                return jsonify(item)
-        return jsonify({'error': 'Item not found'}), 404
+        _query_upload_status(session)
+        return jsonify(_upload_session_view(session_id, session))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/content/events/<int:item_id>', methods=['DELETE'])
-def delete_event(item_id):
-    ok, reason = _require_admin()
-    if not ok:
-        return jsonify({'error': reason}), 401
+@app.route('/upload/sessions/<session_id>', methods=['PUT'])
+def append_upload_session(session_id):
+    """Append the request body at ?offset= (must equal the bytes received so far).
+
+    ?final=1 marks the last chunk, which need not be aligned and ends the
+    upload at offset + its length.
+    """
+    session = _upload_session(session_id)
+    if session is None:
+        return jsonify({'error': 'Upload session not found'}), 404
+    final = request.args.get('final') in ('1', 'true')
+    length = request.content_length or 0
+    if not length and not final:
+        return jsonify({'error': 'Chunk body is required'}), 411
+    if length > UPLOAD_CHUNK_SIZE:
+        return jsonify({'error': f'Chunk exceeds {UPLOAD_CHUNK_SIZE} bytes'}), 413
     try:
-        payload = _read_content('events.json')
-        items = payload.get('items', [])
-        remaining = [i for i in items if i.get('id') != item_id]
-        if len(remaining) == len(items):
-            return jsonify({'error': 'Item not found'}), 404
-        payload['items'] = remaining
-        payload['updated_at'] = _utc_now_iso()
-        _write_content('events.json', payload)
-        return jsonify({'message': 'Deleted'}), 200
+        offset = int(request.args.get('offset', ''))
+    except ValueError:
+        return jsonify({'error': 'offset must be an integer'}), 400
+    size = session['size']
+    if size is not None and offset + length > size:
+        return jsonify({'error': 'Chunk runs past the declared size'}), 400
+    if final and size is not None and offset + length != size:
+        return jsonify({'error': 'Final chunk does not end at the declared size'}), 400
+    last = final or (size is not None and offset + length == size)
+    if not last and length % UPLOAD_CHUNK_ALIGNMENT:
+        return jsonify({'error': f'Chunks must be multiples of {UPLOAD_CHUNK_ALIGNMENT} bytes'}), 400
+    try:
+        chunk = request.stream.read(length)
+        if len(chunk) != length:
+            return jsonify({'error': 'Chunk body is shorter than Content-Length'}), 400
+        total = offset + length if last else '*' if size is None else size
+        first = f'{offset}-{offset + length - 1}' if length else '*'
+        resp = _drive_upload_request('PUT', session['uri'], data=chunk, headers={
+            'Content-Range': f'bytes {first}/{total}'})
+        if resp.status_code in (200, 201, 308):
+            _apply_upload_response(session, resp)
+        if resp.status_code not in (200, 201, 308) or (session['file'] is None
+                                                       and session['received'] != offset + length):
+            # Drive refused the chunk or kept a different range (a chunk
+            # skipped or already sent): report what it has.
+            _query_upload_status(session)
+            return jsonify({'error': 'Offset does not match the upload session',
+                            **_upload_session_view(session_id, session)}), 409
+        return jsonify(_upload_session_view(session_id, session))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-# ============================================================
-# MEMBERS CRUD
-# ============================================================
-@app.route('/content/members', methods=['GET'])
-def get_members():
+@app.route('/upload/sessions/<session_id>/finalize', methods=['POST'])
+def finalize_upload_session(session_id):
+    session = _upload_session(session_id)
+    if session is None:
+        return jsonify({'error': 'Upload session not found'}), 404
     try:
-        payload = _read_content('members.json')
-        return jsonify(payload)
+        # A status query: Drive answers with the file once the last chunk has
+        # landed (also when its reply was lost) and with 308 otherwise.
+        _query_upload_status(session)
+        if session['file'] is None:
+            return jsonify({'error': 'Upload is incomplete',
+                            **_upload_session_view(session_id, session)}), 409
+        _mark_drive_listings_stale()
+        _schedule_image_variants(session['file']['id'], session['name'], session['mime_type'])
+        return jsonify({'message': f"File {session['name']} uploaded", 'id': session['file']['id']}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/content/members', methods=['POST'])
-def create_member():
-    ok, reason = _require_admin()
-    if not ok:
-        return jsonify({'error': reason}), 401
-    data = request.get_json(silent=True) or {}
-    errors = _validate_member_input(data)
-    if errors:
-        return jsonify({'error': 'Validation failed', 'details': errors}), 400
+@app.route('/upload/sessions/<session_id>', methods=['DELETE'])
+def cancel_upload_session(session_id):
+    session = _upload_session(session_id)
+    if session is None:
+        return jsonify({'error': 'Upload session not found'}), 404
     try:
-        payload = _read_content('members.json')
-        items = payload.get('items', [])
-        now = _utc_now_iso()
-        item = {
-            'id': _next_id(items),
-            'name': data.get('name', '').strip(),
-            'name_en': (data.get('name_en') or '').strip(),
-            'role': (data.get('role') or 'bachelor').strip(),
-            'title': (data.get('title') or '').strip(),
-            'research_interest': (data.get('research_interest') or '').strip(),
-            'photo_url': (data.get('photo_url') or '').strip(),
-            'email': (data.get('email') or '').strip(),
-            'year_joined': data.get('year_joined', ''),
-            'order': data.get('order', 99),
-            'visible': bool(data.get('visible', True)),
-            'created_at': now,
-            'updated_at': now
-        }
-        items.append(item)
-        payload['items'] = items
-        payload['updated_at'] = now
-        _write_content('members.json', payload)
-        return jsonify(item), 201
+        # Drive answers a cancelled session with 499 (and a finished one with 4xx).
+        _get_drive_session().delete(session['uri'], timeout=DRIVE_HTTP_TIMEOUT)
+        return jsonify({'message': 'Upload session cancelled'}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/content/members/<int:item_id>', methods=['PUT'])
-def update_member(item_id):
-    ok, reason = _require_admin()
-    if not ok:
-        return jsonify({'error': reason}), 401
-    data = request.get_json(silent=True) or {}
-    errors = _validate_member_input(data, for_update=True)
-    if errors:
-        return jsonify({'error': 'Validation failed', 'details': errors}), 400
+# --- Image Variants ---
+# Uploaded JPEG/PNG/WebP images get resized copies (IMAGE_VARIANT_WIDTHS) in the
+# source format plus AVIF/WebP, stored in the IMAGE_VARIANT_FOLDER subfolder
+# and tagged with appProperties pointing at the original. Resizing runs in a
+# process pool off the request thread; /drive/image/<file_id> then serves the
+# best variant for the client's Accept header and ?w= width.
+IMAGE_SOURCE_TYPES = ('image/jpeg', 'image/png', 'image/webp')
+IMAGE_FORMAT_TYPES = {'jpeg': 'image/jpeg', 'png': 'image/png', 'webp': 'image/webp', 'avif': 'image/avif'}
+# Originals found to have no variants are remembered briefly, in a bounded
+# LRU, so repeated requests for them do not each list Drive.
+IMAGE_VARIANT_MISS_TTL = 300
+IMAGE_VARIANT_MISS_MAX_ENTRIES = 1024
+_image_pool = None
+_image_variants = {}  # original file id -> {'status': ..., 'variants': [...]}
+_image_variant_misses = OrderedDict()  # original file id -> expiry (monotonic)
+_image_variants_lock = threading.Lock()
+
+
+def _get_image_pool():
+    # spawn: forking a process that already runs request threads is unsafe.
+    global _image_pool
+    if _image_pool is None:
+        with _clients_lock:
+            if _image_pool is None:
+                _image_pool = ProcessPoolExecutor(max_workers=IMAGE_PROCESS_WORKERS,
+                                                  mp_context=multiprocessing.get_context('spawn'))
+    return _image_pool
+
+
+def _render_image_variants(path, widths, formats):
+    """Runs in the process pool: return [(width, format, bytes)] for one image."""
+    from PIL import Image, ImageOps, features as image_features
+    with Image.open(path) as source:
+        image = ImageOps.exif_transpose(source)
+        has_alpha = image.mode in ('RGBA', 'LA') or 'transparency' in image.info
+        base_format = 'png' if has_alpha else 'jpeg'
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+        sizes = sorted({w for w in widths if w < image.width} | {image.width})
+        variants = []
+        for width in sizes:
+            height = max(round(image.height * width / image.width), 1)
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            for fmt in [base_format] + [f for f in formats if image_features.check(f)]:
+                buf = BytesIO()
+                options = {'optimize': True} if fmt in ('jpeg', 'png') else {}
+                if fmt != 'png':
+                    options['quality'] = 80 if fmt != 'avif' else 60
+                resized.save(buf, format=fmt.upper(), **options)
+                variants.append((width, fmt, buf.getvalue()))
+        return variants
+
+
+def _generate_image_variants(file_id, name):
     try:
-        payload = _read_content('members.json')
-        items = payload.get('items', [])
-        now = _utc_now_iso()
-        for item in items:
-            if item.get('id') == item_id:
-                for key in ('name', 'name_en', 'role', 'title', 'research_interest',
-                            'photo_url', 'email'):
-                    if key in data:
-                        item[key] = (data.get(key) or '').strip()
-                if 'year_joined' in data:
-                    item['year_joined'] = data.get('year_joined', '')
-                if 'order' in data:
-                    item['order'] = data.get('order', 99)
-                if 'visible' in data:
-                    item['visible'] = bool(data.get('visible'))
-                item['updated_at'] = now
-                payload['updated_at'] = now
-                _write_content('members.json', payload)
-                return jsonify(item)
-        return jsonify({'error': 'Item not found'}), 404
+        service = _get_drive_service()
+        with tempfile.NamedTemporaryFile(suffix=os.path.splitext(name)[1]) as tmp:
+            downloader = MediaIoBaseDownload(tmp, service.files().get_media(fileId=file_id))
+            done = False
+            while not done:
+                _, done = downloader.next_chunk()
+            tmp.flush()
+            rendered = _get_image_pool().submit(
+                _render_image_variants, tmp.name, IMAGE_VARIANT_WIDTHS, IMAGE_VARIANT_FORMATS).result()
+        folder_id = _lookup_drive_id(IMAGE_VARIANT_FOLDER, GOOGLE_DRIVE_FOLDER_ID)
+        if not folder_id:
+            folder_id = _find_or_create_folder(IMAGE_VARIANT_FOLDER)
+            _remember_drive_id(IMAGE_VARIANT_FOLDER, GOOGLE_DRIVE_FOLDER_ID, folder_id)
+        stem = os.path.splitext(name)[0]
+        variants = []
+        for width, fmt, body in rendered:
+            metadata = {
+                'name': f'{stem}.w{width}.{fmt}',
+                'parents': [folder_id],
+                'appProperties': {'variant_of': file_id, 'width': str(width), 'format': fmt},
+            }
+            media = MediaIoBaseUpload(BytesIO(body), mimetype=IMAGE_FORMAT_TYPES[fmt], resumable=False)
+            created = service.files().create(body=metadata, media_body=media, fields='id').execute()
+            variants.append({'id': created['id'], 'width': width, 'format': fmt, 'size': len(body)})
+        entry = {'status': 'ready', 'variants': variants}
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-
-@app.route('/content/members/<int:item_id>', methods=['DELETE'])
-def delete_member(item_id):
-    ok, reason = _require_admin()
-    if not ok:
-        return jsonify({'error': reason}), 401
+        app.logger.warning(f'Image variants for {file_id} failed: {e}')
+        entry = {'status': 'failed', 'variants': []}
+    with _image_variants_lock:
+        _image_variants[file_id] = entry
+
+
+def _schedule_image_variants(file_id, name, mime_type):
+    if not HAS_PIL or (mime_type or '').split(';')[0] not in IMAGE_SOURCE_TYPES:
+        return
+    with _image_variants_lock:
+        _image_variants[file_id] = {'status': 'pending', 'variants': []}
+        _image_variant_misses.pop(file_id, None)
+    threading.Thread(target=_generate_image_variants, args=(file_id, name), daemon=True).start()
+
+
+def _image_variants_query(file_id):
+    return (f"appProperties has {{ key='variant_of' and value={_drive_query_literal(file_id)} }}"
+            " and trashed = false")
+
+
+def _list_image_variants(file_id):
+    """Variants of an original, from memory or (after a restart) from Drive."""
+    with _image_variants_lock:
+        entry = _image_variants.get(file_id)
+        if entry is None and _image_variant_misses.get(file_id, 0) > time.monotonic():
+            entry = {'status': 'none', 'variants': []}
+    if entry is not None:
+        return entry
+    service = _get_drive_service()
+    result = service.files().list(q=_image_variants_query(file_id), fields='files(id, size, appProperties)',
+                                  pageSize=100).execute()
+    variants = [{'id': f['id'], 'width': int(f['appProperties']['width']),
+                 'format': f['appProperties']['format'], 'size': int(f.get('size') or 0)}
+                for f in result.get('files', [])]
+    with _image_variants_lock:
+        if variants:
+            entry = _image_variants[file_id] = {'status': 'ready', 'variants': variants}
+            _image_variant_misses.pop(file_id, None)
+            return entry
+        _image_variant_misses[file_id] = time.monotonic() + IMAGE_VARIANT_MISS_TTL
+        _image_variant_misses.move_to_end(file_id)
+        while len(_image_variant_misses) > IMAGE_VARIANT_MISS_MAX_ENTRIES:
+            _image_variant_misses.popitem(last=False)
+    return {'status': 'none', 'variants': []}
+
+
+def _delete_image_variants(file_id):
+    with _image_variants_lock:
+        _image_variants.pop(file_id, None)
+        _image_variant_misses.pop(file_id, None)
     try:
-        payload = _read_content('members.json')
-        items = payload.get('items', [])
-        remaining = [i for i in items if i.get('id') != item_id]
-        if len(remaining) == len(items):
-            return jsonify({'error': 'Item not found'}), 404
-        payload['items'] = remaining
-        payload['updated_at'] = _utc_now_iso()
-        _write_content('members.json', payload)
-        return jsonify({'message': 'Deleted'}), 200
+        service = _get_drive_service()
+        q = _image_variants_query(file_id)
+        for f in service.files().list(q=q, fields='files(id)', pageSize=100).execute().get('files', []):
+            service.files().delete(fileId=f['id']).execute()
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-
-# ============================================================
-# PUBLICATIONS CRUD
-# ============================================================
-@app.route('/content/publications', methods=['GET'])
-def get_publications():
+        app.logger.warning(f'Could not delete image variants of {file_id}: {e}')
+
+
+def _response_and_status(result):
+    """Split a view result that may be a (response, status) tuple."""
+    if isinstance(result, tuple):
+        return result[0], result[1]
+    return result, result.status_code
+
+
+def _pick_image_variant(variants, accept, width):
+    """Best format the client accepts, then the smallest variant at least `width` wide."""
+    accepted = {mimetype for mimetype, quality in accept if quality > 0}
+    by_format = {}
+    for variant in variants:
+        by_format.setdefault(variant['format'], []).append(variant)
+    candidates = None
+    for fmt in ('avif', 'webp'):
+        if IMAGE_FORMAT_TYPES[fmt] in accepted and fmt in by_format:
+            candidates = by_format[fmt]
+            break
+    if candidates is None:
+        candidates = by_format.get('jpeg') or by_format.get('png')
+    if not candidates:
+        return None
+    candidates = sorted(candidates, key=lambda v: v['width'])
+    if width:
+        for variant in candidates:
+            if variant['width'] >= width:
+                return variant
+    return candidates[-1]
+
+
+@app.route('/drive/image/<file_id>', methods=['GET'])
+def drive_get_image(file_id):
+    if not _is_drive_id(file_id):
+        return jsonify({'error': 'Invalid file id'}), 400
     try:
-        payload = _read_content('publications.json')
-        return jsonify(payload)
+        width = int(request.args.get('w') or 0)
+    except ValueError:
+        return jsonify({'error': 'w must be an integer'}), 400
+    try:
+        entry = _list_image_variants(file_id)
+        variant = _pick_image_variant(entry['variants'], request.accept_mimetypes, width)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-
-
-@app.route('/content/publications', methods=['POST'])
-def create_publication():
-    ok, reason = _require_admin()
-    if not ok:
-        return jsonify({'error': reason}), 401
-    data = request.get_json(silent=True) or {}
-    errors = _validate_publication_input(data)
-    if errors:
-        return jsonify({'error': 'Validation failed', 'details': errors}), 400
+    # Until variants exist (or for non-images) the original is served as is.
+    resp, status = _response_and_status(_stream_drive_file(variant['id'] if variant else file_id,
+                                                           disposition='inline'))
+    if variant is not None and status == 500:
+        # The variant is gone (or unreadable): forget the cached list and
+        # serve the original; the next request asks Drive again.
+        app.logger.warning(f"Image variant {variant['id']} of {file_id} failed, serving the original")
+        with _image_variants_lock:
+            _image_variants.pop(file_id, None)
+        variant = None
+        resp, status = _response_and_status(_stream_drive_file(file_id, disposition='inline'))
+    resp.headers['Vary'] = 'Accept'
+    if status in (200, 206):
+        resp.headers['Cache-Control'] = CACHE_CONTROL_IMAGE if variant else 'no-cache'
+    return resp, status
+
+
+@app.route('/drive/image/<file_id>/variants', methods=['GET'])
+def drive_list_image_variants(file_id):
+    if not _is_drive_id(file_id):
+        return jsonify({'error': 'Invalid file id'}), 400
     try:
-        payload = _read_content('publications.json')
-        items = payload.get('items', [])
-        now = _utc_now_iso()
-        item = {
-            'id': _next_id(items),
-            'title': data.get('title', '').strip(),
-            'authors': (data.get('authors') or '').strip(),
-            'journal': (data.get('journal') or '').strip(),
-            'year': (data.get('year') or '').strip() if isinstance(data.get('year'), str) else str(data.get('year', '')),
-            'volume': (data.get('volume') or '').strip() if isinstance(data.get('volume'), str) else str(data.get('volume', '')),
-            'pages': (data.get('pages') or '').strip(),
-            'doi': (data.get('doi') or '').strip(),
-            'category': (data.get('category') or 'paper').strip(),
-            'visible': bool(data.get('visible', True)),
-            'order': data.get('order', 99),
-            'created_at': now,
-            'updated_at': now
-        }
-        items.append(item)
-        payload['items'] = items
-        payload['updated_at'] = now
-        _write_content('publications.json', payload)
-        return jsonify(item), 201
+        return jsonify(_list_image_variants(file_id))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/content/publications/<int:item_id>', methods=['PUT'])
-def update_publication(item_id):
-    ok, reason = _require_admin()
-    if not ok:
-        return jsonify({'error': reason}), 401
-    data = request.get_json(silent=True) or {}
-    errors = _validate_publication_input(data, for_update=True)
-    if errors:
-        return jsonify({'error': 'Validation failed', 'details': errors}), 400
+# --- Delete File from Drive ---
+@app.route('/delete/<file_id>', methods=['DELETE'])
+def delete_file(file_id):
     try:
-        payload = _read_content('publications.json')
-        items = payload.get('items', [])
-        now = _utc_now_iso()
-        for item in items:
-            if item.get('id') == item_id:
-                for key in ('title', 'authors', 'journal', 'year', 'volume', 'pages', 'doi', 'category'):
-                    if key in data:
-                        val = data.get(key) or ''
-                        item[key] = val.strip() if isinstance(val, str) else str(val)
-                if 'order' in data:
-                    item['order'] = data.get('order', 99)
-                if 'visible' in data:
-                    item['visible'] = bool(data.get('visible'))
-                item['updated_at'] = now
-                payload['updated_at'] = now
-                _write_content('publications.json', payload)
-                return jsonify(item)
-        return jsonify({'error': 'Item not found'}), 404
+        service = _get_drive_service()
+        service.files().delete(fileId=file_id).execute()
+        _forget_drive_ids(file_id)
+        _delete_image_variants(file_id)
+        _mark_drive_listings_stale()
+        return jsonify({'message': 'File deleted'}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/content/publications/<int:item_id>', methods=['DELETE'])
-def delete_publication(item_id):
-    ok, reason = _require_admin()
-    if not ok:
-        return jsonify({'error': reason}), 401
+# --- List files (legacy compat) ---
+@app.route('/files', methods=['GET'])
+def list_files():
     try:
-        payload = _read_content('publications.json')
-        items = payload.get('items', [])
-        remaining = [i for i in items if i.get('id') != item_id]
-        if len(remaining) == len(items):
-            return jsonify({'error': 'Item not found'}), 404
-        payload['items'] = remaining
-        payload['updated_at'] = _utc_now_iso()
-        _write_content('publications.json', payload)
-        return jsonify({'message': 'Deleted'}), 200
+        files = _list_drive_files()
+        file_list = []
+        for f in files:
+            file_list.append({
+                'name': f.get('name', ''),
+                'id': f.get('id', ''),
+                'size': f.get('size'),
+                'updated': f.get('modifiedTime'),
+                'content_type': f.get('mimeType', ''),
+                'webViewLink': f.get('webViewLink', '')
+            })
+        try:
+            page = _paginate_listing(file_list, request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(file_list if page is None else page)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 # ============================================================
-# RESEARCH CRUD
+# CONTENT CRUD (generated per collection)
 # ============================================================
-@app.route('/content/research', methods=['GET'])
-def get_research():
-    try:
-        payload = _read_content('research.json')
-        return jsonify(payload)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+def _collection_views(collection):
+    """Build the admin CRUD and public read view functions for a collection."""
+    filename = collection.filename
 
+    def list_items():
+        try:
+            return _conditional_json(filename)
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    def create_item():
+        ok, reason = _require_admin()
+        if not ok:
+            return jsonify({'error': reason}), 401
+        data = request.get_json(silent=True) or {}
+        errors = collection.validate(data)
+        if errors:
+            return jsonify({'error': 'Validation failed', 'details': errors}), 400
+
+        def create(payload):
+            items = payload.get('items', [])
+            now = _utc_now_iso()
+            item = collection.new_item(data, items, now)
+            items.append(item)
+            payload['items'] = items
+            payload['updated_at'] = now
+            return item
+        try:
+            item = _mutate_content(filename, create)
+            return jsonify(item), 201
+        except ContentConflict as e:
+            return jsonify({'error': str(e)}), 409
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    def update_item(item_id):
+        ok, reason = _require_admin()
+        if not ok:
+            return jsonify({'error': reason}), 401
+        data = request.get_json(silent=True) or {}
+        errors = collection.validate(data, for_update=True)
+        if errors:
+            return jsonify({'error': 'Validation failed', 'details': errors}), 400
+
+        def update(payload):
+            now = _utc_now_iso()
+            for item in payload.get('items', []):
+                if item.get('id') == item_id:
+                    collection.apply_update(item, data, now)
+                    payload['updated_at'] = now
+                    return item
+            raise ContentItemNotFound(item_id)
+        try:
+            return jsonify(_mutate_content(filename, update))
+        except ContentItemNotFound:
+            return jsonify({'error': 'Item not found'}), 404
+        except ContentConflict as e:
+            return jsonify({'error': str(e)}), 409
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    def delete_item(item_id):
+        ok, reason = _require_admin()
+        if not ok:
+            return jsonify({'error': reason}), 401
+
+        def delete(payload):
+            items = payload.get('items', [])
+            remaining = [i for i in items if i.get('id') != item_id]
+            if len(remaining) == len(items):
+                raise ContentItemNotFound(item_id)
+            payload['items'] = remaining
+            payload['updated_at'] = _utc_now_iso()
+        try:
+            _mutate_content(filename, delete)
+            return jsonify({'message': 'Deleted'}), 200
+        except ContentItemNotFound:
+            return jsonify({'error': 'Item not found'}), 404
+        except ContentConflict as e:
+            return jsonify({'error': str(e)}), 409
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    def batch_items():
+        """Apply {"operations": [{"op": "create"|"update"|"delete", "id", "data"}]} atomically.
+
+        Every operation is validated up front and applied in order against one
+        read; the result is stored with a single write, or not at all.
+        """
+        ok, reason = _require_admin()
+        if not ok:
+            return jsonify({'error': reason}), 401
+        operations = (request.get_json(silent=True) or {}).get('operations')
+        if not isinstance(operations, list) or not operations:
+            return jsonify({'error': 'operations must be a non-empty list'}), 400
+        if len(operations) > BATCH_MAX_OPERATIONS:
+            return jsonify({'error': f'At most {BATCH_MAX_OPERATIONS} operations per batch'}), 400
+        errors = []
+        for index, operation in enumerate(operations):
+            op = operation.get('op') if isinstance(operation, dict) else None
+            if op not in ('create', 'update', 'delete'):
+                errors.append(f'operations[{index}]: op must be create, update or delete')
+                continue
+            if op != 'create' and not isinstance(operation.get('id'), int):
+                errors.append(f'operations[{index}]: id must be an integer')
+            if op != 'delete':
+                data = operation.get('data')
+                if not isinstance(data, dict):
+                    errors.append(f'operations[{index}]: data must be an object')
+                    continue
+                errors.extend(f'operations[{index}]: {e}'
+                              for e in collection.validate(data, for_update=op == 'update'))
+        if errors:
+            return jsonify({'error': 'Validation failed', 'details': errors}), 400
+
+        def apply(payload):
+            items = payload.get('items', [])
+            now = _utc_now_iso()
+            results = []
+            for index, operation in enumerate(operations):
+                op, item_id = operation['op'], operation.get('id')
+                if op == 'create':
+                    item = collection.new_item(operation['data'], items, now)
+                    items.append(item)
+                    results.append(item)
+                    continue
+                position = next((i for i, item in enumerate(items) if item.get('id') == item_id), None)
+                if position is None:
+                    raise ContentItemNotFound(f'operations[{index}]: item {item_id} not found')
+                if op == 'update':
+                    collection.apply_update(items[position], operation['data'], now)
+                    results.append(items[position])
+                else:
+                    del items[position]
+                    results.append({'id': item_id, 'deleted': True})
+            payload['items'] = items
+            payload['updated_at'] = now
+            return results
+        try:
+            return jsonify({'results': _mutate_content(filename, apply)}), 200
+        except ContentItemNotFound as e:
+            return jsonify({'error': 'Item not found', 'details': [e.args[0]]}), 404
+        except ContentConflict as e:
+            return jsonify({'error': str(e)}), 409
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    def public_list():
+        try:
+            return _serve_public_snapshot(collection)
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
 
-@app.route('/content/research', methods=['POST'])
-def create_research():
-    ok, reason = _require_admin()
-    if not ok:
-        return jsonify({'error': reason}), 401
-    data = request.get_json(silent=True) or {}
-    errors = _validate_research_input(data)
-    if errors:
-        return jsonify({'error': 'Validation failed', 'details': errors}), 400
+    def public_changes():
+        try:
+            since = int(request.args.get('since') or 0)
+        except ValueError:
+            return jsonify({'error': 'since must be an integer'}), 400
+        try:
+            payload, _ = _read_content_entry(filename)
+            log, etag = _read_change_log(filename, payload)
+            revision = log['revision']
+            if since < log.get('since', 0):
+                # Older than the retained log: the client has to reload /public/<type>.
+                return jsonify({'error': 'since is older than the change log', 'revision': revision}), 410
+            resp = jsonify({'revision': revision, 'since': since,
+                            'changes': collection.public_changes(log, since)})
+            resp = _with_validators(resp, f'{etag}-since-{since}', _parse_iso(log.get('updated_at')))
+            return resp.make_conditional(request)
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    return list_items, create_item, update_item, delete_item, batch_items, public_list, public_changes
+
+
+def _register_collection_routes(collection):
+    name = collection.name
+    (list_items, create_item, update_item, delete_item, batch_items,
+     public_list, public_changes) = _collection_views(collection)
+    app.add_url_rule(f'/content/{name}', f'get_{name}', list_items, methods=['GET'])
+    app.add_url_rule(f'/content/{name}', f'create_{name}', create_item, methods=['POST'])
+    app.add_url_rule(f'/content/{name}/batch', f'batch_{name}', batch_items, methods=['POST'])
+    app.add_url_rule(f'/content/{name}/<int:item_id>', f'update_{name}', update_item, methods=['PUT'])
+    app.add_url_rule(f'/content/{name}/<int:item_id>', f'delete_{name}', delete_item, methods=['DELETE'])
+    app.add_url_rule(f'/public/{name}', f'public_{name}', public_list, methods=['GET'])
+    app.add_url_rule(f'/public/{name}/changes', f'public_changes_{name}', public_changes, methods=['GET'])
+
+
+for _collection in COLLECTIONS.values():
+    _register_collection_routes(_collection)
+
+
+# --- Full-text Search ---
+@app.route('/public/search', methods=['GET'])
+def public_search():
+    query = (request.args.get('q') or '').strip()
+    tokens = _tokenize(query)
+    if not tokens:
+        return jsonify({'error': 'q is required'}), 400
+    types = [t for t in (request.args.get('types') or '').split(',') if t] or list(COLLECTIONS)
+    unknown = [t for t in types if t not in COLLECTIONS]
+    if unknown:
+        return jsonify({'error': f'Unknown types: {unknown}'}), 400
     try:
-        payload = _read_content('research.json')
-        items = payload.get('items', [])
-        now = _utc_now_iso()
-        item = {
-            'id': _next_id(items),
-            'title': data.get('title', '').strip(),
-            'title_en': (data.get('title_en') or '').strip(),
-            'description': (data.get('description') or '').strip(),
-            'image_url': (data.get('image_url') or '').strip(),
-            'order': data.get('order', 99),
-            'visible': bool(data.get('visible', True)),
-            'created_at': now,
-            'updated_at': now
-        }
-        items.append(item)
-        payload['items'] = items
-        payload['updated_at'] = now
-        _write_content('research.json', payload)
-        return jsonify(item), 201
+        limit = min(int(request.args.get('limit') or 20), PUBLIC_PAGE_MAX_LIMIT)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    try:
+        results = []
+        for content_type in types:
+            collection = COLLECTIONS[content_type]
+            _public_snapshot(collection)  # builds or refreshes the index
+            for score, item in _search_indexes[content_type].search(tokens):
+                results.append({
+                    'type': content_type,
+                    'score': round(score, 4),
+                    'item': item,
+                    'highlights': _highlights(collection, item, tokens),
+                })
+        results.sort(key=lambda r: r['score'], reverse=True)
+        return jsonify({'query': query, 'total': len(results), 'results': results[:max(limit, 1)]})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/content/research/<int:item_id>', methods=['PUT'])
-def update_research(item_id):
+# --- Bulk Seed Endpoint ---
+@app.route('/seed/<content_type>', methods=['POST'])
+def seed_content(content_type):
+    """Bulk seed endpoint for initial data loading. Requires admin auth."""
     ok, reason = _require_admin()
     if not ok:
         return jsonify({'error': reason}), 401
-    data = request.get_json(silent=True) or {}
-    errors = _validate_research_input(data, for_update=True)
-    if errors:
-        return jsonify({'error': 'Validation failed', 'details': errors}), 400
+    valid_types = tuple(COLLECTIONS)
+    if content_type not in valid_types:
+        return jsonify({'error': f'Invalid type. Must be one of: {valid_types}'}), 400
+    data = request.get_json(silent=True)
+    if not data or 'items' not in data:
+        return jsonify({'error': 'Request must contain items array'}), 400
     try:
-        payload = _read_content('research.json')
-        items = payload.get('items', [])
+        filename = f'{content_type}.json'
         now = _utc_now_iso()
-        for item in items:
-            if item.get('id') == item_id:
-                for key in ('title', 'title_en', 'description', 'image_url'):
-                    if key in data:
-                        item[key] = (data.get(key) or '').strip()
-                if 'order' in data:
-                    item['order'] = data.get('order', 99)
-                if 'visible' in data:
-                    item['visible'] = bool(data.get('visible'))
-                item['updated_at'] = now
-                payload['updated_at'] = now
-                _write_content('research.json', payload)
-                return jsonify(item)
-        return jsonify({'error': 'Item not found'}), 404
+        payload = {'updated_at': now, 'items': data['items']}
+        with _content_lock(filename):
+            before, _, _ = _load_content(filename, fresh=True)
+            records = _change_records(before, payload)
+            _write_content(filename, payload)
+            _append_change_log(filename, payload, records)
+        return jsonify({'message': f'Seeded {len(data["items"])} items', 'count': len(data['items'])}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/content/research/<int:item_id>', methods=['DELETE'])
-def delete_research(item_id):
-    ok, reason = _require_admin()
-    if not ok:
-        return jsonify({'error': reason}), 401
-    try:
-        payload = _read_content('research.json')
-        items = payload.get('items', [])
-        remaining = [i for i in items if i.get('id') != item_id]
-        if len(remaining) == len(items):
-            return jsonify({'error': 'Item not found'}), 404
-        payload['items'] = remaining
-        payload['updated_at'] = _utc_now_iso()
-        _write_content('research.json', payload)
-        return jsonify({'message': 'Deleted'}), 200
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+# --- Static Site Export ---
+# With STATIC_EXPORT_TARGET set (a local directory or gs://bucket/prefix) the
+# public site is published as static files. Every file under
+# STATIC_TEMPLATE_DIR is copied; pages get the visible, sorted items of a
+# collection rendered between their <!-- static:<type> --> markers, and text
+# files get .gz (and .br) siblings for servers that send precompressed files.
+# A content write schedules an export, STATIC_EXPORT_DELAY_MS later, of only
+# the pages that mark the changed collection; a manifest of file digests kept
+# at the target skips uploads whose bytes did not change. Until one full
+# export (every page and asset) has succeeded, each export is a full one, so
+# an asset copy that failed is retried on the next trigger.
+STATIC_MARKER_RE = re.compile(r'(<!-- static:(\w+) -->)(.*?)(<!-- /static:\2 -->)', re.S)
+STATIC_COMPRESS_SUFFIXES = ('.html', '.css', '.js', '.svg', '.json', '.txt')
+STATIC_MANIFEST = '.static-manifest.json'
+STATIC_NEWS_ON_INDEX = 5
+STATIC_PUBLICATION_CATEGORIES = ('paper', 'book', 'patent', 'presentation')
+# role -> (group, label), as in public/js/members.js
+STATIC_MEMBER_ROLES = {
+    'professor': (0, '教授'), 'associate_professor': (0, '准教授'), 'assistant_professor': (0, '助教'),
+    'postdoc': (0, 'ポスドク'), 'doctor': (1, '博士課程'), 'master': (1, '修士課程'),
+    'bachelor': (1, '学部生'), 'research_student': (1, '研究生'), 'alumni': (2, '卒業生'),
+}
+STATIC_MEMBER_GROUPS = ('Faculty / 教員', 'Students / 学生', 'Alumni / 卒業生')
+
+_static_export_lock = threading.Lock()
+_static_pending = set()  # collections changed since the last scheduled export
+_static_pending_lock = threading.Lock()
+_static_timer = None
+_static_manifest = None  # published path -> sha256 of its bytes
+_static_full_export_due = True
+_static_export_report = {'enabled': bool(STATIC_EXPORT_TARGET), 'target': STATIC_EXPORT_TARGET,
+                         'last_run': None, 'duration_ms': None, 'written': [], 'error': None,
+                         'full_export_due': True}
+
+
+def _esc(value):
+    return html.escape(str(value or ''))
+
+
+def _render_static_news(items):
+    rows = []
+    for item in items[:STATIC_NEWS_ON_INDEX]:
+        title = _esc(item.get('title'))
+        if item.get('link'):
+            title = f'<a href="{_esc(item["link"])}" target="_blank" rel="noopener">{title}</a>'
+        body = f'<p class="news-desc">{_esc(item["body"])}</p>' if item.get('body') else ''
+        rows.append(f'<tr><td class="news-td-date">{_esc(item.get("date", "").replace("-", "/"))}</td>'
+                    f'<td class="news-td-body"><div class="news-title">{title}</div>{body}</td></tr>')
+    if not rows:
+        return '<tr><td class="news-td-body" colspan="2">現在お知らせはありません。</td></tr>'
+    return '\n'.join(rows)
+
+
+def _render_static_members(items):
+    groups = ([], [], [])
+    for item in items:
+        role = item.get('role') or 'bachelor'
+        group, label = STATIC_MEMBER_ROLES.get(role, (1, role))
+        name_en = item.get('name_en')
+        researchmap = item.get('researchmap_url')
+        groups[group].append(
+            f'<li class="members-list-item"><span class="member-list-role">{_esc(label)}</span>'
+            f'<span class="member-list-name">{_esc(item.get("name"))}</span>'
+            + (f'<span class="member-list-name-en">{_esc(name_en)}</span>' if name_en else '')
+            + (f'<a class="member-list-researchmap" href="{_esc(researchmap)}" target="_blank" '
+               f'rel="noopener">researchmap</a>' if researchmap else '')
+            + '</li>')
+    if not items:
+        return '<p class="news-empty">メンバー情報はありません。</p>'
+    return '\n'.join(f'<div class="members-group"><h3>{STATIC_MEMBER_GROUPS[index]}</h3>'
+                     f'<ul class="members-simple-list">{"".join(entries)}</ul></div>'
+                     for index, entries in enumerate(groups) if entries)
+
+
+def _render_static_publication(item):
+    journal = _esc(item.get('journal'))
+    for name in ('volume', 'pages'):
+        if item.get(name):
+            journal += f', {_esc(item[name])}'
+    parts = [f'<span class="authors">{_esc(item.get("authors"))}</span>',
+             f'<span class="title">"{_esc(item.get("title"))}"</span>']
+    if item.get('journal'):
+        parts.append(f'<span class="journal">{journal}</span>')
+    if item.get('doi'):
+        parts.append(f'<span class="doi"> [<a href="https://doi.org/{_esc(item["doi"])}" target="_blank" '
+                     f'rel="noopener">DOI</a>]</span>')
+    return f'<li class="pub-item">{"".join(parts)}</li>'
+
+
+def _render_static_publications(items):
+    """Every category tab, years newest first; publications.js only toggles them."""
+    by_category = {}
+    for item in items:
+        by_category.setdefault(item.get('category') or 'paper', []).append(item)
+    blocks = []
+    for position, category in enumerate(STATIC_PUBLICATION_CATEGORIES):
+        by_year = {}
+        for item in by_category.get(category, []):
+            by_year.setdefault(str(item.get('year') or 'Unknown'), []).append(item)
+        inner = ''.join(
+            f'<div class="pub-year-group"><div class="pub-year">{_esc(year)}</div><ul class="pub-list">'
+            f'{"".join(_render_static_publication(i) for i in by_year[year])}</ul></div>'
+            for year in sorted(by_year, reverse=True)
+        ) or '<p class="news-empty">該当する業績はありません。</p>'
+        hidden = '' if position == 0 else ' hidden'
+        blocks.append(f'<div class="pub-category" data-category="{category}"{hidden}>{inner}</div>')
+    return '\n'.join(blocks)
+
+
+STATIC_RENDERERS = {
+    'news': _render_static_news,
+    'members': _render_static_members,
+    'publications': _render_static_publications,
+}
+
+
+def _render_static_page(template):
+    """Fill each <!-- static:<type> --> block of a page with the collection's public items."""
+    def fill(match):
+        name = match.group(2)
+        if name not in STATIC_RENDERERS or name not in COLLECTIONS:
+            return match.group(0)
+        items = _public_snapshot(COLLECTIONS[name])['items']
+        return f'{match.group(1)}\n{STATIC_RENDERERS[name](items)}\n{match.group(4)}'
+    return STATIC_MARKER_RE.sub(fill, template)
+
+
+def _static_site_files(changed=None):
+    """Yield (path, bytes) of the site; with `changed`, only pages marking one of those collections."""
+    for root, dirs, files in os.walk(STATIC_TEMPLATE_DIR):
+        dirs.sort()
+        for name in sorted(files):
+            full_path = os.path.join(root, name)
+            path = os.path.relpath(full_path, STATIC_TEMPLATE_DIR).replace(os.sep, '/')
+            if changed is not None and not path.endswith('.html'):
+                continue
+            with open(full_path, 'rb') as f:
+                body = f.read()
+            marked = set()
+            if path.endswith('.html'):
+                template = body.decode('utf-8')
+                marked = {m.group(2) for m in STATIC_MARKER_RE.finditer(template)}
+            if changed is not None and not marked & changed:
+                continue
+            if marked:
+                body = _render_static_page(template).encode('utf-8')
+            yield path, body
+
+
+def _static_target_blob(path):
+    bucket_name, _, prefix = STATIC_EXPORT_TARGET[5:].partition('/')
+    return _get_gcs_client().bucket(bucket_name).blob(f"{prefix.rstrip('/')}/{path}" if prefix else path)
+
+
+def _static_put(path, body, content_type, content_encoding=None):
+    if STATIC_EXPORT_TARGET.startswith('gs://'):
+        blob = _static_target_blob(path)
+        blob.cache_control = CACHE_CONTROL_STATIC
+        blob.content_encoding = content_encoding
+        blob.upload_from_string(body, content_type=content_type)
+    else:
+        dest = os.path.join(STATIC_EXPORT_TARGET, *path.split('/'))
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp_path = f'{dest}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, dest)
 
 
-# ============================================================
-# PUBLIC READ-ONLY ENDPOINTS
-# ============================================================
-@app.route('/public/news', methods=['GET'])
-def public_news():
+def _load_static_manifest():
     try:
-        payload = _read_content('news.json')
-        items = [i for i in payload.get('items', []) if i.get('visible', True)]
-        items.sort(key=lambda x: x.get('date', ''), reverse=True)
-        return jsonify({'items': items})
+        if STATIC_EXPORT_TARGET.startswith('gs://'):
+            blob = _static_target_blob(STATIC_MANIFEST)
+            if not blob.exists():
+                return {}
+            data = json.loads(blob.download_as_text(encoding='utf-8'))
+        else:
+            manifest_path = os.path.join(STATIC_EXPORT_TARGET, STATIC_MANIFEST)
+            if not os.path.exists(manifest_path):
+                return {}
+            with open(manifest_path, encoding='utf-8') as f:
+                data = json.load(f)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-
-@app.route('/public/events', methods=['GET'])
-def public_events():
+        app.logger.warning(f'Could not load static export manifest, republishing everything: {e}')
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _export_static_site(changed=None):
+    """Publish the pages marking a `changed` collection (every file when None); returns written paths.
+
+    Exports are full until one has succeeded in this process: the first
+    compares every file with the manifest, so template and asset changes from
+    a deploy go out with it, and a failed one is repeated in full.
+    """
+    global _static_manifest, _static_full_export_due
+    with _static_export_lock:
+        started = time.perf_counter()
+        if _static_manifest is None:
+            _static_manifest = _load_static_manifest()
+        if changed is None:
+            _static_full_export_due = True
+        elif _static_full_export_due:
+            changed = None
+        _static_export_report['full_export_due'] = _static_full_export_due
+        written = []
+        for path, body in _static_site_files(changed):
+            digest = hashlib.sha256(body).hexdigest()
+            if _static_manifest.get(path) == digest:
+                continue
+            content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+            if path.endswith(STATIC_COMPRESS_SUFFIXES):
+                content_type += '; charset=utf-8'
+            _static_put(path, body, content_type)
+            if path.endswith(STATIC_COMPRESS_SUFFIXES):
+                _static_put(f'{path}.gz', gzip.compress(body, compresslevel=9, mtime=0), content_type, 'gzip')
+                if brotli is not None:
+                    _static_put(f'{path}.br', brotli.compress(body, quality=11), content_type, 'br')
+            _static_manifest[path] = digest
+            written.append(path)
+        if written or changed is None:
+            _static_put(STATIC_MANIFEST, json.dumps(_static_manifest, sort_keys=True, indent=1).encode('utf-8'),
+                        'application/json')
+        if changed is None:
+            _static_full_export_due = False
+        _static_export_report.update(last_run=_utc_now_iso(), written=written, error=None,
+                                     duration_ms=round((time.perf_counter() - started) * 1000, 1),
+                                     full_export_due=_static_full_export_due)
+        return written
+
+
+def _run_scheduled_static_export():
+    global _static_timer
+    with _static_pending_lock:
+        changed = set(_static_pending)
+        _static_pending.clear()
+        _static_timer = None
     try:
-        payload = _read_content('events.json')
-        items = [i for i in payload.get('items', []) if i.get('visible', True)]
-        items.sort(key=lambda x: x.get('date', ''), reverse=True)
-        return jsonify({'items': items})
+        _export_static_site(changed)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        app.logger.warning(f'Static export failed: {e}')
+        _static_export_report['error'] = str(e)
+        # Retried together with the next content write.
+        with _static_pending_lock:
+            _static_pending.update(changed)
 
 
-@app.route('/public/members', methods=['GET'])
-def public_members():
-    try:
-        payload = _read_content('members.json')
-        items = [i for i in payload.get('items', []) if i.get('visible', True)]
-        items.sort(key=lambda x: x.get('order', 99))
-        return jsonify({'items': items})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+def _schedule_static_export(filename):
+    """Queue the pages that show this content file for the next debounced export."""
+    global _static_timer
+    name = filename[:-len('.json')] if filename.endswith('.json') else None
+    if not STATIC_EXPORT_TARGET or name not in STATIC_RENDERERS:
+        return
+    with _static_pending_lock:
+        _static_pending.add(name)
+        if _static_timer is None:
+            _static_timer = threading.Timer(STATIC_EXPORT_DELAY_MS / 1000.0, _run_scheduled_static_export)
+            _static_timer.daemon = True
+            _static_timer.start()
 
 
-@app.route('/public/publications', methods=['GET'])
-def public_publications():
-    try:
-        payload = _read_content('publications.json')
-        items = [i for i in payload.get('items', []) if i.get('visible', True)]
-        items.sort(key=lambda x: x.get('year', ''), reverse=True)
-        return jsonify({'items': items})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+def _flush_static_export():
+    """Run a scheduled export right away when the process exits before its timer fires."""
+    timer = _static_timer
+    if timer is not None and _static_pending:
+        timer.cancel()
+        _run_scheduled_static_export()
+
 
+atexit.register(_flush_static_export)
 
-@app.route('/public/research', methods=['GET'])
-def public_research():
+
+@app.route('/publish', methods=['POST'])
+def publish_static_site():
+    """Export the whole static site now, e.g. after deploying new templates. Requires admin auth."""
+    ok, reason = _require_admin()
+    if not ok:
+        return jsonify({'error': reason}), 401
+    if not STATIC_EXPORT_TARGET:
+        return jsonify({'error': 'STATIC_EXPORT_TARGET is not configured'}), 400
     try:
-        payload = _read_content('research.json')
-        items = [i for i in payload.get('items', []) if i.get('visible', True)]
-        items.sort(key=lambda x: x.get('order', 99))
-        return jsonify({'items': items})
+        written = _export_static_site()
+        return jsonify({'message': f'Published {len(written)} files', 'written': written}), 200
     except Exception as e:
+        _static_export_report['error'] = str(e)
         return jsonify({'error': str(e)}), 500
 
 
+# --- Startup Prewarm ---
+# With PREWARM_ON_START=1 a background thread builds the clients, resolves the
+# CMS folder and loads every collection concurrently (which also renders the
+# public snapshots and search index), recording how long each step took.
+# Failures are logged and reported but still flip readiness: the request path
+# has its own fallbacks and retries.
+_ready = threading.Event()
+_prewarm_report = {'enabled': PREWARM_ON_START, 'timings_ms': {}, 'errors': {}}
 
 
-# --- Bulk Seed Endpoint ---
-@app.route('/seed/<content_type>', methods=['POST'])
-def seed_content(content_type):
-    """Bulk seed endpoint for initial data loading. Requires admin auth."""
-    ok, reason = _require_admin()
-    if not ok:
-        return jsonify({'error': reason}), 401
-    valid_types = ('publications', 'members', 'news', 'events', 'research')
-    if content_type not in valid_types:
-        return jsonify({'error': f'Invalid type. Must be one of: {valid_types}'}), 400
-    data = request.get_json(silent=True)
-    if not data or 'items' not in data:
-        return jsonify({'error': 'Request must contain items array'}), 400
+def _prewarm_step(name, func):
+    started = time.perf_counter()
     try:
-        filename = f'{content_type}.json'
-        now = _utc_now_iso()
-        payload = {'updated_at': now, 'items': data['items']}
-        _write_content(filename, payload)
-        return jsonify({'message': f'Seeded {len(data["items"])} items', 'count': len(data['items'])}), 200
+        return func()
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        app.logger.warning(f'Prewarm step {name} failed: {e}')
+        _prewarm_report['errors'][name] = str(e)
+    finally:
+        _prewarm_report['timings_ms'][name] = round((time.perf_counter() - started) * 1000, 1)
+
+
+def _prewarm():
+    started = time.perf_counter()
+    if CONTENT_BACKEND == 'drive':
+        _prewarm_step('credentials', lambda: _get_credentials(DRIVE_SCOPES))
+        _prewarm_step('drive_client', _get_drive_service)
+        _prewarm_step('cms_folder', _get_cms_folder_id)
+    if CONTENT_BACKEND in ('drive', 'gcs') and GCS_BUCKET_NAME:
+        _prewarm_step('gcs_client', _get_gcs_client)
+    _prewarm_step('content_store', _get_content_store)
+    list(_bundle_pool.map(
+        lambda c: _prewarm_step(f'content.{c.name}', lambda: _public_snapshot(c)), COLLECTIONS.values()))
+    _prewarm_report['timings_ms']['total'] = round((time.perf_counter() - started) * 1000, 1)
+    app.logger.info(f"Prewarm finished in {_prewarm_report['timings_ms']['total']} ms")
+    _ready.set()
+
+
+# Image-variant pool workers import this module too; only the server process warms up.
+if PREWARM_ON_START and multiprocessing.parent_process() is None:
+    threading.Thread(target=_prewarm, name='prewarm', daemon=True).start()
+else:
+    _ready.set()
 
 
 if __name__ == '__main__':
@@ -30,9 +30,11 @@
   async function loadMembers() {
     const content = document.getElementById('members-content');
     if (!content) return;
+    // Pages published by the static export already carry the list.
+    if (!content.querySelector('.loading')) return;
 
     try {
-      const data = await apiGet('/public/members');
+      const data = await apiGet('/public/members?fields=name,name_en,role,order,researchmap_url');
       const items = data.items || [];
 
       if (items.length === 0) {
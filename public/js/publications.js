@@ -1,17 +1,32 @@
 /* ===== Publications Dynamic Loading ===== */
 
 (function () {
-  let allItems = [];
+  // Only the fields rendered below are requested; each tab is fetched on demand.
+  const PUB_FIELDS = 'title,authors,journal,year,volume,pages,doi';
+  const itemsByCategory = {};
   let currentCategory = 'paper';
 
   async function loadPublications() {
     const content = document.getElementById('pub-content');
     if (!content) return;
 
+    // Pages published by the static export carry every category; only switch blocks.
+    const staticBlocks = content.querySelectorAll('.pub-category');
+    if (staticBlocks.length > 0) {
+      staticBlocks.forEach(block => {
+        block.hidden = block.dataset.category !== currentCategory;
+      });
+      return;
+    }
+
+    const category = currentCategory;
     try {
-      const data = await apiGet('/public/publications');
-      allItems = data.items || [];
-      renderPublications();
+      if (!itemsByCategory[category]) {
+        const query = `category=${encodeURIComponent(category)}&fields=${PUB_FIELDS}`;
+        const data = await apiGet(`/public/publications?${query}`);
+        itemsByCategory[category] = data.items || [];
+      }
+      if (category === currentCategory) renderPublications();
     } catch (err) {
       content.innerHTML = '<p class="news-empty">業績データの読み込みに失敗しました。</p>';
       console.error('Failed to load publications:', err);
@@ -22,7 +37,7 @@
     const content = document.getElementById('pub-content');
     if (!content) return;
 
-    const filtered = allItems.filter(item => (item.category || 'paper') === currentCategory);
+    const filtered = itemsByCategory[currentCategory] || [];
 
     if (filtered.length === 0) {
       content.innerHTML = '<p class="news-empty">該当する業績はありません。</p>';
@@ -89,7 +104,7 @@
           tabs.querySelectorAll('.pub-tab').forEach(t => t.classList.remove('active'));
           e.target.classList.add('active');
           currentCategory = e.target.dataset.category || 'paper';
-          renderPublications();
+          loadPublications();
         }
       });
     }
@@ -0,0 +1,63 @@
+"""Shared fixtures: every test gets fresh module state in main, and the
+Google clients are only ever the bench/ emulator's, restored afterwards."""
+from collections import OrderedDict
+
+import pytest
+
+import main
+from bench.emulator import Emulator
+
+ADMIN_EMAIL = 'admin@example.com'
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    """Replace main's caches, registries and the content store with empty ones."""
+    for name, value in {
+        '_content_store': None,
+        '_content_cache': OrderedDict(),
+        '_public_snapshots': {},
+        '_bundle_cache': OrderedDict(),
+        '_search_indexes': {n: main.SearchIndex(c) for n, c in main.COLLECTIONS.items()},
+        '_drive_ids': {},
+        '_drive_listings': {},
+        '_drive_changes': {'token': None, 'polled': 0.0},
+        '_verified_tokens': OrderedDict(),
+        '_google_certs': {'certs': None, 'expires_at': 0.0},
+        '_image_variants': {},
+        '_image_variant_misses': OrderedDict(),
+        '_static_manifest': None,
+        '_static_full_export_due': True,
+        '_static_pending': set(),
+        '_drive_breaker': main.CircuitBreaker('drive', main.DRIVE_BREAKER_FAILURE_THRESHOLD, 3600),
+    }.items():
+        monkeypatch.setattr(main, name, value)
+
+
+@pytest.fixture
+def emulator(monkeypatch):
+    """Drive, GCS and Google sign-in emulated in process, with ADMIN_EMAIL allowed."""
+    monkeypatch.setattr(main, 'GOOGLE_OAUTH_CLIENT_ID', 'test-client-id')
+    monkeypatch.setattr(main, 'ADMIN_ALLOW_EMAILS', ADMIN_EMAIL)
+    emu = Emulator()
+    emu.install(main, patch=monkeypatch.setattr)
+    return emu
+
+
+@pytest.fixture
+def admin(emulator):
+    """Authorization header with a signed ID token for ADMIN_EMAIL."""
+    return {'Authorization': f'Bearer {emulator.identity.token(ADMIN_EMAIL)}'}
+
+
+@pytest.fixture
+def local_store(monkeypatch, tmp_path):
+    """Content kept in a temporary directory instead of Drive/GCS."""
+    store = main.LocalContentStore(str(tmp_path / 'content'))
+    monkeypatch.setattr(main, '_content_store', store)
+    return store
+
+
+@pytest.fixture
+def client():
+    return main.app.test_client()
@@ -0,0 +1,49 @@
+"""Admin ID token verification and its token / cert caches."""
+import pytest
+
+import main
+from bench.emulator import IdentityEmulator
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    calls = []
+    decode = main.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return decode(*args, **kwargs)
+    monkeypatch.setattr(main.jwt, 'decode', counting_decode)
+    return calls
+
+
+def _save(client, headers):
+    return client.post('/content/news', json={'title': 't', 'date': '2024-01-01', 'body': 'b'}, headers=headers)
+
+
+def test_cached_token_skips_signature_check(local_store, emulator, client, admin, decode_calls):
+    assert _save(client, admin).status_code == 201
+    assert _save(client, admin).status_code == 201
+    assert len(decode_calls) == 1
+    assert emulator.identity.cert_fetches == 1
+
+
+def test_certs_are_shared_between_tokens(local_store, emulator, client, decode_calls):
+    for email in ('admin@example.com', 'ADMIN@example.com'):
+        headers = {'Authorization': f'Bearer {emulator.identity.token(email)}'}
+        assert _save(client, headers).status_code == 201
+    assert len(decode_calls) == 2
+    assert emulator.identity.cert_fetches == 1
+
+
+def test_unknown_key_id_refetches_certs_once(local_store, emulator, client, admin, monkeypatch):
+    monkeypatch.setattr(main, '_google_certs', {'certs': {'rotated-away': 'x'}, 'expires_at': float('inf')})
+    assert _save(client, admin).status_code == 201
+    assert emulator.identity.cert_fetches == 1
+
+
+def test_rejects_other_signers_and_emails(local_store, emulator, client):
+    forged = IdentityEmulator(main.GOOGLE_OAUTH_CLIENT_ID).token('admin@example.com')
+    assert _save(client, {'Authorization': f'Bearer {forged}'}).status_code == 401
+    other = emulator.identity.token('someone@example.com')
+    assert _save(client, {'Authorization': f'Bearer {other}'}).status_code == 401
@@ -0,0 +1,37 @@
+"""The per-collection change log lives beside the items, not inside them."""
+import main
+
+
+def _news(title):
+    return {'title': title, 'date': '2024-01-01', 'body': 'b'}
+
+
+def test_log_is_stored_separately_and_serves_changes(local_store, client, admin):
+    first = client.post('/content/news', json=_news('one'), headers=admin).get_json()
+    client.post('/content/news', json=_news('two'), headers=admin)
+    client.put(f"/content/news/{first['id']}", json={'title': 'edited'}, headers=admin)
+    payload = client.get('/content/news', headers=admin).get_json()
+    assert payload['revision'] == 3
+    assert 'changes' not in payload and 'changes_since' not in payload
+    log, _ = local_store.read('news.changes.json')
+    assert [r['rev'] for r in log['changes']] == [1, 2, 3]
+    resp = client.get('/public/news/changes?since=1').get_json()
+    assert resp['revision'] == 3
+    assert sorted(c['item']['title'] for c in resp['changes']) == ['edited', 'two']
+
+
+def test_log_gap_forces_reload(local_store, client, admin, monkeypatch):
+    client.post('/content/news', json=_news('one'), headers=admin)
+    write = main._write_content
+
+    def failing(filename, payload, if_version=None):
+        if filename.endswith('.changes.json'):
+            raise OSError('log unavailable')
+        return write(filename, payload, if_version)
+    monkeypatch.setattr(main, '_write_content', failing)
+    client.post('/content/news', json=_news('two'), headers=admin)
+    monkeypatch.setattr(main, '_write_content', write)
+    client.post('/content/news', json=_news('three'), headers=admin)
+    assert client.get('/public/news/changes?since=1').status_code == 410
+    resp = client.get('/public/news/changes?since=2').get_json()
+    assert [c['item']['title'] for c in resp['changes']] == ['three']
@@ -0,0 +1,73 @@
+"""The Drive circuit breaker: opening, half-open probes and skipping Drive while open."""
+import pytest
+
+import main
+from bench.emulator import Faults
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(main.time, 'monotonic', clock)
+    return clock
+
+
+def test_opens_after_threshold_and_probe_closes(clock):
+    breaker = main.CircuitBreaker('test', failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.snapshot()['state'] == 'closed'
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.snapshot()['state'] == 'open'
+    assert not breaker.allow()
+
+    clock.now += 30
+    assert breaker.allow()  # the half-open probe
+    assert breaker.snapshot()['state'] == 'half_open'
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record_success()
+    assert breaker.snapshot()['state'] == 'closed'
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens(clock):
+    breaker = main.CircuitBreaker('test', failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_failure()
+    snapshot = breaker.snapshot()
+    assert snapshot['state'] == 'open' and snapshot['opened'] == 2
+    assert not breaker.allow()
+
+
+def test_open_breaker_skips_drive(emulator, client, admin, clock, monkeypatch):
+    breaker = main.CircuitBreaker('drive', failure_threshold=2, reset_timeout=30)
+    monkeypatch.setattr(main, '_content_store', main.FallbackContentStore(
+        main.DriveContentStore(), main.GCSContentStore(), breaker=breaker))
+    emulator.drive.faults = Faults(error_rate=1.0)
+    client.get('/content/news', headers=admin)
+    main._cache_invalidate()
+    client.get('/content/news', headers=admin)
+    assert breaker.snapshot()['state'] == 'open'
+    drive_calls = sum(emulator.drive.stats()['calls'].values())
+    for _ in range(3):
+        main._cache_invalidate()
+        assert client.get('/content/news', headers=admin).status_code == 200
+    assert sum(emulator.drive.stats()['calls'].values()) == drive_calls
+
+    emulator.drive.faults = Faults()
+    clock.now += 30
+    main._cache_invalidate()
+    assert client.get('/content/news', headers=admin).status_code == 200
+    assert breaker.snapshot()['state'] == 'closed'
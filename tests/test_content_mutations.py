@@ -0,0 +1,58 @@
+"""Atomic content mutations: conditional writes and retries on GCS and Drive."""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import main
+
+
+@pytest.fixture(params=['gcs', 'drive'])
+def store(request, emulator, monkeypatch):
+    store = main.GCSContentStore() if request.param == 'gcs' else main.DriveContentStore()
+    monkeypatch.setattr(main, '_content_store', store)
+    return store
+
+
+def _news(title):
+    return {'title': title, 'date': '2024-01-01', 'body': 'b'}
+
+
+def test_concurrent_creates_get_unique_ids(store, admin):
+    def create(i):
+        return main.app.test_client().post('/content/news', json=_news(f't{i}'), headers=admin)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(create, range(24)))
+    assert [r.status_code for r in responses] == [201] * 24
+    assert sorted(r.get_json()['id'] for r in responses) == list(range(1, 25))
+    data, _ = store.read('news.json')
+    assert sorted(item['id'] for item in data['items']) == list(range(1, 25))
+
+
+def test_conflicting_write_is_retried_against_fresh_content(store, client, admin, monkeypatch):
+    assert client.post('/content/news', json=_news('first'), headers=admin).status_code == 201
+    write = type(store).write
+    interleaved = []
+
+    def write_after_another_instance(self, filename, data, if_version=None):
+        if filename == 'news.json' and not interleaved:
+            # Another instance saves between our read and our write.
+            current, _ = self.read(filename)
+            current['items'].append(dict(_news('elsewhere'), id=99))
+            interleaved.append(write(self, filename, current))
+        return write(self, filename, data, if_version)
+    monkeypatch.setattr(type(store), 'write', write_after_another_instance)
+    resp = client.post('/content/news', json=_news('second'), headers=admin)
+    assert resp.status_code == 201
+    assert resp.get_json()['id'] == 100
+    data, _ = store.read('news.json')
+    assert [item['title'] for item in data['items']] == ['first', 'elsewhere', 'second']
+
+
+def test_conditional_write_refuses_a_stale_version(store):
+    version = store.write('news.json', {'items': []}, main.NO_VERSION)
+    store.write('news.json', {'items': [{'id': 1}]}, version)
+    with pytest.raises(main.ContentConflict):
+        store.write('news.json', {'items': []}, version)
+    with pytest.raises(main.ContentConflict):
+        store.write('news.json', {'items': []}, main.NO_VERSION)
@@ -0,0 +1,109 @@
+"""Content store regressions, run against the offline emulator in bench/."""
+import json
+
+import pytest
+
+import main
+from bench.emulator import Faults
+
+
+@pytest.fixture
+def fallback(emulator, monkeypatch):
+    """Fallback(Drive, GCS), the default CONTENT_BACKEND=drive store."""
+    store = main.FallbackContentStore(main.DriveContentStore(), main.GCSContentStore(), breaker=main._drive_breaker)
+    monkeypatch.setattr(main, '_content_store', store)
+    return store
+
+
+@pytest.fixture
+def write_behind(emulator, monkeypatch, tmp_path):
+    """Fallback(Drive, GCS) + WriteBehind, as with CONTENT_WRITE_BEHIND_MS > 0."""
+    store = main.WriteBehindContentStore(
+        main.FallbackContentStore(main.DriveContentStore(), main.GCSContentStore(), breaker=main._drive_breaker),
+        str(tmp_path / 'journal'), 3600)
+    monkeypatch.setattr(main, '_content_store', store)
+    yield store
+    store._stop.set()
+
+
+def _create_then_update(client, admin):
+    created = client.post('/content/news', json={'title': 'first', 'date': '2024-01-01', 'body': 'b'},
+                          headers=admin)
+    assert created.status_code == 201, created.get_data(as_text=True)
+    item_id = created.get_json()['id']
+    second = client.post('/content/news', json={'title': 'second', 'date': '2024-01-02', 'body': 'b'},
+                         headers=admin)
+    assert second.status_code == 201, second.get_data(as_text=True)
+    updated = client.put(f'/content/news/{item_id}', json={'title': 'edited'}, headers=admin)
+    assert updated.status_code == 200, updated.get_data(as_text=True)
+    main._get_content_store().flush()
+    main._cache_invalidate()
+    items = client.get('/content/news', headers=admin).get_json()['items']
+    return {item['id']: item['title'] for item in items}
+
+
+def test_write_behind_create_then_update_on_drive(write_behind, emulator, client, admin):
+    titles = _create_then_update(client, admin)
+    assert sorted(titles.values()) == ['edited', 'second']
+    assert any(f['name'] == 'news.json' for f in emulator.drive.files.values())
+
+
+def test_write_behind_create_then_update_on_gcs_fallback(write_behind, emulator, client, admin):
+    emulator.drive.faults = Faults(error_rate=1.0)
+    titles = _create_then_update(client, admin)
+    assert sorted(titles.values()) == ['edited', 'second']
+    assert not any(f['name'] == 'news.json' for f in emulator.drive.files.values())
+
+
+def _news(title):
+    return {'title': title, 'date': '2024-01-01', 'body': 'b'}
+
+
+def _drive_news(emulator):
+    f = next(f for f in emulator.drive.files.values() if f['name'] == 'news.json')
+    return [item['title'] for item in json.loads(f['content'])['items']]
+
+
+def test_failed_primary_read_does_not_overwrite_primary(fallback, emulator, client, admin, monkeypatch):
+    resp = client.post('/seed/news', json={'items': [dict(_news(t), id=i) for i, t in enumerate('abc', 1)]},
+                       headers=admin)
+    assert resp.status_code == 200
+    main._cache_invalidate()
+    read = main.DriveContentStore.read
+    failures = [RuntimeError('transient Drive error')]
+
+    def flaky_read(self, filename):
+        if failures:
+            raise failures.pop()
+        return read(self, filename)
+    monkeypatch.setattr(main.DriveContentStore, 'read', flaky_read)
+    resp = client.post('/content/news', json=_news('d'), headers=admin)
+    assert resp.status_code == 201, resp.get_data(as_text=True)
+    assert resp.get_json()['id'] == 4
+    assert _drive_news(emulator) == ['a', 'b', 'c', 'd']
+
+
+def test_writes_go_to_gcs_while_drive_is_down(fallback, emulator, client, admin):
+    emulator.drive.faults = Faults(error_rate=1.0)
+    for title in ('a', 'b'):
+        assert client.post('/content/news', json=_news(title), headers=admin).status_code == 201
+    main._cache_invalidate()
+    assert [i['title'] for i in client.get('/content/news', headers=admin).get_json()['items']] == ['a', 'b']
+    assert not any(f['name'] == 'news.json' for f in emulator.drive.files.values())
+
+
+def test_unreadable_stores_fail_instead_of_reading_empty(fallback, emulator, client, admin, monkeypatch):
+    def unavailable(self, filename):
+        raise RuntimeError(f'{self.name} unavailable')
+    monkeypatch.setattr(main.DriveContentStore, 'read', unavailable)
+    monkeypatch.setattr(main.GCSContentStore, 'read', unavailable)
+    assert client.post('/content/news', json=_news('a'), headers=admin).status_code == 500
+
+
+def test_store_missing_a_method_fails_at_instantiation():
+    class Incomplete(main.ContentStore):
+        def read(self, filename):
+            return None, main.NO_VERSION
+
+    with pytest.raises(TypeError):
+        Incomplete()
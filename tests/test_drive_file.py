@@ -0,0 +1,15 @@
+"""/drive/file/<file_id> downloads against the offline emulator in bench/."""
+
+
+def test_streams_whole_file_and_ranges(emulator, client):
+    meta = emulator.drive.add('data.bin', bytes(range(256)))
+    resp = client.get(f"/drive/file/{meta['id']}")
+    assert resp.status_code == 200 and resp.get_data() == bytes(range(256))
+    resp = client.get(f"/drive/file/{meta['id']}", headers={'Range': 'bytes=10-19'})
+    assert resp.status_code == 206 and resp.get_data() == bytes(range(10, 20))
+
+
+def test_rejects_ids_outside_the_drive_charset(emulator, client):
+    resp = client.get('/drive/file/abc%3Falt=media')
+    assert resp.status_code == 400
+    assert emulator.drive.stats()['calls'] == {}
@@ -0,0 +1,52 @@
+"""/drive/image/<file_id>/variants: id validation and the bounded miss cache."""
+import main
+
+
+def test_rejects_ids_outside_the_drive_charset(emulator, client):
+    resp = client.get("/drive/image/x' or name contains 'a/variants")
+    assert resp.status_code == 400
+    assert emulator.drive.stats()['calls'] == {}
+
+
+def test_misses_are_bounded_and_not_kept_as_entries(emulator, client, monkeypatch):
+    monkeypatch.setattr(main, 'IMAGE_VARIANT_MISS_MAX_ENTRIES', 3)
+    for i in range(10):
+        resp = client.get(f'/drive/image/missing{i}/variants')
+        assert resp.get_json() == {'status': 'none', 'variants': []}
+    assert main._image_variants == {}
+    assert list(main._image_variant_misses) == ['missing7', 'missing8', 'missing9']
+
+
+def test_finds_variants_on_drive(emulator, client):
+    original = emulator.drive.add('photo.jpg', b'jpeg', mime_type='image/jpeg')
+    emulator.drive.add('photo.w320.webp', b'webp', mime_type='image/webp',
+                       app_properties={'variant_of': original['id'], 'width': '320', 'format': 'webp'})
+    resp = client.get(f"/drive/image/{original['id']}/variants")
+    assert resp.get_json()['status'] == 'ready'
+    assert [v['width'] for v in resp.get_json()['variants']] == [320]
+
+
+def test_missing_variant_falls_back_to_the_original_uncached(emulator, client):
+    original = emulator.drive.add('photo.jpg', b'original', mime_type='image/jpeg')
+    variant = emulator.drive.add('photo.w320.jpeg', b'variant', mime_type='image/jpeg',
+                                 app_properties={'variant_of': original['id'], 'width': '320', 'format': 'jpeg'})
+    resp = client.get(f"/drive/image/{original['id']}")
+    assert resp.get_data() == b'variant'
+    assert resp.headers['Cache-Control'] == main.CACHE_CONTROL_IMAGE
+    emulator.drive.remove(variant['id'])
+    resp = client.get(f"/drive/image/{original['id']}")
+    assert resp.status_code == 200 and resp.get_data() == b'original'
+    assert resp.headers['Cache-Control'] == 'no-cache'
+    assert original['id'] not in main._image_variants
+
+
+def test_errors_are_not_cached(emulator, client):
+    original = emulator.drive.add('photo.jpg', b'original', mime_type='image/jpeg')
+    variant = emulator.drive.add('photo.w320.jpeg', b'variant', mime_type='image/jpeg',
+                                 app_properties={'variant_of': original['id'], 'width': '320', 'format': 'jpeg'})
+    assert client.get(f"/drive/image/{original['id']}/variants").get_json()['status'] == 'ready'
+    emulator.drive.remove(variant['id'])
+    emulator.drive.remove(original['id'])
+    resp = client.get(f"/drive/image/{original['id']}")
+    assert resp.status_code == 500
+    assert 'Cache-Control' not in resp.headers
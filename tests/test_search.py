@@ -0,0 +1,37 @@
+"""/public/search tokenization and highlights."""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def news(local_store, client, admin):
+    for title in ('腸内細菌の解析', '量子計算と光学計測', 'Spinning spin lattices'):
+        resp = client.post('/content/news', json={'title': title, 'date': '2024-01-01', 'body': '-'},
+                           headers=admin)
+        assert resp.status_code == 201
+
+
+def _search(client, q):
+    resp = client.get('/public/search', query_string={'q': q, 'types': 'news'})
+    assert resp.status_code == 200
+    return resp.get_json()['results']
+
+
+def _title_matches(result):
+    return next(h['matches'] for h in result['highlights'] if h['field'] == 'title')
+
+
+def test_single_kanji_query_matches(client):
+    results = _search(client, '菌')
+    assert [r['item']['title'] for r in results] == ['腸内細菌の解析']
+    assert _title_matches(results[0]) == [[3, 4]]
+
+
+def test_highlights_follow_matched_bigrams(client):
+    results = _search(client, '量子計測')
+    assert [r['item']['title'] for r in results] == ['量子計算と光学計測']
+    assert _title_matches(results[0]) == [[0, 3], [7, 9]]
+
+
+def test_word_highlights_match_whole_words(client):
+    results = _search(client, 'spin')
+    assert _title_matches(results[0]) == [[9, 13]]
@@ -0,0 +1,33 @@
+"""Static export: a failed full export is retried in full on the next trigger."""
+import os
+
+import pytest
+
+import main
+
+@pytest.fixture
+def site(local_store, monkeypatch, tmp_path):
+    target = tmp_path / 'site'
+    monkeypatch.setattr(main, 'STATIC_EXPORT_TARGET', str(target))
+    return target
+
+
+def test_failed_asset_copy_is_retried_by_the_next_content_export(site, monkeypatch):
+    put = main._static_put
+
+    def failing(path, *args, **kwargs):
+        if path.startswith('css/'):
+            raise OSError('bucket unavailable')
+        return put(path, *args, **kwargs)
+    monkeypatch.setattr(main, '_static_put', failing)
+    with pytest.raises(OSError):
+        main._export_static_site()
+    assert not (site / 'css').exists()
+    assert main._static_export_report['full_export_due']
+
+    monkeypatch.setattr(main, '_static_put', put)
+    written = main._export_static_site({'news'})
+    assert any(path.startswith('css/') for path in written)
+    assert os.listdir(site / 'css')
+    assert not main._static_export_report['full_export_due']
+    assert main._export_static_site({'news'}) == []
@@ -0,0 +1,57 @@
+"""Chunked /upload/sessions against the offline emulator in bench/."""
+import pytest
+
+import main
+
+ALIGN = main.UPLOAD_CHUNK_ALIGNMENT
+
+
+@pytest.fixture(autouse=True)
+def no_image_variants(monkeypatch):
+    monkeypatch.setattr(main, '_schedule_image_variants', lambda *args: None)
+
+
+def _open(client, **fields):
+    resp = client.post('/upload/sessions', json={'name': 'blob.bin', **fields})
+    assert resp.status_code == 201, resp.get_data(as_text=True)
+    return f"/upload/sessions/{resp.get_json()['session_id']}"
+
+
+def test_unknown_size_upload_ends_with_final_chunk(emulator, client):
+    body = bytes(range(256)) * (ALIGN // 256) + b'tail'
+    path = _open(client)
+    assert client.put(f'{path}?offset=0', data=body[:ALIGN]).status_code == 200
+    assert client.put(f'{path}?offset={ALIGN}', data=body[ALIGN:]).status_code == 400
+    resp = client.put(f'{path}?offset={ALIGN}&final=1', data=body[ALIGN:])
+    assert resp.status_code == 200 and resp.get_json()['done']
+    resp = client.post(f'{path}/finalize')
+    assert resp.status_code == 200
+    assert emulator.drive.files[resp.get_json()['id']]['content'] == body
+
+
+def test_finalize_refuses_unfinished_upload(emulator, client):
+    path = _open(client)
+    assert client.put(f'{path}?offset=0', data=b'x' * ALIGN).status_code == 200
+    assert client.post(f'{path}/finalize').status_code == 409
+    assert not any(f['name'] == 'blob.bin' for f in emulator.drive.files.values())
+    resp = client.put(f'{path}?offset={ALIGN}&final=1', data=b'')
+    assert resp.status_code == 200 and resp.get_json()['done']
+    assert client.post(f'{path}/finalize').status_code == 200
+
+
+def test_session_id_is_signed_and_needs_no_server_state(emulator, client, monkeypatch):
+    path = _open(client, size=5)
+    body, _, mac = path.rsplit('/', 1)[1].partition('.')
+    assert client.get(f'/upload/sessions/{body[:-2]}xx.{mac}').status_code == 404
+    # Any instance holding the same secret can carry on with the upload.
+    assert client.put(f'{path}?offset=0', data=b'hello').get_json()['done']
+    assert client.post(f'{path}/finalize').status_code == 200
+    monkeypatch.setattr(main, '_upload_session_key', b'another-secret')
+    assert client.get(path).status_code == 404
+
+
+def test_out_of_order_chunk_is_refused_with_drive_progress(emulator, client):
+    path = _open(client)
+    assert client.put(f'{path}?offset=0', data=b'x' * ALIGN).status_code == 200
+    resp = client.put(f'{path}?offset={3 * ALIGN}', data=b'x' * ALIGN)
+    assert resp.status_code == 409 and resp.get_json()['received'] == ALIGN